@@ -0,0 +1,160 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+class Empty(Exception):
+    """
+    Error al acceder a un elemento de una cola vacía.
+    """
+    pass
+
+
+class ArrayQueue:
+    """
+    Clase ArrayQueue: cola FIFO sobre un buffer circular que crece (y encoge) según la ocupación.
+
+    La capacidad es siempre una potencia de dos, de modo que el avance circular es una máscara de
+    bits en lugar de un módulo. Encolar y desencolar cuestan O(1) amortizado; len y first, O(1).
+    Las operaciones por lotes (enqueue_many, dequeue_many) copian tramos contiguos del buffer con
+    slices en lugar de mover los elementos uno a uno.
+
+    Métodos
+    -------
+    enqueue(e):
+        Añade un elemento al final de la cola.
+    enqueue_many(elementos):
+        Añade todos los elementos de un iterable al final de la cola, en orden.
+    dequeue():
+        Quita y devuelve el primer elemento.
+    dequeue_many(n):
+        Quita y devuelve una lista con los n primeros elementos (o todos, si hay menos).
+    first():
+        Devuelve el primer elemento sin quitarlo.
+    is_empty():
+        Indica si la cola está vacía.
+    """
+
+    DEFAULT_CAPACITY = 16
+    __slots__ = ("_data", "_size", "_front", "_mask")
+
+    def __init__(self, capacidad=DEFAULT_CAPACITY):
+        """
+        Parámetros:
+        -----------
+        capacidad : int
+            Capacidad inicial del buffer; se redondea a la siguiente potencia de dos.
+        """
+        if capacidad < 1:
+            raise ValueError("capacidad must be a positive integer")
+        capacidad = 1 << (capacidad - 1).bit_length()
+        self._data = [None] * capacidad
+        self._size = 0
+        self._front = 0
+        self._mask = capacidad - 1
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        """
+        Recorre los elementos desde el primero hasta el último sin quitarlos.
+        """
+        return iter(self._ordenados())
+
+    def is_empty(self):
+        return self._size == 0
+
+    def first(self):
+        if self._size == 0:
+            raise Empty("Queue is empty")
+        return self._data[self._front]
+
+    def enqueue(self, e):
+        if self._size == len(self._data):
+            self._resize(2 * len(self._data))
+        self._data[(self._front + self._size) & self._mask] = e
+        self._size += 1
+
+    def dequeue(self):
+        if self._size == 0:
+            raise Empty("Queue is empty")
+        front = self._front
+        e = self._data[front]
+        self._data[front] = None
+        self._front = (front + 1) & self._mask
+        self._size -= 1
+        if self._size < len(self._data) >> 2 and len(self._data) > self.DEFAULT_CAPACITY:
+            self._resize(len(self._data) >> 1)
+        return e
+
+    def enqueue_many(self, elementos):
+        """
+        Añade los elementos al final de la cola en orden, con como mucho un redimensionado.
+
+        Parámetros:
+        -----------
+        elementos : iterable
+            Elementos a encolar.
+        """
+        elementos = elementos if isinstance(elementos, list) else list(elementos)
+        n = len(elementos)
+        if n == 0:
+            return
+        if self._size + n > len(self._data):
+            self._resize(1 << (self._size + n - 1).bit_length())
+        capacidad = len(self._data)
+        inicio = (self._front + self._size) & self._mask
+        tramo = min(n, capacidad - inicio)
+        self._data[inicio:inicio + tramo] = elementos[:tramo]
+        if tramo < n:
+            self._data[:n - tramo] = elementos[tramo:]
+        self._size += n
+
+    def dequeue_many(self, n):
+        """
+        Quita y devuelve los n primeros elementos de la cola.
+
+        Parámetros:
+        -----------
+        n : int
+            Número máximo de elementos a desencolar.
+
+        Retorna:
+        --------
+        list
+            Los elementos desencolados en orden; menos de n si la cola tenía menos.
+        """
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+        n = min(n, self._size)
+        capacidad = len(self._data)
+        front = self._front
+        tramo = min(n, capacidad - front)
+        salida = self._data[front:front + tramo]
+        self._data[front:front + tramo] = [None] * tramo
+        if tramo < n:
+            salida += self._data[:n - tramo]
+            self._data[:n - tramo] = [None] * (n - tramo)
+        self._front = (front + n) & self._mask
+        self._size -= n
+        if self._size < capacidad >> 2 and capacidad > self.DEFAULT_CAPACITY:
+            self._resize(max(self.DEFAULT_CAPACITY, 1 << self._size.bit_length()))
+        return salida
+
+    def _ordenados(self):
+        """
+        Devuelve una lista con los elementos en orden de la cola.
+        """
+        fin = self._front + self._size
+        if fin <= len(self._data):
+            return self._data[self._front:fin]
+        return self._data[self._front:] + self._data[:fin & self._mask]
+
+    def _resize(self, capacidad):
+        """
+        Copia los elementos, en orden, a un buffer nuevo de la capacidad indicada (potencia de dos).
+        """
+        datos = self._ordenados()
+        datos.extend([None] * (capacidad - self._size))
+        self._data = datos
+        self._front = 0
+        self._mask = capacidad - 1
@@ -0,0 +1,114 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+import sys
+import time
+from collections import deque
+
+from array_queue import ArrayQueue, Empty
+from gestor_turnos import GestorColas
+from eventos import SinkNulo
+from replicaciones import Escenario, generar_traza
+
+class ColaDeque:
+    """
+    Clase ColaDeque: misma interfaz que ArrayQueue pero respaldada por collections.deque.
+    Sirve de referencia en el benchmark y, como GestorColas solo exige la interfaz de cola, puede
+    usarse también como backend de sus colas.
+    """
+
+    __slots__ = ("_deque",)
+
+    def __init__(self):
+        self._deque = deque()
+
+    def __len__(self):
+        return len(self._deque)
+
+    def __iter__(self):
+        return iter(self._deque)
+
+    def is_empty(self):
+        return not self._deque
+
+    def first(self):
+        if not self._deque:
+            raise Empty("Queue is empty")
+        return self._deque[0]
+
+    def enqueue(self, e):
+        self._deque.append(e)
+
+    def dequeue(self):
+        if not self._deque:
+            raise Empty("Queue is empty")
+        return self._deque.popleft()
+
+    def enqueue_many(self, elementos):
+        self._deque.extend(elementos)
+
+    def dequeue_many(self, n):
+        if n < 0:
+            raise ValueError("n must be a non-negative integer")
+        popleft = self._deque.popleft
+        return [popleft() for _ in range(min(n, len(self._deque)))]
+
+
+def _medir(funcion, *args):
+    """
+    Devuelve los segundos que tarda en ejecutarse funcion(*args).
+    """
+    inicio = time.perf_counter()
+    funcion(*args)
+    return time.perf_counter() - inicio
+
+
+def _una_a_una(clase, n):
+    """
+    Encola n elementos y los desencola uno a uno, intercalando first() y len() como hace GestorColas.
+    """
+    cola = clase()
+    for i in range(n):
+        cola.enqueue(i)
+        if len(cola) > 64:
+            cola.first()
+            cola.dequeue()
+    while not cola.is_empty():
+        cola.dequeue()
+
+
+def _por_lotes(clase, n, lote=256):
+    """
+    Encola y desencola n elementos en lotes de tamaño lote.
+    """
+    cola = clase()
+    bloque = list(range(lote))
+    for _ in range(n // lote):
+        cola.enqueue_many(bloque)
+    while not cola.is_empty():
+        cola.dequeue_many(lote)
+
+
+def _gestor(clase, escenario):
+    """
+    Ejecuta GestorColas sobre la traza del escenario con las cuatro colas de la clase indicada.
+    """
+    gestor = GestorColas(clase(), clase(), clase(), clase(), [], periodo_admision=escenario.periodo_admision,
+                         eventos=SinkNulo(), guardar_resultados=False)
+    gestor.gestion_lista_espera(generar_traza(escenario, "0"))
+
+
+if __name__ == "__main__":
+    """
+    Compara ArrayQueue con collections.deque en operaciones sueltas, por lotes y como backend de
+    GestorColas. Uso: python benchmark_colas.py [num_elementos]
+    """
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    escenario = Escenario("colas", n // 10, distribucion="exponencial", tiempo_medio=5)
+    casos = (("una a una", _una_a_una, (n,)), ("por lotes", _por_lotes, (n,)),
+             (f"GestorColas ({escenario.num_pacientes} pac.)", _gestor, (escenario,)))
+    print(f"{'caso':<28}{'ArrayQueue':>12}{'deque':>12}{'relación':>10}")
+    for nombre, funcion, args in casos:
+        t_array = _medir(funcion, ArrayQueue, *args)
+        t_deque = _medir(funcion, ColaDeque, *args)
+        print(f"{nombre:<28}{t_array:>11.3f}s{t_deque:>11.3f}s{t_array / t_deque:>9.2f}x")
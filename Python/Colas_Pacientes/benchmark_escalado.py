@@ -0,0 +1,121 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+import datetime
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from array_queue import ArrayQueue
+from gestor_turnos import GestorColas
+from eventos import SinkNulo
+from replicaciones import Escenario, generar_traza
+
+TAMAÑOS = (1000, 100_000, 10_000_000)
+CARGAS = {
+    "baja": 2,    # tiempo medio de consulta; con una admisión cada 3 ticks, ocupación ~0.33 por sala
+    "alta": 5,    # ocupación ~0.83 por sala
+}
+
+def ejecutar_caso(num_pacientes, carga, semilla="0"):
+    """
+    Ejecuta el gestor sobre una traza sintética de num_pacientes con la carga indicada, sin
+    registro de eventos ni lista de resultados, y mide su rendimiento. Se ejecuta en un proceso
+    propio para que la memoria pico corresponda solo a este caso.
+
+    Parámetros:
+    -----------
+    num_pacientes : int
+        Tamaño de la traza.
+    carga : str
+        Clave de CARGAS.
+    semilla : str
+        Semilla de la traza.
+
+    Retorna:
+    --------
+    dict
+        Resultados del caso: segundos, ticks, ticks/s, pacientes/s, memoria pico y profundidad máxima de cada cola.
+    """
+    escenario = Escenario(f"{carga}_{num_pacientes}", num_pacientes, periodo_admision=3,
+                          distribucion="exponencial", tiempo_medio=CARGAS[carga])
+    gestor = GestorColas(ArrayQueue(), ArrayQueue(), ArrayQueue(), ArrayQueue(), [],
+                         periodo_admision=escenario.periodo_admision, eventos=SinkNulo(),
+                         guardar_resultados=False)
+    inicio = time.perf_counter()
+    gestor.gestion_lista_espera(generar_traza(escenario, semilla))
+    segundos = time.perf_counter() - inicio
+    return {
+        "pacientes": num_pacientes,
+        "carga": carga,
+        "segundos": segundos,
+        "ticks": gestor.tiempo_actual,
+        "ticks_por_s": gestor.tiempo_actual / segundos,
+        "pacientes_por_s": num_pacientes / segundos,
+        "memoria_pico_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "profundidad_maxima": dict(gestor.profundidad_maxima),
+    }
+
+
+def _commit_actual():
+    """
+    Devuelve el hash del commit actual de git, o None si no se puede obtener.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ejecutar_suite(tamaños=TAMAÑOS, cargas=tuple(CARGAS)):
+    """
+    Ejecuta todos los casos (tamaño x carga), cada uno en un proceso nuevo.
+
+    Retorna:
+    --------
+    dict
+        Informe con el commit, la fecha, la versión de Python y la lista de resultados.
+    """
+    resultados = []
+    for num_pacientes in tamaños:
+        for carga in cargas:
+            with ProcessPoolExecutor(max_workers=1) as proceso:
+                resultado = proceso.submit(ejecutar_caso, num_pacientes, carga).result()
+            resultados.append(resultado)
+            print(f"{num_pacientes:>10} {carga:<5} {resultado['segundos']:>9.2f}s {resultado['ticks_por_s']:>12.0f} ticks/s "
+                  f"{resultado['pacientes_por_s']:>10.0f} pac/s {resultado['memoria_pico_mb']:>8.1f} MB "
+                  f"prof. máx. {max(resultado['profundidad_maxima'].values())}", flush=True)
+    return {"commit": _commit_actual(), "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "resultados": resultados}
+
+
+def comparar(anterior, actual):
+    """
+    Imprime, para cada caso común a dos informes, la relación de pacientes/s entre el actual y el anterior.
+    """
+    previos = {(r["pacientes"], r["carga"]): r for r in anterior["resultados"]}
+    print(f"\nComparación con {anterior.get('commit')} (pacientes/s actual / anterior):")
+    for r in actual["resultados"]:
+        previo = previos.get((r["pacientes"], r["carga"]))
+        if previo is not None:
+            print(f"{r['pacientes']:>10} {r['carga']:<5} x{r['pacientes_por_s'] / previo['pacientes_por_s']:.2f}")
+
+
+if __name__ == "__main__":
+    """
+    Uso: python benchmark_escalado.py [tamaños separados por comas] [salida.json] [anterior.json]
+    """
+    tamaños = tuple(int(t) for t in sys.argv[1].split(",")) if len(sys.argv) > 1 else TAMAÑOS
+    salida = sys.argv[2] if len(sys.argv) > 2 else "benchmark_escalado.json"
+    informe = ejecutar_suite(tamaños)
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, indent=2)
+    print(f"Resultados guardados en {salida}")
+    if len(sys.argv) > 3:
+        with open(sys.argv[3], encoding="utf-8") as f:
+            comparar(json.load(f), informe)
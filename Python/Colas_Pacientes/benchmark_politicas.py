@@ -0,0 +1,58 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+import sys
+import time
+
+from array_queue import ArrayQueue
+from gestor_turnos import GestorColas
+from eventos import SinkNulo
+from politicas import POLITICAS
+from replicaciones import Escenario, generar_traza
+
+def ejecutar_politica(politica, escenario, semilla):
+    """
+    Reproduce la traza sintética del escenario con una política de planificación y sin registro de eventos.
+
+    Parámetros:
+    -----------
+    politica : PoliticaFIFO
+        Política de planificación a evaluar.
+    escenario : Escenario
+        Escenario que genera la traza.
+    semilla : int or str
+        Semilla de la traza; la misma semilla reproduce la misma traza para todas las políticas.
+
+    Retorna:
+    --------
+    tuple
+        (segundos, gestor) con el tiempo de ejecución y el gestor tras la ejecución.
+    """
+    gestor = GestorColas(ArrayQueue(), ArrayQueue(), ArrayQueue(), ArrayQueue(), [],
+                         salas_general=escenario.salas_general, salas_specialist=escenario.salas_specialist,
+                         periodo_admision=escenario.periodo_admision, eventos=SinkNulo(), politica=politica)
+    inicio = time.perf_counter()
+    gestor.gestion_lista_espera(generar_traza(escenario, semilla))
+    return time.perf_counter() - inicio, gestor
+
+
+if __name__ == "__main__":
+    """
+    Compara las políticas de planificación sobre la misma traza. Uso:
+    python benchmark_politicas.py [num_pacientes] [semilla]
+    """
+    num_pacientes = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    semilla = sys.argv[2] if len(sys.argv) > 2 else "0"
+    escenario = Escenario("benchmark", num_pacientes, periodo_admision=3, prop_priority=0.3,
+                          distribucion="exponencial", tiempo_medio=5, salas_general=1, salas_specialist=1)
+    print("###############################################")
+    print(f" {escenario}")
+    print("###############################################\n")
+    print(f"{'politica':<20}{'pac/s':>10}{'ticks':>10}  {'tipo':<12}{'media':>8}{'p50':>8}{'p95':>8}{'p99':>8}")
+    for nombre, politica in POLITICAS.items():
+        segundos, gestor = ejecutar_politica(politica(), escenario, semilla)
+        for tipo in ("general", "specialist"):
+            metricas = gestor.metricas[tipo]
+            print(f"{nombre:<20}{num_pacientes / segundos:>10.0f}{gestor.tiempo_actual:>10}  {tipo:<12}"
+                  f"{metricas.media:>8.1f}{metricas.cuantil(0.5):>8.1f}{metricas.cuantil(0.95):>8.1f}"
+                  f"{metricas.cuantil(0.99):>8.1f}")
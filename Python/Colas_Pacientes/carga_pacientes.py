@@ -0,0 +1,172 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+from array import array
+from paciente import RegistroPaciente, CODIGOS_TIPO_CONSULTA, CODIGOS_URGENCIA
+
+def _parsear_bloque(texto, num_linea):
+    """
+    Separa un bloque de texto del archivo de pacientes en sus cuatro columnas y las valida de una vez.
+
+    Parámetros:
+    -----------
+    texto : str
+        Bloque de líneas completas del archivo.
+    num_linea : int
+        Número de la primera línea del bloque, para los mensajes de error.
+
+    Retorna:
+    --------
+    tuple
+        (ids, tipos, urgencias, tiempos_estimados), con los tipos y urgencias ya convertidos a códigos.
+
+    Excepciones:
+    ------------
+    ValueError
+        Si alguna línea no vacía no tiene exactamente cuatro campos o algún campo no es válido; el
+        mensaje indica el número de la primera línea errónea.
+    """
+    if not set(map(len, map(str.split, texto.split("\n")))) <= {0, 4}:
+        i = next(i for i, linea in enumerate(texto.split("\n")) if len(linea.split()) not in (0, 4))
+        raise ValueError(f"line {num_linea + i} of the patients file must have 4 fields")
+    campos = texto.split()
+    ids = campos[0::4]
+    tipos = campos[1::4]
+    urgencias = campos[2::4]
+    if not (set(tipos) <= CODIGOS_TIPO_CONSULTA.keys() and set(urgencias) <= CODIGOS_URGENCIA.keys()):
+        r = next(r for r, (tipo, urgencia) in enumerate(zip(tipos, urgencias))
+                 if tipo not in CODIGOS_TIPO_CONSULTA or urgencia not in CODIGOS_URGENCIA)
+        raise ValueError(f"unknown tipo_consulta/urgencia {tipos[r]} {urgencias[r]} "
+                         f"(line {_num_linea_registro(texto, num_linea, r)})")
+    try:
+        tiempos_estimados = array("i", map(int, campos[3::4]))
+    except ValueError:
+        tiempos_estimados = None
+    if tiempos_estimados is None or (tiempos_estimados and min(tiempos_estimados) < 0):
+        r = next(r for r, tiempo in enumerate(campos[3::4]) if not _entero_no_negativo(tiempo))
+        raise ValueError(f"tiempo_estimado must be a positive integer "
+                         f"(line {_num_linea_registro(texto, num_linea, r)})")
+    return (ids, array("b", map(CODIGOS_TIPO_CONSULTA.__getitem__, tipos)),
+            array("b", map(CODIGOS_URGENCIA.__getitem__, urgencias)), tiempos_estimados)
+
+
+def _entero_no_negativo(texto):
+    try:
+        return int(texto) >= 0
+    except ValueError:
+        return False
+
+
+def _num_linea_registro(texto, num_linea, registro):
+    """
+    Número de línea del registro-ésimo paciente de un bloque, saltando las líneas vacías.
+    """
+    no_vacias = [i for i, linea in enumerate(texto.split("\n")) if not linea.isspace() and linea]
+    return num_linea + no_vacias[registro]
+
+
+def cargar_pacientes(ruta):
+    """
+    Carga masiva del archivo de pacientes: lee el archivo en una sola pasada, lo valida en un único
+    paso y construye un RegistroPaciente por línea, sin pasar por los setters de Paciente.
+
+    Parámetros:
+    -----------
+    ruta : str
+        Ruta del archivo de pacientes.
+
+    Retorna:
+    --------
+    list
+        Lista de RegistroPaciente en el orden del archivo.
+    """
+    with open(ruta, "r", encoding="utf-8") as file:
+        ids, tipos, urgencias, tiempos_estimados = _parsear_bloque(file.read(), 1)
+    return list(map(RegistroPaciente, ids, tipos, urgencias, tiempos_estimados))
+
+
+class TablaPacientes:
+    """
+    Clase TablaPacientes que guarda los pacientes por columnas: los identificadores en una lista y
+    el tipo de consulta, la urgencia y el tiempo estimado en arrays tipados. Ocupa una fracción de lo
+    que ocupan los objetos Paciente y está pensada para trazas de millones de pacientes.
+
+    Al iterarla se crean los RegistroPaciente de uno en uno, por lo que puede pasarse directamente
+    a GestorColas.gestion_lista_espera como fuente de admisión.
+
+    Métodos
+    -------
+    desde_archivo(ruta, tam_bloque):
+        Construye la tabla leyendo el archivo por bloques.
+
+    fila(indice):
+        Devuelve el paciente de la fila indicada como RegistroPaciente.
+    """
+
+    def __init__(self):
+        """
+        Inicializa una tabla vacía.
+        """
+        self.ids = []
+        self.tipos = array("b")
+        self.urgencias = array("b")
+        self.tiempos_estimados = array("i")
+
+    @classmethod
+    def desde_archivo(cls, ruta, tam_bloque=1 << 20):
+        """
+        Construye la tabla a partir del archivo de pacientes, leyéndolo en bloques de líneas de
+        aproximadamente tam_bloque bytes para acotar la memoria temporal.
+
+        Parámetros:
+        -----------
+        ruta : str
+            Ruta del archivo de pacientes.
+        tam_bloque : int
+            Tamaño aproximado en bytes de cada bloque leído.
+
+        Retorna:
+        --------
+        TablaPacientes
+        """
+        tabla = cls()
+        num_linea = 1
+        with open(ruta, "r", encoding="utf-8") as file:
+            while True:
+                lineas = file.readlines(tam_bloque)
+                if not lineas:
+                    break
+                tabla.extender(*_parsear_bloque("".join(lineas), num_linea))
+                num_linea += len(lineas)
+        return tabla
+
+    def extender(self, ids, tipos, urgencias, tiempos_estimados):
+        """
+        Añade al final de la tabla un bloque de columnas ya validadas.
+        """
+        self.ids.extend(ids)
+        self.tipos.extend(tipos)
+        self.urgencias.extend(urgencias)
+        self.tiempos_estimados.extend(tiempos_estimados)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def fila(self, indice):
+        """
+        Devuelve el paciente de la fila indicada.
+
+        Parámetros:
+        -----------
+        indice : int
+            Número de fila.
+
+        Retorna:
+        --------
+        RegistroPaciente
+        """
+        return RegistroPaciente(self.ids[indice], self.tipos[indice],
+                                self.urgencias[indice], self.tiempos_estimados[indice])
+
+    def __iter__(self):
+        return map(RegistroPaciente, self.ids, self.tipos, self.urgencias, self.tiempos_estimados)
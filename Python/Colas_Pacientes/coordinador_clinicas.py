@@ -0,0 +1,239 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+import multiprocessing as mp
+import queue
+import sys
+import threading
+
+from array_queue import ArrayQueue
+from gestor_turnos import GestorColas
+from eventos import SinkNulo
+from paciente import RegistroPaciente, CODIGOS_TIPO_CONSULTA, CODIGOS_URGENCIA
+from fuente_admision import FuenteAdmision
+
+TIPOS_CONSULTA = ("general", "specialist")
+
+class Clinica:
+    """
+    Configuración de una clínica: nombre y número de salas de cada tipo de consulta.
+    """
+
+    def __init__(self, nombre, salas_general=1, salas_specialist=1):
+        self.nombre = nombre
+        self.salas_general = salas_general
+        self.salas_specialist = salas_specialist
+
+
+AGOTADA = -1
+
+def _elegir_clinica(tipo, esperas, num_clinicas):
+    """
+    Devuelve el índice de la clínica con menor espera prevista para el tipo de consulta (0 general,
+    1 specialist), dadas las esperas (general, specialist) de cada clínica.
+    """
+    return min(range(num_clinicas), key=lambda c: esperas[2 * c + tipo])
+
+
+def _ejecutar_clinica(indice, clinica, num_clinicas, periodo, bandeja, barrera, tipos, esperas, ociosas, resultados,
+                      tiempo_limite):
+    """
+    Proceso de una clínica. Avanza por rondas de 'periodo' unidades de tiempo, una por admisión: tras
+    la barrera de cada ronda mira el tipo de consulta del paciente que llega, elige igual que las demás
+    clínicas a cuál le toca con las esperas publicadas en la ronda anterior y, si es ella, lo saca de
+    la bandeja y lo admite. Luego avanza su GestorColas 'periodo' pasos y publica su espera prevista
+    por tipo de consulta y si está vacía. Cuando la fuente se agota deja de avanzar en cuanto se queda
+    vacía, y termina cuando todas lo están. Si falla, rompe la barrera para que el coordinador y las
+    demás clínicas no se queden esperándola; si la rompe otro, termina sin más.
+
+    Parámetros:
+    -----------
+    indice : int
+        Posición de la clínica en los arrays compartidos.
+    clinica : Clinica
+        Configuración de la clínica.
+    num_clinicas : int
+        Número total de clínicas.
+    periodo : int
+        Unidades de tiempo de cada ronda (el periodo de admisión).
+    bandeja : multiprocessing.Queue
+        Cola común por la que llegan los pacientes, como tuplas; cada uno lo saca la clínica elegida.
+    barrera : multiprocessing.Barrier
+        Barrera que sincroniza cada ronda con el coordinador.
+    tipos, esperas, ociosas :
+        Arrays en memoria compartida (ver CoordinadorClinicas).
+    resultados : multiprocessing.Queue
+        Cola por la que se devuelven las métricas al terminar.
+    tiempo_limite : float
+        Segundos máximos de espera en la barrera y en la bandeja.
+    """
+    try:
+        gestor = GestorColas(ArrayQueue(), ArrayQueue(), ArrayQueue(), ArrayQueue(), [],
+                             salas_general=clinica.salas_general, salas_specialist=clinica.salas_specialist,
+                             eventos=SinkNulo(), guardar_resultados=False)
+        admitidos = 0
+        ronda = 0
+        while True:
+            barrera.wait(tiempo_limite)
+            actual, anterior = ronda & 1, (ronda & 1) ^ 1
+            tipo = tipos[actual]
+            if tipo == AGOTADA:
+                if all(ociosas[anterior * num_clinicas:(anterior + 1) * num_clinicas]):
+                    break
+            elif _elegir_clinica(tipo, esperas[2 * anterior * num_clinicas:2 * (anterior + 1) * num_clinicas],
+                                 num_clinicas) == indice:
+                IDPac, tipo_consulta, urgencia, tiempo_estimado = bandeja.get(timeout=tiempo_limite)
+                gestor.admitir(RegistroPaciente(IDPac, tipo_consulta, urgencia, tiempo_estimado))
+                admitidos += 1
+            for _ in range(periodo):
+                ociosa = gestor.paso()
+                if ociosa and tipo == AGOTADA:
+                    break
+            ociosas[actual * num_clinicas + indice] = ociosa
+            esperas[2 * (actual * num_clinicas + indice)] = gestor.espera_prevista("general")
+            esperas[2 * (actual * num_clinicas + indice) + 1] = gestor.espera_prevista("specialist")
+            ronda += 1
+        resultados.put((indice, admitidos, gestor.tiempo_actual, gestor.metricas, gestor.profundidad_maxima))
+    except threading.BrokenBarrierError:
+        pass
+    except BaseException:
+        barrera.abort()
+        raise
+
+
+class CoordinadorClinicas:
+    """
+    Clase CoordinadorClinicas que ejecuta un GestorColas por clínica, cada uno en su propio proceso,
+    y asigna cada nueva admisión a la clínica con menor espera prevista para su tipo de consulta.
+
+    Como entre dos admisiones las clínicas no dependen unas de otras, avanzan por rondas de
+    periodo_admision unidades de tiempo con una sola barrera por ronda, y dentro de la ronda cada una
+    va a su ritmo. El estado que necesita el reparto (la espera prevista de cada clínica y tipo, y si
+    cada clínica está vacía) y el tipo de consulta del paciente de cada ronda se comparten mediante
+    arrays de memoria compartida, con dos copias que se alternan por rondas: en una ronda se lee la
+    copia que se escribió en la anterior y se escribe en la otra, de modo que nadie lee un valor a
+    medio escribir. El coordinador solo lee la fuente; la clínica a la que le toca el paciente (todas
+    hacen la misma elección, con las esperas al final de la unidad de tiempo anterior a la admisión)
+    lo saca de una cola común, por la que solo viajan los pacientes. Si una clínica falla o no
+    responde en tiempo_limite segundos, la barrera se rompe, los procesos que queden se terminan y
+    ejecutar lanza RuntimeError.
+
+    Métodos
+    -------
+    ejecutar(pacientes):
+        Reparte y simula la fuente de admisión completa.
+    """
+
+    def __init__(self, clinicas, periodo_admision=3, tiempo_limite=60.0):
+        """
+        Parámetros:
+        -----------
+        clinicas : list
+            Lista de Clinica.
+        periodo_admision : int
+            Cada cuántas unidades de tiempo llega un paciente al conjunto de clínicas.
+        tiempo_limite : float
+            Segundos máximos que se espera a las clínicas en cada sincronización.
+        """
+        if not clinicas:
+            raise ValueError("clinicas must be a non-empty list")
+        if not isinstance(periodo_admision, int) or periodo_admision <= 0:
+            raise ValueError("periodo_admision must be a positive integer")
+        if tiempo_limite <= 0:
+            raise ValueError("tiempo_limite must be positive")
+        self.clinicas = clinicas
+        self.periodo_admision = periodo_admision
+        self.tiempo_limite = tiempo_limite
+
+    def ejecutar(self, pacientes):
+        """
+        Ejecuta la simulación de todas las clínicas sobre la fuente de admisión.
+
+        Parámetros:
+        -----------
+        pacientes : iterable
+            Pacientes (Paciente o RegistroPaciente) en orden de admisión.
+
+        Retorna:
+        --------
+        dict
+            Para cada nombre de clínica: pacientes asignados, unidades de tiempo simuladas hasta
+            quedarse vacía tras la última admisión, métricas de espera (MetricasColas) y profundidad
+            máxima de sus colas.
+
+        Excepciones:
+        ------------
+        RuntimeError
+            Si alguna clínica falla o no responde a tiempo.
+        """
+        n = len(self.clinicas)
+        bandeja = mp.Queue()
+        barrera = mp.Barrier(n + 1)
+        tipos = mp.Array("b", 2, lock=False)
+        esperas = mp.Array("d", 4 * n, lock=False)
+        ociosas = mp.Array("b", 2 * n, lock=False)
+        resultados = mp.Queue()
+        procesos = [mp.Process(target=_ejecutar_clinica,
+                               args=(i, clinica, n, self.periodo_admision, bandeja, barrera, tipos, esperas, ociosas,
+                                     resultados, self.tiempo_limite))
+                    for i, clinica in enumerate(self.clinicas)]
+        terminado = False
+        try:
+            for proceso in procesos:
+                proceso.start()
+            fuente = pacientes if hasattr(pacientes, "dequeue") else FuenteAdmision(pacientes)
+            ronda = 0
+            while True:
+                actual, anterior = ronda & 1, (ronda & 1) ^ 1
+                if fuente.is_empty():
+                    tipos[actual] = AGOTADA
+                else:
+                    paciente = fuente.dequeue()
+                    tipo_consulta = "general" if paciente.tipo_consulta == "general" else "specialist"
+                    tipos[actual] = TIPOS_CONSULTA.index(tipo_consulta)
+                    bandeja.put((paciente.IDPac, CODIGOS_TIPO_CONSULTA[tipo_consulta],
+                                 CODIGOS_URGENCIA[paciente.urgencia], paciente.tiempo_estimado))
+                barrera.wait(self.tiempo_limite)
+                # Misma condición de fin que comprueban las clínicas tras la barrera.
+                if tipos[actual] == AGOTADA and all(ociosas[anterior * n:(anterior + 1) * n]):
+                    break
+                ronda += 1
+            # Los resultados se recogen antes del join: un proceso no termina hasta vaciar su cola.
+            finales = sorted(resultados.get(timeout=self.tiempo_limite) for _ in procesos)
+            terminado = True
+        except (threading.BrokenBarrierError, queue.Empty):
+            raise RuntimeError("a clinic process failed or did not answer in time") from None
+        finally:
+            if not terminado:
+                barrera.abort()
+            for proceso in procesos:
+                if proceso.pid is not None:
+                    proceso.join(self.tiempo_limite if terminado else 1)
+                    if proceso.is_alive():
+                        proceso.terminate()
+                        proceso.join()
+
+        salida = {}
+        for indice, admitidos, ticks, metricas, profundidad in finales:
+            salida[self.clinicas[indice].nombre] = {"admitidos": admitidos, "ticks": ticks,
+                                                    "metricas": metricas, "profundidad_maxima": profundidad}
+        return salida
+
+
+if __name__ == "__main__":
+    """
+    Ejemplo: reparte una traza sintética entre tres clínicas de distinto tamaño.
+    Uso: python coordinador_clinicas.py [num_pacientes]
+    """
+    from replicaciones import Escenario, generar_traza
+
+    num_pacientes = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    escenario = Escenario("clinicas", num_pacientes, distribucion="exponencial", tiempo_medio=12)
+    coordinador = CoordinadorClinicas([Clinica("norte", 2, 1), Clinica("centro", 1, 1), Clinica("sur", 1, 2)],
+                                      periodo_admision=2)
+    resultados = coordinador.ejecutar(generar_traza(escenario, "0"))
+    for nombre, datos in resultados.items():
+        general, specialist = datos["metricas"]["general"], datos["metricas"]["specialist"]
+        print(f"{nombre:<8} admitidos={datos['admitidos']:<7} ticks={datos['ticks']:<7} "
+              f"general media={general.media:.1f} p95={general.cuantil(0.95):.1f}  "
+              f"specialist media={specialist.media:.1f} p95={specialist.cuantil(0.95):.1f}")
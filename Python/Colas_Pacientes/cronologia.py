@@ -0,0 +1,184 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+import ast
+import struct
+import sys
+import zipfile
+from array import array
+
+NOMBRES_COLAS = ("general_priority", "general_no_priority", "specialist_priority", "specialist_no_priority")
+COLUMNAS = ("IDPac", "tipo_consulta", "urgencia", "tiempo_estimado", "admision", "inicio", "fin", "espera",
+            "cola", "sala", "priorizado", "escalado", "cancelado")
+# Columnas numéricas: código de array y descripción del tipo en formato .npy (little-endian).
+TIPOS = {
+    "tipo_consulta": ("b", "|i1"), "urgencia": ("b", "|i1"), "tiempo_estimado": ("q", "<i8"),
+    "admision": ("q", "<i8"), "inicio": ("q", "<i8"), "fin": ("q", "<i8"), "espera": ("q", "<i8"),
+    "cola": ("b", "|i1"), "sala": ("q", "<i8"), "priorizado": ("b", "|b1"), "escalado": ("b", "|b1"),
+    "cancelado": ("b", "|b1"),
+}
+
+class Cronologia:
+    """
+    Clase Cronologia que guarda, por columnas, la historia completa de cada paciente que pasa por
+    GestorColas: identificador, tipo de consulta y urgencia (0 general/priority, 1 specialist/no_priority),
+    tiempo estimado, instantes de admisión, inicio y fin de consulta, espera, cola de espera de la que
+    salió (índice en NOMBRES_COLAS), sala, si entró con la priorización aplicada, si su espera activó
+    la priorización y si canceló. Los pacientes que cancelan tienen inicio, fin, espera y sala a -1,
+    y los que siguen en consulta tienen fin a -1.
+
+    Cada columna numérica es un array tipado, por lo que registrar un paciente no crea objetos por
+    campo. guardar() escribe las columnas en un archivo .npz (un .npy por columna, sin comprimir)
+    que se carga sin conversión fila a fila:
+
+        datos = numpy.load("cronologia.npz")
+        df = pandas.DataFrame({nombre: datos[nombre] for nombre in datos.files})
+
+    Métodos
+    -------
+    registrar(paciente, nombre_cola, sala, escalado):
+        Añade un paciente que entra en consulta.
+    registrar_fin(paciente, tiempo):
+        Anota el fin de consulta de un paciente registrado.
+    registrar_cancelacion(paciente, nombre_cola):
+        Añade un paciente que cancela.
+    guardar(ruta):
+        Escribe las columnas en un archivo .npz.
+    """
+
+    def __init__(self):
+        self.vaciar()
+
+    def __len__(self):
+        return len(self.IDPac)
+
+    def vaciar(self):
+        """
+        Descarta todos los pacientes registrados.
+        """
+        self.IDPac = []
+        # Fila de cada paciente en consulta, por id del objeto paciente, hasta que se anota su fin.
+        self._en_consulta = {}
+        for nombre, (codigo, _) in TIPOS.items():
+            setattr(self, nombre, array(codigo))
+
+    def _añadir(self, paciente, nombre_cola, inicio, fin, espera, sala, escalado, cancelado):
+        self.IDPac.append(paciente.IDPac)
+        self.tipo_consulta.append(0 if paciente.tipo_consulta == "general" else 1)
+        self.urgencia.append(0 if paciente.urgencia == "priority" else 1)
+        self.tiempo_estimado.append(paciente.tiempo_estimado)
+        self.admision.append(paciente.tiempo_llegada)
+        self.inicio.append(inicio)
+        self.fin.append(fin)
+        self.espera.append(espera)
+        self.cola.append(NOMBRES_COLAS.index(nombre_cola))
+        self.sala.append(sala)
+        self.priorizado.append(bool(paciente.priorizacion))
+        self.escalado.append(escalado)
+        self.cancelado.append(cancelado)
+
+    def registrar(self, paciente, nombre_cola, sala, escalado):
+        """
+        Añade un paciente en el momento en que entra en consulta. Su fin queda a -1 hasta que
+        GestorColas libera la sala y lo anota con registrar_fin.
+
+        Parámetros:
+        -----------
+        paciente : class
+            Paciente con tiempo_llegada y tiempo_entrada_consulta ya asignados.
+        nombre_cola : str
+            Cola de espera de la que sale.
+        sala : int
+            Sala asignada.
+        escalado : bool
+            Si su espera ha activado la priorización de su identificador.
+        """
+        inicio = paciente.tiempo_entrada_consulta
+        self._en_consulta[id(paciente)] = len(self.IDPac)
+        self._añadir(paciente, nombre_cola, inicio, -1, inicio - paciente.tiempo_llegada, sala, escalado, False)
+
+    def registrar_fin(self, paciente, tiempo):
+        """
+        Anota el instante en que el paciente sale de consulta.
+
+        Parámetros:
+        -----------
+        paciente : class
+            Paciente registrado con registrar al entrar en consulta.
+        tiempo : int
+            Instante en que se libera su sala.
+        """
+        fila = self._en_consulta.pop(id(paciente), None)
+        if fila is not None:
+            self.fin[fila] = tiempo
+
+    def registrar_cancelacion(self, paciente, nombre_cola):
+        """
+        Añade un paciente que cancela mientras espera en la cola indicada.
+        """
+        self._añadir(paciente, nombre_cola, -1, -1, -1, -1, False, True)
+
+    def guardar(self, ruta):
+        """
+        Escribe las columnas en un archivo .npz sin comprimir, legible con numpy.load.
+
+        Parámetros:
+        -----------
+        ruta : str
+            Ruta del archivo.
+        """
+        with zipfile.ZipFile(ruta, "w", compression=zipfile.ZIP_STORED) as archivo:
+            ancho = max((len(IDPac) for IDPac in self.IDPac), default=1)
+            datos = "".join(IDPac.ljust(ancho, "\0") for IDPac in self.IDPac).encode("utf-32-le")
+            archivo.writestr("IDPac.npy", _cabecera_npy(f"<U{ancho}", len(self)) + datos)
+            for nombre, (_, descripcion) in TIPOS.items():
+                columna = getattr(self, nombre)
+                if sys.byteorder == "big" and columna.itemsize > 1:
+                    columna = array(columna.typecode, columna)
+                    columna.byteswap()
+                archivo.writestr(f"{nombre}.npy", _cabecera_npy(descripcion, len(columna)) + columna.tobytes())
+
+
+def _cabecera_npy(descripcion, n):
+    """
+    Devuelve la cabecera de un archivo .npy (versión 1.0) de un vector de n elementos del tipo indicado.
+    """
+    texto = repr({"descr": descripcion, "fortran_order": False, "shape": (n,)})
+    # La cabecera completa (10 bytes fijos + texto + relleno + salto de línea) ocupa un múltiplo de 64 bytes.
+    relleno = -(10 + len(texto) + 1) % 64
+    texto = texto + " " * relleno + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(texto)) + texto.encode("latin1")
+
+
+def cargar(ruta):
+    """
+    Lee un archivo guardado con Cronologia.guardar sin necesidad de NumPy.
+
+    Parámetros:
+    -----------
+    ruta : str
+        Ruta del archivo .npz.
+
+    Retorna:
+    --------
+    dict
+        Para cada nombre de COLUMNAS, una lista (IDPac) o un array tipado.
+    """
+    columnas = {}
+    with zipfile.ZipFile(ruta) as archivo:
+        for nombre in COLUMNAS:
+            contenido = archivo.read(f"{nombre}.npy")
+            largo = struct.unpack("<H", contenido[8:10])[0]
+            cabecera = ast.literal_eval(contenido[10:10 + largo].decode("latin1"))
+            datos = contenido[10 + largo:]
+            if nombre == "IDPac":
+                ancho = int(cabecera["descr"][2:])
+                texto = datos.decode("utf-32-le")
+                columnas[nombre] = [texto[i:i + ancho].rstrip("\0") for i in range(0, len(texto), ancho)]
+            else:
+                columna = array(TIPOS[nombre][0])
+                columna.frombytes(datos)
+                if sys.byteorder == "big" and columna.itemsize > 1:
+                    columna.byteswap()
+                columnas[nombre] = columna
+    return columnas
@@ -0,0 +1,174 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+import json
+import sys
+from typing import NamedTuple, Optional
+
+EN_COLA = "en_cola"
+PRIORIZACION_APLICADA = "priorizacion_aplicada"
+PRIORIZACION_ACTIVA = "priorizacion_activa"
+ENTRA = "entra"
+SALE = "sale"
+CANCELA = "cancela"
+
+class Evento(NamedTuple):
+    """
+    Registro tipado de un evento de GestorColas.
+
+    tipo : str
+        EN_COLA, PRIORIZACION_APLICADA, PRIORIZACION_ACTIVA, ENTRA, SALE o CANCELA.
+    tiempo : int
+        Valor del contador de tiempo cuando ocurre el evento.
+    IDPac, tipo_consulta, urgencia, tiempo_estimado :
+        Datos del paciente.
+    tiempo_llegada, tiempo_entrada_consulta : int or None
+        Tiempos de admisión y de entrada en consulta del paciente.
+    cola : str or None
+        Cola de espera en la que entra (EN_COLA) o de la que sale (ENTRA, CANCELA) el paciente.
+    sala : int or None
+        Sala de consulta asignada (ENTRA) o liberada (SALE).
+    """
+    tipo: str
+    tiempo: int
+    IDPac: str
+    tipo_consulta: str
+    urgencia: str
+    tiempo_estimado: int
+    tiempo_llegada: Optional[int] = None
+    tiempo_entrada_consulta: Optional[int] = None
+    cola: Optional[str] = None
+    sala: Optional[int] = None
+
+
+def formatear_evento(evento):
+    """
+    Devuelve la línea de texto de un evento, en el mismo formato que la salida por pantalla
+    original de GestorColas.
+
+    Parámetros:
+    -----------
+    evento : Evento
+        Evento a formatear.
+
+    Retorna:
+    --------
+    str
+    """
+    t = evento.tiempo
+    if evento.tipo == EN_COLA:
+        return f'{t+1}: {evento.IDPac} en cola {evento.tipo_consulta}/{evento.urgencia} EST:{evento.tiempo_estimado}'
+    if evento.tipo == PRIORIZACION_APLICADA:
+        return f'{t}: Priorización aplicada {evento.IDPac}'
+    if evento.tipo == PRIORIZACION_ACTIVA:
+        return f'{t+1}: Priorización activa {evento.IDPac}'
+    if evento.tipo == CANCELA:
+        return f'{t+1}: {evento.IDPac} cancela {evento.tipo_consulta}/{evento.urgencia} ADM:{evento.tiempo_llegada}'
+    if evento.tipo == ENTRA:
+        return (f'{t+1}: {evento.IDPac} entra {evento.tipo_consulta}/{evento.urgencia} '
+                f'ADM:{evento.tiempo_llegada}, INI: {evento.tiempo_entrada_consulta}, EST: {evento.tiempo_estimado}')
+    return (f'{t+1}: {evento.IDPac} sale {evento.tipo_consulta}/{evento.urgencia} '
+            f'ADM:{evento.tiempo_llegada}, INI: {evento.tiempo_entrada_consulta}, '
+            f'EST./TOTAL: {evento.tiempo_estimado}/{t-evento.tiempo_llegada}')
+
+
+class SinkNulo:
+    """
+    Destino de eventos desactivado. GestorColas comprueba el atributo 'activo' antes de construir
+    cada evento, por lo que con este destino el registro de eventos no tiene coste.
+    """
+    activo = False
+
+    def emitir(self, evento):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class SinkTexto:
+    """
+    Destino de eventos en texto, con el formato de patients1_out.txt. Las líneas se acumulan en un
+    buffer y se escriben de una vez cuando se llena o al llamar a flush.
+
+    Métodos
+    -------
+    emitir(evento):
+        Añade el evento al buffer.
+
+    flush():
+        Escribe las líneas pendientes en el destino.
+    """
+    activo = True
+
+    def __init__(self, destino=None, tam_buffer=4096):
+        """
+        Parámetros:
+        -----------
+        destino : file or None
+            Fichero de texto abierto en el que escribir; si es None se usa sys.stdout en el
+            momento de escribir.
+        tam_buffer : int
+            Número de líneas que se acumulan antes de escribir.
+        """
+        self.destino = destino
+        self.tam_buffer = tam_buffer
+        self._lineas = []
+
+    def emitir(self, evento):
+        self._lineas.append(formatear_evento(evento))
+        if len(self._lineas) >= self.tam_buffer:
+            self.flush()
+
+    def flush(self):
+        if self._lineas:
+            destino = self.destino if self.destino is not None else sys.stdout
+            destino.write("\n".join(self._lineas) + "\n")
+            self._lineas = []
+
+    def close(self):
+        self.flush()
+
+
+class SinkJSONL:
+    """
+    Destino de eventos en formato JSON Lines: un objeto JSON por evento con todos los campos de
+    Evento. Las líneas se acumulan en un buffer igual que en SinkTexto.
+    """
+    activo = True
+
+    def __init__(self, destino, tam_buffer=4096):
+        """
+        Parámetros:
+        -----------
+        destino : str or file
+            Ruta del archivo (se abre en modo escritura) o fichero de texto ya abierto.
+        tam_buffer : int
+            Número de eventos que se acumulan antes de escribir.
+        """
+        if isinstance(destino, str):
+            self.destino = open(destino, "w", encoding="utf-8")
+            self._propio = True
+        else:
+            self.destino = destino
+            self._propio = False
+        self.tam_buffer = tam_buffer
+        self._lineas = []
+
+    def emitir(self, evento):
+        self._lineas.append(json.dumps(evento._asdict(), ensure_ascii=False))
+        if len(self._lineas) >= self.tam_buffer:
+            self.flush()
+
+    def flush(self):
+        if self._lineas:
+            self.destino.write("\n".join(self._lineas) + "\n")
+            self._lineas = []
+
+    def close(self):
+        self.flush()
+        if self._propio:
+            self.destino.close()
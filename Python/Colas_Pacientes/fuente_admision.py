@@ -0,0 +1,95 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+from array_queue import ArrayQueue, Empty
+from paciente import Paciente
+
+def leer_pacientes(ruta):
+    """
+    Generador que lee el archivo de pacientes línea a línea y devuelve una instancia de Paciente
+    por cada línea, sin cargar el archivo completo en memoria.
+
+    Parámetros:
+    -----------
+    ruta : str
+        Ruta del archivo de pacientes (IDPac tipo_consulta urgencia tiempo_estimado).
+
+    Retorna:
+    --------
+    generator
+        Los pacientes en el orden del archivo.
+    """
+    with open(ruta, "r", encoding="utf-8") as file:
+        for line in file:
+            parts = line.split()
+            if not parts:
+                continue
+            yield Paciente(IDPac=parts[0], tipo_consulta=parts[1], urgencia=parts[2],
+                           tiempo_estimado=int(parts[3]), tiempo_llegada=None,
+                           tiempo_entrada_consulta=None, priorizacion=False)
+
+
+class FuenteAdmision:
+    """
+    Clase FuenteAdmision que adapta un iterador o generador de pacientes a la interfaz de cola
+    (is_empty, dequeue) que utiliza GestorColas para la admisión. Los pacientes se leen de forma
+    perezosa y nunca se adelantan más de 'anticipacion' pacientes, de modo que la memoria depende
+    de los pacientes que hay en el sistema y no del tamaño del archivo.
+
+    Métodos
+    -------
+    is_empty():
+        Indica si la fuente se ha agotado.
+
+    dequeue():
+        Devuelve el siguiente paciente de la fuente.
+    """
+
+    def __init__(self, pacientes, anticipacion=1):
+        """
+        Inicializa la fuente de admisión.
+
+        Parámetros:
+        -----------
+        pacientes : iterable
+            Iterador, generador o colección de pacientes en orden de admisión.
+        anticipacion : int
+            Número máximo de pacientes leídos por adelantado (1 por defecto).
+        """
+        if not isinstance(anticipacion, int) or anticipacion < 1:
+            raise ValueError("anticipacion must be a positive integer")
+        self._pacientes = iter(pacientes)
+        self._anticipacion = anticipacion
+        self._buffer = ArrayQueue()
+        self._agotada = False
+
+    def _rellenar(self):
+        """
+        Lee de la fuente hasta completar el buffer de anticipación o agotarla.
+        """
+        while not self._agotada and len(self._buffer) < self._anticipacion:
+            try:
+                self._buffer.enqueue(next(self._pacientes))
+            except StopIteration:
+                self._agotada = True
+
+    def is_empty(self):
+        """
+        Indica si no quedan pacientes por admitir.
+        """
+        if self._buffer.is_empty():
+            self._rellenar()
+        return self._buffer.is_empty()
+
+    def dequeue(self):
+        """
+        Devuelve el siguiente paciente de la fuente.
+
+        Excepciones:
+        ------------
+        Empty
+            Si la fuente está agotada, como en ArrayQueue y ColaHeap.
+        """
+        if self.is_empty():
+            raise Empty("Queue is empty")
+        return self._buffer.dequeue()
@@ -3,6 +3,22 @@
 
 from array_queue import ArrayQueue
 from paciente import Paciente
+from salas_consulta import SalasConsulta
+from fuente_admision import FuenteAdmision
+from procesos_llegada import ProcesoLlegadas
+from metricas import MetricasColas
+from sumas_prefijas import SumasPrefijas
+from politicas import PoliticaFIFO
+from eventos import Evento, SinkTexto, EN_COLA, PRIORIZACION_APLICADA, PRIORIZACION_ACTIVA, ENTRA, SALE, CANCELA
+
+_METODOS_COLA = ("enqueue", "dequeue", "first", "is_empty")
+
+def _es_cola(valor):
+    """
+    Indica si el valor tiene la interfaz de cola que usa GestorColas (enqueue, dequeue, first e
+    is_empty), como ArrayQueue o ColaHeap.
+    """
+    return all(callable(getattr(valor, metodo, None)) for metodo in _METODOS_COLA)
 
 class GestorColas:
     """
@@ -15,15 +31,36 @@ class GestorColas:
     almacenar_paciente(paciente, tiempo_actual):
         Clasifica los pacientes en colas de acuerdo con su tipo de consulta y urgencia.
 
-    gestion_paciente(paciente, tiempo_actual, lista_penalizaciones, lista_tiempo_espera):
-        Realiza la gestión de un paciente durante el proceso de consulta, realizando distintas acciones
+    gestion_lista_espera(cola_admision):
+        Realiza la gestión de los pacientes durante el proceso de consulta, realizando distintas acciones
         en función del tiempo de espera y la prioridad.
+
+    paso(cola_admision):
+        Ejecuta una única unidad de tiempo, para usar el gestor con un reloj externo.
+
+    cancelar(IDPac):
+        Retira de su cola de espera a un paciente que se va sin ser atendido.
+
+    Atributos
+    ---------
+    metricas : MetricasColas
+        Métricas de espera en línea (número, media y percentiles) por cola de espera y por tipo de
+        consulta, que se pueden consultar durante la ejecución.
+    profundidad_maxima : dict
+        Longitud máxima alcanzada por cada una de las cuatro colas en la ejecución actual.
+    sumas_colas : dict
+        SumasPrefijas del tiempo estimado de los pacientes de cada una de las cuatro colas, en orden de
+        llegada, con las que se estiman las esperas en O(log n).
+    escalados, cancelados : int
+        Número de pacientes escalados a prioridad y de cancelaciones en la ejecución actual.
     """
     
-    def __init__(self, general_priority, general_no_priority, specialist_priority, specialist_no_priority, priorizacion):
+    def __init__(self, general_priority, general_no_priority, specialist_priority, specialist_no_priority, priorizacion,
+                 salas_general=1, salas_specialist=1, periodo_admision=3, eventos=None,
+                 politica=None, guardar_resultados=True, series=None, cronologia=None):
         """
         Inicializa el gestor de colas con las colas correspondientes para pacientes generales y especialistas,
-        tanto con prioridad como sin ella.
+        tanto con prioridad como sin ella, y con el número de salas de cada tipo de consulta.
         
         Parámetros:
         -----------
@@ -36,13 +73,53 @@ class GestorColas:
         specialist_no_priority : ArrayQueue
             Cola de pacientes especialistas sin prioridad.
         priorizacion : list
-            Lista de identificadores de pacientes que han sido priorizados.
+            Lista de identificadores de pacientes que han sido priorizados. Internamente se guarda
+            como un diccionario con orden de inserción, para comprobar la pertenencia en O(1).
+        salas_general : int
+            Número de salas de consulta general (1 por defecto).
+        salas_specialist : int
+            Número de salas de consulta de especialista (1 por defecto).
+        periodo_admision : int
+            Cada cuántas unidades de tiempo se admite un paciente (3 por defecto).
+        eventos : SinkNulo, SinkTexto, SinkJSONL or None
+            Destino de los eventos (en cola, entra, sale, priorización). Por defecto, un SinkTexto
+            que escribe en la salida estándar con el formato de patients1_out.txt; con SinkNulo()
+            la ejecución es silenciosa.
+        politica : PoliticaFIFO or None
+            Política de planificación (ver politicas.py). Por defecto, PoliticaFIFO: orden de llegada
+            y la cola con prioridad antes que la cola sin prioridad. Si la política necesita otro tipo
+            de cola, las cuatro colas recibidas se sustituyen por colas de la política.
+        guardar_resultados : bool
+            Si es False no se guarda la fila de cada paciente en lista_pandas y gestion_lista_espera
+            devuelve una lista vacía; las métricas se siguen calculando. Útil en trazas muy grandes.
+        series : SeriesTemporales or None
+            Si se indica, al final de cada 'series.cada' unidades de tiempo se muestrean la profundidad
+            de las colas, las salas ocupadas y los escalados y cancelaciones acumulados.
+        cronologia : Cronologia or None
+            Si se indica, se guarda por columnas la historia completa de cada paciente (admisión,
+            priorización, inicio y fin de consulta, cola y sala), que se puede volcar a un archivo .npz.
         """
         self.general_priority = general_priority
         self.general_no_priority = general_no_priority
         self.specialist_priority = specialist_priority
         self.specialist_no_priority = specialist_no_priority
-        self.priorizacion = []
+        self.salas_general = salas_general
+        self.salas_specialist = salas_specialist
+        self.periodo_admision = periodo_admision
+        self.guardar_resultados = guardar_resultados
+        self.series = series
+        self.cronologia = cronologia
+        self.eventos = eventos if eventos is not None else SinkTexto()
+        self.politica = politica if politica is not None else PoliticaFIFO()
+        for nombre in ("general_priority", "general_no_priority", "specialist_priority", "specialist_no_priority"):
+            nueva = self.politica.nueva_cola()
+            if nueva is None:
+                break
+            anterior = getattr(self, nombre)
+            while not anterior.is_empty():
+                nueva.enqueue(anterior.dequeue())
+            setattr(self, nombre, nueva)
+        self.iniciar()
     
     @property
     def general_priority(self):
@@ -54,7 +131,7 @@ class GestorColas:
     @general_priority.setter
     def general_priority(self, value:ArrayQueue):
         """
-        Setter para la cola de pacientes generales con prioridad. Se asegura de que el valor sea una instancia de ArrayQueue.
+        Setter para la cola de pacientes generales con prioridad. Se asegura de que el valor tenga la interfaz de una cola.
         
         Parámetros:
         ----------
@@ -64,9 +141,9 @@ class GestorColas:
         Excepciones:
         ------------
         ValueError
-            Si el valor no es una instancia de ArrayQueue, se lanzará una excepción.
+            Si el valor no tiene los métodos enqueue, dequeue, first e is_empty, se lanzará una excepción.
         """
-        if isinstance(value, ArrayQueue):
+        if _es_cola(value):
             self._general_priority = value
         else:
             raise ValueError("general_priority must be a non-empty array")
@@ -81,7 +158,7 @@ class GestorColas:
     @general_no_priority.setter
     def general_no_priority(self, value:ArrayQueue):
         """
-        Setter para la cola de pacientes generales sin prioridad. Se asegura de que el valor sea una instancia de ArrayQueue.
+        Setter para la cola de pacientes generales sin prioridad. Se asegura de que el valor tenga la interfaz de una cola.
         
         Parámetros:
         ----------
@@ -91,9 +168,9 @@ class GestorColas:
         Excepciones:
         ------------
         ValueError
-            Si el valor no es una instancia de ArrayQueue, se lanzará una excepción.
+            Si el valor no tiene los métodos enqueue, dequeue, first e is_empty, se lanzará una excepción.
         """
-        if isinstance(value, ArrayQueue):
+        if _es_cola(value):
             self._general_no_priority = value
         else:
             raise ValueError("Name must be a non-empty array")
@@ -108,7 +185,7 @@ class GestorColas:
     @specialist_priority.setter
     def specialist_priority(self, value:ArrayQueue):
         """
-        Setter para la cola de pacientes especialistas con prioridad. Se asegura de que el valor sea una instancia de ArrayQueue.
+        Setter para la cola de pacientes especialistas con prioridad. Se asegura de que el valor tenga la interfaz de una cola.
         
         Parámetros:
         ----------
@@ -118,9 +195,9 @@ class GestorColas:
         Excepciones:
         ------------
         ValueError
-            Si el valor no es una instancia de ArrayQueue, se lanzará una excepción.
+            Si el valor no tiene los métodos enqueue, dequeue, first e is_empty, se lanzará una excepción.
         """
-        if isinstance(value, ArrayQueue):
+        if _es_cola(value):
             self._specialist_priority = value
         else:
             raise ValueError("Name must be a non-empty array")
@@ -135,7 +212,7 @@ class GestorColas:
     @specialist_no_priority.setter
     def specialist_no_priority(self, value:ArrayQueue):
         """
-        Setter para la cola de pacientes especialistas sin prioridad. Se asegura de que el valor sea una instancia de ArrayQueue.
+        Setter para la cola de pacientes especialistas sin prioridad. Se asegura de que el valor tenga la interfaz de una cola.
         
         Parámetros:
         ----------
@@ -145,13 +222,79 @@ class GestorColas:
         Excepciones:
         ------------
         ValueError
-            Si el valor no es una instancia de ArrayQueue, se lanzará una excepción.
+            Si el valor no tiene los métodos enqueue, dequeue, first e is_empty, se lanzará una excepción.
         """
-        if isinstance(value, ArrayQueue):
+        if _es_cola(value):
             self._specialist_no_priority = value
         else:
             raise ValueError("Name must be a non-empty array")
     
+    @property
+    def salas_general(self):
+        """
+        Getter para el número de salas de consulta general.
+        """
+        return self._salas_general
+        
+    @salas_general.setter
+    def salas_general(self, value:int):
+        """
+        Setter para el número de salas de consulta general. Se asegura de que el valor sea un entero positivo.
+        
+        Excepciones:
+        ------------
+        ValueError
+            Si el valor no es un entero mayor que cero, se lanzará una excepción.
+        """
+        if isinstance(value, int) and value > 0:
+            self._salas_general = value
+        else:
+            raise ValueError("salas_general must be a positive integer")
+    
+    @property
+    def salas_specialist(self):
+        """
+        Getter para el número de salas de consulta de especialista.
+        """
+        return self._salas_specialist
+        
+    @salas_specialist.setter
+    def salas_specialist(self, value:int):
+        """
+        Setter para el número de salas de consulta de especialista. Se asegura de que el valor sea un entero positivo.
+        
+        Excepciones:
+        ------------
+        ValueError
+            Si el valor no es un entero mayor que cero, se lanzará una excepción.
+        """
+        if isinstance(value, int) and value > 0:
+            self._salas_specialist = value
+        else:
+            raise ValueError("salas_specialist must be a positive integer")
+    
+    @property
+    def periodo_admision(self):
+        """
+        Getter para el periodo de admisión de pacientes.
+        """
+        return self._periodo_admision
+        
+    @periodo_admision.setter
+    def periodo_admision(self, value:int):
+        """
+        Setter para el periodo de admisión. Se asegura de que el valor sea un entero positivo.
+        
+        Excepciones:
+        ------------
+        ValueError
+            Si el valor no es un entero mayor que cero, se lanzará una excepción.
+        """
+        if isinstance(value, int) and value > 0:
+            self._periodo_admision = value
+        else:
+            raise ValueError("periodo_admision must be a positive integer")
+    
     def almacenar_paciente(self, paciente, tiempo_actual):
         """
         Clasifica un paciente según su tipo de consulta y urgencia, y lo agrega a la cola correspondiente.
@@ -165,168 +308,494 @@ class GestorColas:
         
         Retorna:
         --------
-        None
+        str
+            El nombre de la cola en la que se ha almacenado el paciente.
         """
         paciente.tiempo_llegada = tiempo_actual
         if paciente.tipo_consulta == "general":
             if paciente.urgencia == "priority" or paciente.priorizacion:
-                self.general_priority.enqueue(paciente)
+                nombre_cola, cola = "general_priority", self.general_priority
             else:
-                self.general_no_priority.enqueue(paciente)
+                nombre_cola, cola = "general_no_priority", self.general_no_priority
         else:
             if paciente.urgencia == "priority" or paciente.priorizacion:
-                self.specialist_priority.enqueue(paciente)
+                nombre_cola, cola = "specialist_priority", self.specialist_priority
             else:
-                self.specialist_no_priority.enqueue(paciente)
+                nombre_cola, cola = "specialist_no_priority", self.specialist_no_priority
+        cola.enqueue(paciente)
+        sumas = self.sumas_colas[nombre_cola]
+        paciente.orden_cola = sumas.añadir(paciente.tiempo_estimado)
+        if len(sumas) > self.profundidad_maxima[nombre_cola]:
+            self.profundidad_maxima[nombre_cola] = len(sumas)
+        esperando = self._en_espera.get(paciente.IDPac)
+        if esperando is None:
+            self._en_espera[paciente.IDPac] = [paciente]
+        else:
+            esperando.append(paciente)
+        return nombre_cola
     
-    def gestion_lista_espera(self, cola_admision):
+    def iniciar(self):
         """
-        Gestiona el proceso completo de un paciente en la cola de espera, incluyendo la asignación de consultas y
-        la priorización si es necesario.
+        Prepara una nueva ejecución: pone el contador de tiempo a cero, crea las salas de consulta
+        libres y vacía la lista de resultados, los pacientes pendientes de priorizar, las métricas de
+        espera, las profundidades máximas, las sumas de tiempos de las colas, los contadores de escalados
+        y cancelaciones, las series temporales y la cronología, y descarta el estado de la política de
+        planificación.
+
+        Retorna:
+        --------
+        None
+        """
+        self.tiempo_actual = 0
+        self.consultas_general = SalasConsulta(self.salas_general)
+        self.consultas_specialist = SalasConsulta(self.salas_specialist)
+        self.lista_pandas = []
+        self.priorizacion = {}
+        self.metricas = MetricasColas()
+        self._lista_pacientes_priorizados = {}
+        self.profundidad_maxima = dict.fromkeys(("general_priority", "general_no_priority",
+                                                 "specialist_priority", "specialist_no_priority"), 0)
+        self.sumas_colas = {nombre: SumasPrefijas() for nombre in self.profundidad_maxima}
+        self._en_espera = {}
+        self._cancelados = set()
+        self._tumbas = dict.fromkeys(self.profundidad_maxima, 0)
+        self.escalados = 0
+        self.cancelados = 0
+        self._proxima_muestra = float("inf")
+        if self.series is not None:
+            self.series.vaciar()
+            self._proxima_muestra = 0
+        if self.cronologia is not None:
+            self.cronologia.vaciar()
+        self.politica.iniciar()
+
+    def _añadir_priorizado(self, IDPac):
+        """
+        Anota que un paciente con este identificador ha entrado en cola con la priorización aplicada.
+        Se cuentan las apariciones, porque el mismo identificador puede estar en espera varias veces.
+        """
+        self._lista_pacientes_priorizados[IDPac] = self._lista_pacientes_priorizados.get(IDPac, 0) + 1
+
+    def _quitar_priorizado(self, IDPac):
+        """
+        Quita una aparición del identificador de los pacientes con la priorización aplicada.
+        """
+        if self._lista_pacientes_priorizados[IDPac] == 1:
+            del self._lista_pacientes_priorizados[IDPac]
+        else:
+            self._lista_pacientes_priorizados[IDPac] -= 1
+
+    def admitir(self, paciente):
+        """
+        Admite un paciente en el tiempo actual: aplica la priorización pendiente si la tiene y lo
+        almacena en su cola de espera.
 
         Parámetros:
         -----------
-        cola_admision : ArrayQueue
-            Cola de pacientes en espera que aún no han sido procesados.
+        paciente : class
+            El paciente que se admite.
 
         Retorna:
         --------
-        list
-            Una lista con los detalles de los pacientes procesados y sus tiempos de espera.
+        None
         """
-        
-        def pasa_paciente_a_consulta(lista, cnt, lista_pandas, lista_pacientes_priorizados):
-            """
-            Mueve un paciente de la cola de espera a la consulta, actualizando su tiempo de entrada y priorización si es necesario.
-            
-            Parámetros:
-            -----------
-            lista : ArrayQueue
-                La cola de pacientes a gestionar.
-            cnt : int
-                El contador del tiempo actual.
-            lista_pandas : list
-                Lista donde se almacenan los resultados de la gestión de pacientes.
-            lista_pacientes_priorizados : list
-                Lista que contiene los identificadores de los pacientes priorizados.
-            
-            Retorna:
-            --------
-            paciente : class
-                El paciente que fue movido a consulta.
-            """
+        cnt = self.tiempo_actual
+        eventos = self.eventos
+        paciente.tiempo_llegada = int(cnt)
+        if paciente.IDPac in self.priorizacion:
+            paciente.priorizacion = True
+            del self.priorizacion[paciente.IDPac]
+            if eventos.activo:
+                eventos.emitir(Evento(PRIORIZACION_APLICADA, cnt, paciente.IDPac, paciente.tipo_consulta,
+                                      paciente.urgencia, paciente.tiempo_estimado, cnt))
+            self._añadir_priorizado(paciente.IDPac)
+        nombre_cola = self.almacenar_paciente(paciente, cnt)
+        if eventos.activo:
+            eventos.emitir(Evento(EN_COLA, cnt, paciente.IDPac, paciente.tipo_consulta, paciente.urgencia,
+                                  paciente.tiempo_estimado, cnt, cola=nombre_cola))
+
+    def _sacar_de_cola(self, lista, nombre_cola):
+        """
+        Saca el siguiente paciente de una cola de espera y quita su tiempo estimado de las sumas de la cola.
+        """
+        paciente = lista.dequeue()
+        self.sumas_colas[nombre_cola].quitar(paciente.orden_cola)
+        self._quitar_en_espera(paciente)
+        if self._tumbas[nombre_cola]:
+            self._purgar_cabeza(lista, nombre_cola)
+        return paciente
+
+    def _quitar_en_espera(self, paciente):
+        """
+        Quita el paciente del índice de pacientes en espera por IDPac.
+        """
+        esperando = self._en_espera[paciente.IDPac]
+        if len(esperando) == 1:
+            del self._en_espera[paciente.IDPac]
+        else:
+            esperando.remove(paciente)
+
+    @staticmethod
+    def _nombre_cola(paciente):
+        """
+        Devuelve el nombre de la cola de espera en la que almacenar_paciente pone al paciente.
+        """
+        if paciente.urgencia == "priority" or paciente.priorizacion:
+            return paciente.tipo_consulta + "_priority"
+        return paciente.tipo_consulta + "_no_priority"
+
+    def cancelar(self, IDPac):
+        """
+        Retira de su cola de espera al paciente con este identificador (el admitido antes, si hay
+        varios), por ejemplo porque se ha ido sin ser atendido. El paciente no se saca de la cola:
+        se marca como cancelado (lápida) y se descarta cuando llega a la cabeza, por lo que el coste
+        es O(1) salvo por la actualización de las sumas de tiempos, O(log n). Cuando las lápidas de
+        una cola superan a sus pacientes vivos, la cola se compacta.
+
+        Parámetros:
+        -----------
+        IDPac : str
+            Identificador del paciente.
+
+        Retorna:
+        --------
+        paciente : class or None
+            El paciente cancelado, o None si no había ningún paciente en espera con ese identificador.
+        """
+        esperando = self._en_espera.get(IDPac)
+        if not esperando:
+            return None
+        paciente = esperando[0]
+        nombre_cola = self._nombre_cola(paciente)
+        self._retirar(paciente, nombre_cola)
+        self.cancelados += 1
+        if self.cronologia is not None:
+            self.cronologia.registrar_cancelacion(paciente, nombre_cola)
+        if self.eventos.activo:
+            self.eventos.emitir(Evento(CANCELA, self.tiempo_actual, IDPac, paciente.tipo_consulta,
+                                       paciente.urgencia, paciente.tiempo_estimado, paciente.tiempo_llegada,
+                                       cola=nombre_cola))
+        return paciente
+
+    def _retirar(self, paciente, nombre_cola):
+        """
+        Marca como cancelado a un paciente que está en la cola de espera indicada y actualiza las
+        sumas de tiempos, el índice por IDPac y los pacientes con priorización aplicada.
+        """
+        self.sumas_colas[nombre_cola].quitar(paciente.orden_cola)
+        self._quitar_en_espera(paciente)
+        if paciente.priorizacion and paciente.IDPac in self._lista_pacientes_priorizados:
+            self._quitar_priorizado(paciente.IDPac)
+        self._cancelados.add(id(paciente))
+        self._tumbas[nombre_cola] += 1
+        lista = getattr(self, nombre_cola)
+        self._purgar_cabeza(lista, nombre_cola)
+        if self._tumbas[nombre_cola] > len(self.sumas_colas[nombre_cola]):
+            self.compactar(nombre_cola)
+
+    def _purgar_cabeza(self, lista, nombre_cola):
+        """
+        Descarta los pacientes cancelados que hay en la cabeza de una cola, de modo que first() y
+        is_empty() de la cola se refieran siempre a pacientes vivos.
+        """
+        cancelados = self._cancelados
+        while not lista.is_empty() and id(lista.first()) in cancelados:
+            cancelados.discard(id(lista.dequeue()))
+            self._tumbas[nombre_cola] -= 1
+
+    def compactar(self, nombre_cola):
+        """
+        Reconstruye una cola de espera sin los pacientes cancelados, conservando el orden de los demás.
+
+        Parámetros:
+        -----------
+        nombre_cola : str
+            Una de 'general_priority', 'general_no_priority', 'specialist_priority' o 'specialist_no_priority'.
+        """
+        if not self._tumbas[nombre_cola]:
+            return
+        lista = getattr(self, nombre_cola)
+        cancelados = self._cancelados
+        vivos = []
+        while not lista.is_empty():
             paciente = lista.dequeue()
-            paciente.tiempo_entrada_consulta = cnt
-            if cnt - paciente.tiempo_llegada > 7 and paciente.IDPac not in self.priorizacion:
-                self.priorizacion.append(paciente.IDPac)
-                print(f'{cnt+1}: Priorización activa {paciente.IDPac}')
-            
-            print(f'{cnt+1}: {paciente.IDPac} entra {paciente.tipo_consulta}/{paciente.urgencia} '
-                  f'ADM:{paciente.tiempo_llegada}, INI: {paciente.tiempo_entrada_consulta}, EST: {paciente.tiempo_estimado}')
-            if paciente.IDPac in self.priorizacion:
-                priority = True
-            else:
-                priority = False
-            if paciente.IDPac in lista_pacientes_priorizados:
-                if paciente.tipo_consulta == 'general':
-                    cola_de_espera = 'general_priority'
-                else:
-                    cola_de_espera = 'specialist_priority'
-                lista_pacientes_priorizados.remove(paciente.IDPac)
+            if id(paciente) in cancelados:
+                cancelados.discard(id(paciente))
             else:
-                if paciente.tipo_consulta == 'general':
-                    cola_de_espera = 'general_no_priority'
-                else:
-                    cola_de_espera = 'specialist_no_priority'
-            lista_pandas.append([paciente.IDPac, paciente.tipo_consulta, priority, cola_de_espera, 
-                                 (paciente.tiempo_entrada_consulta - paciente.tiempo_llegada)])
-            return paciente
+                vivos.append(paciente)
+        for paciente in vivos:
+            lista.enqueue(paciente)
+        self._tumbas[nombre_cola] = 0
+
+    def espera_prevista(self, tipo_consulta, urgencia=None):
+        """
+        Estima la espera de un paciente que llegara ahora: el tiempo estimado de los pacientes que
+        pasarían antes que él más lo que les queda a las consultas en curso, repartido entre las salas
+        de su tipo de consulta. Con la política por defecto, a un paciente con prioridad solo le
+        preceden los de la cola con prioridad; a uno sin prioridad, los de ambas colas. Coste O(1).
+
+        Parámetros:
+        -----------
+        tipo_consulta : str
+            'general' o 'specialist'.
+        urgencia : str or None
+            'priority' o 'no_priority'. Si es None se cuentan los pacientes de ambas colas.
+
+        Retorna:
+        --------
+        float
+        """
+        salas = self.consultas_general if tipo_consulta == "general" else self.consultas_specialist
+        trabajo = self.sumas_colas[tipo_consulta + "_priority"].total
+        if urgencia != "priority":
+            trabajo += self.sumas_colas[tipo_consulta + "_no_priority"].total
+        return (trabajo + salas.trabajo_restante(self.tiempo_actual)) / salas.num_salas
+
+    def espera_en_posicion(self, nombre_cola, posicion):
+        """
+        Estima, en O(log n), la espera del paciente que ocupa una posición de una cola de espera: el
+        tiempo estimado de los pacientes que tiene delante en su cola (y, si es una cola sin prioridad,
+        de toda la cola con prioridad de su tipo) más lo que les queda a las consultas en curso,
+        repartido entre las salas. Las posiciones siguen el orden de llegada, que es el de atención
+        salvo en políticas que reordenan las colas.
+
+        Parámetros:
+        -----------
+        nombre_cola : str
+            Una de 'general_priority', 'general_no_priority', 'specialist_priority' o 'specialist_no_priority'.
+        posicion : int
+            Posición en la cola, empezando en 0 para el primero.
+
+        Retorna:
+        --------
+        float
+
+        Excepciones:
+        ------------
+        ValueError
+            Si la posición no corresponde a ningún paciente de la cola.
+        """
+        sumas = self.sumas_colas[nombre_cola]
+        if not 0 <= posicion < len(sumas):
+            raise ValueError("posicion must be a valid position in the queue")
+        tipo_consulta, _, urgencia = nombre_cola.partition("_")
+        salas = self.consultas_general if tipo_consulta == "general" else self.consultas_specialist
+        trabajo = sumas.suma_primeros(posicion)
+        if urgencia == "no_priority":
+            trabajo += self.sumas_colas[tipo_consulta + "_priority"].total
+        return (trabajo + salas.trabajo_restante(self.tiempo_actual)) / salas.num_salas
+
+    def _pasa_paciente_a_consulta(self, lista, nombre_cola, salas):
+        """
+        Mueve un paciente de la cola de espera a una sala libre, actualizando su tiempo de entrada y priorización si es necesario.
         
-        def fin_consulta(paciente, cnt):
-            """
-            Finaliza la consulta de un paciente si el tiempo actual es mayor que el tiempo estimado de consulta.
-            
-            Parámetros:
-            -----------
-            paciente : class
-                El paciente que se está gestionando.
-            cnt : int
-                El contador del tiempo actual.
-            
-            Retorna:
-            --------
-            paciente : class or None
-                El paciente si aún no ha terminado la consulta, o None si ya ha finalizado.
-            """
-            if cnt >= paciente.tiempo_entrada_consulta + paciente.tiempo_estimado:
-                print(f'{cnt+1}: {paciente.IDPac} sale {paciente.tipo_consulta}/{paciente.urgencia} '
-                      f'ADM:{paciente.tiempo_llegada}, INI: {paciente.tiempo_entrada_consulta}, '
-                      f'EST./TOTAL: {paciente.tiempo_estimado}/{cnt-paciente.tiempo_llegada}')
-                return None
-            else:
-                return paciente
+        Parámetros:
+        -----------
+        lista : ArrayQueue
+            La cola de pacientes a gestionar.
+        nombre_cola : str
+            El nombre de la cola de pacientes.
+        salas : SalasConsulta
+            Las salas del tipo de consulta del paciente, con al menos una libre.
         
-        def gestion_consulta(paciente, priority, no_priority, cnt, lista_pandas, lista_pacientes_priorizados):
-            """
-            Gestiona el proceso de consulta de un paciente, moviéndolo entre las colas de espera y la consulta,
-            dependiendo de su estado y prioridad.
-            
-            Parámetros:
-            -----------
-            paciente : class or None
-                El paciente que se está gestionando.
-            priority : ArrayQueue
-                La cola de pacientes con prioridad.
-            no_priority : ArrayQueue
-                La cola de pacientes sin prioridad.
-            cnt : int
-                El contador del tiempo actual.
-            lista_pandas : list
-                Lista que contiene los resultados de la gestión de pacientes.
-            lista_pacientes_priorizados : list
-                Lista de los pacientes que han sido priorizados.
-            
-            Retorna:
-            --------
-            paciente : class or None
-                El paciente que está siendo gestionado, o None si ya ha terminado su consulta.
-            """
-            if paciente == None:
-                if not priority.is_empty():
-                    paciente = pasa_paciente_a_consulta(priority, cnt, lista_pandas, lista_pacientes_priorizados)
-                elif not no_priority.is_empty():
-                    paciente = pasa_paciente_a_consulta(no_priority, cnt, lista_pandas, lista_pacientes_priorizados)
+        Retorna:
+        --------
+        paciente : class
+            El paciente que fue movido a consulta.
+        """
+        cnt = self.tiempo_actual
+        eventos = self.eventos
+        paciente = self._sacar_de_cola(lista, nombre_cola)
+        paciente.tiempo_entrada_consulta = cnt
+        sala = salas.asignar(paciente)
+        escalado = cnt - paciente.tiempo_llegada > 7 and paciente.IDPac not in self.priorizacion
+        if escalado:
+            self.priorizacion[paciente.IDPac] = None
+            self.escalados += 1
+            if eventos.activo:
+                eventos.emitir(Evento(PRIORIZACION_ACTIVA, cnt, paciente.IDPac, paciente.tipo_consulta,
+                                      paciente.urgencia, paciente.tiempo_estimado, paciente.tiempo_llegada))
+        
+        if eventos.activo:
+            eventos.emitir(Evento(ENTRA, cnt, paciente.IDPac, paciente.tipo_consulta, paciente.urgencia,
+                                  paciente.tiempo_estimado, paciente.tiempo_llegada, cnt, nombre_cola, sala))
+        if paciente.IDPac in self.priorizacion:
+            priority = True
+        else:
+            priority = False
+        if paciente.IDPac in self._lista_pacientes_priorizados:
+            if paciente.tipo_consulta == 'general':
+                cola_de_espera = 'general_priority'
+            else:
+                cola_de_espera = 'specialist_priority'
+            self._quitar_priorizado(paciente.IDPac)
+        else:
+            if paciente.tipo_consulta == 'general':
+                cola_de_espera = 'general_no_priority'
             else:
-                paciente = fin_consulta(paciente, cnt)
-                if paciente == None:
-                    paciente = gestion_consulta(paciente, priority, no_priority, cnt, lista_pandas, lista_pacientes_priorizados)
-            return paciente
+                cola_de_espera = 'specialist_no_priority'
+        tiempo_espera = paciente.tiempo_entrada_consulta - paciente.tiempo_llegada
+        if self.guardar_resultados:
+            self.lista_pandas.append([paciente.IDPac, paciente.tipo_consulta, priority, cola_de_espera, tiempo_espera])
+        # Las métricas van por la cola de la que ha salido el paciente; cola_de_espera es la etiqueta
+        # de la salida original, que solo es *_priority para los pacientes priorizados.
+        self.metricas.registrar(nombre_cola, paciente.tipo_consulta, tiempo_espera)
+        if self.cronologia is not None:
+            self.cronologia.registrar(paciente, nombre_cola, sala, escalado)
+        return paciente
+
+    def _fin_consulta(self, paciente, sala):
+        """
+        Finaliza la consulta de un paciente cuya sala ha sido liberada en el tiempo actual.
         
-        cnt = 0
-        paciente_general = None
-        paciente_specialist = None
-        lista_pandas = []
-        lista_pacientes_priorizados = []
+        Parámetros:
+        -----------
+        paciente : class
+            El paciente que sale de consulta.
+        sala : int
+            La sala que queda libre.
         
-        while True:
-            if cnt % 3 == 0:
-                if not cola_admision.is_empty():
-                    paciente = cola_admision.dequeue()
-                    paciente.tiempo_llegada = int(cnt)
-                    if paciente.IDPac in self.priorizacion:
-                        paciente.priorizacion = True
-                        self.priorizacion.remove(paciente.IDPac)
-                        print(f'{cnt}: Priorización aplicada {paciente.IDPac}')
-                        lista_pacientes_priorizados.append(paciente.IDPac)
-                    self.almacenar_paciente(paciente, cnt)
-                    print(f'{cnt+1}: {paciente.IDPac} en cola {paciente.tipo_consulta}/{paciente.urgencia} EST:{paciente.tiempo_estimado}')
-            
-            paciente_general = gestion_consulta(paciente_general, self.general_priority, self.general_no_priority, cnt, lista_pandas, lista_pacientes_priorizados)
-            paciente_specialist = gestion_consulta(paciente_specialist, self.specialist_priority, self.specialist_no_priority, cnt, lista_pandas, lista_pacientes_priorizados)
+        Retorna:
+        --------
+        None
+        """
+        if self.cronologia is not None:
+            self.cronologia.registrar_fin(paciente, self.tiempo_actual)
+        if self.eventos.activo:
+            self.eventos.emitir(Evento(SALE, self.tiempo_actual, paciente.IDPac, paciente.tipo_consulta,
+                                       paciente.urgencia, paciente.tiempo_estimado, paciente.tiempo_llegada,
+                                       paciente.tiempo_entrada_consulta, sala=sala))
 
-            if cola_admision.is_empty() and self.general_priority.is_empty() and self.general_no_priority.is_empty() \
-                and self.specialist_no_priority.is_empty() and self.specialist_priority.is_empty() \
-                and paciente_general == None and paciente_specialist == None:
-                return lista_pandas
+    def _gestion_consulta(self, salas, tipo_consulta, priority, no_priority):
+        """
+        Gestiona las salas de un tipo de consulta: libera las salas cuyas consultas han terminado y
+        ocupa las salas libres con pacientes de las colas de espera, en el orden que decida la política
+        de planificación (por defecto, primero la cola con prioridad).
+        
+        Parámetros:
+        -----------
+        salas : SalasConsulta
+            Las salas del tipo de consulta a gestionar.
+        tipo_consulta : str
+            El tipo de consulta de las salas ('general' o 'specialist').
+        priority : ArrayQueue
+            La cola de pacientes con prioridad.
+        no_priority : ArrayQueue
+            La cola de pacientes sin prioridad.
+        
+        Retorna:
+        --------
+        None
+        """
+        for sala, paciente in salas.liberar(self.tiempo_actual):
+            self._fin_consulta(paciente, sala)
+        while salas.hay_sala_libre():
+            cola = self.politica.elegir(priority, no_priority, self.tiempo_actual, tipo_consulta)
+            if cola is None:
+                break
+            if cola is priority:
+                self._pasa_paciente_a_consulta(priority, tipo_consulta + '_priority', salas)
             else:
-                cnt += 1
+                self._pasa_paciente_a_consulta(no_priority, tipo_consulta + '_no_priority', salas)
+
+    def esta_vacio(self):
+        """
+        Indica si no queda ningún paciente en las colas de espera ni en las salas de consulta.
+        """
+        return self.general_priority.is_empty() and self.general_no_priority.is_empty() \
+            and self.specialist_no_priority.is_empty() and self.specialist_priority.is_empty() \
+            and self.consultas_general.is_empty() and self.consultas_specialist.is_empty()
+
+    def paso(self, cola_admision=None):
+        """
+        Ejecuta una unidad de tiempo: admite un paciente de la cola de admisión si corresponde según
+        el periodo de admisión (o, con un proceso de llegadas, todos los que han llegado), gestiona las
+        salas de ambos tipos de consulta y avanza el contador.
+
+        Parámetros:
+        -----------
+        cola_admision : ArrayQueue, ProcesoLlegadas or None
+            Cola de admisión de la que tomar el paciente, proceso de llegadas, o None si los
+            pacientes se admiten directamente con admitir().
+
+        Retorna:
+        --------
+        bool
+            True si, tras esta unidad de tiempo, no queda ningún paciente por admitir, en espera ni en consulta.
+        """
+        if isinstance(cola_admision, ProcesoLlegadas):
+            for paciente in cola_admision.llegadas(self.tiempo_actual):
+                self.admitir(paciente)
+        elif cola_admision is not None and self.tiempo_actual % self.periodo_admision == 0:
+            if not cola_admision.is_empty():
+                self.admitir(cola_admision.dequeue())
+        
+        self._gestion_consulta(self.consultas_general, 'general', self.general_priority, self.general_no_priority)
+        self._gestion_consulta(self.consultas_specialist, 'specialist', self.specialist_priority, self.specialist_no_priority)
+
+        terminado = (cola_admision is None or cola_admision.is_empty()) and self.esta_vacio()
+        if self.tiempo_actual >= self._proxima_muestra:
+            self.series.muestrear(self)
+            self._proxima_muestra = self.tiempo_actual + self.series.cada
+        self.tiempo_actual += 1
+        return terminado
+
+    def avanzar_hasta(self, tiempo):
+        """
+        Adelanta el contador de tiempo, sin ejecutar los pasos intermedios, hasta el primer instante
+        en el que puede ocurrir algo: el tiempo indicado (por ejemplo, la siguiente llegada), el fin de
+        la próxima consulta o la próxima muestra de las series temporales. Solo adelanta si ahora no
+        hay ninguna sala libre con pacientes esperando de su tipo, de modo que los pasos saltados no
+        habrían cambiado nada.
+
+        Parámetros:
+        -----------
+        tiempo : int or float
+            Instante hasta el que se puede adelantar como mucho.
+
+        Retorna:
+        --------
+        None
+        """
+        if tiempo <= self.tiempo_actual:
+            return
+        destino = min(tiempo, self.consultas_general.proxima_liberacion(),
+                      self.consultas_specialist.proxima_liberacion(), self._proxima_muestra)
+        if destino <= self.tiempo_actual or destino == float("inf"):
+            return
+        for salas, priority, no_priority in ((self.consultas_general, self.general_priority, self.general_no_priority),
+                                             (self.consultas_specialist, self.specialist_priority, self.specialist_no_priority)):
+            if salas.hay_sala_libre() and not (priority.is_empty() and no_priority.is_empty()):
+                return
+        self.tiempo_actual = int(destino)
+
+    def gestion_lista_espera(self, cola_admision):
+        """
+        Gestiona el proceso completo de un paciente en la cola de espera, incluyendo la asignación de consultas y
+        la priorización si es necesario.
+
+        Parámetros:
+        -----------
+        cola_admision : ArrayQueue, ProcesoLlegadas or iterable
+            Cola de pacientes en espera que aún no han sido procesados, un proceso de llegadas (ver
+            procesos_llegada.py), o bien un iterador/generador de pacientes, que se lee de forma
+            perezosa a través de una FuenteAdmision. Con un proceso de llegadas las ráfagas se admiten
+            en lote y se saltan las unidades de tiempo en las que no puede ocurrir nada.
+
+        Retorna:
+        --------
+        list
+            Una lista con los detalles de los pacientes procesados y sus tiempos de espera.
+        """
+        if not hasattr(cola_admision, "dequeue") and not isinstance(cola_admision, ProcesoLlegadas):
+            cola_admision = FuenteAdmision(cola_admision)
+        
+        self.iniciar()
+        if isinstance(cola_admision, ProcesoLlegadas):
+            while not self.paso(cola_admision):
+                self.avanzar_hasta(cola_admision.siguiente_llegada())
+        else:
+            while not self.paso(cola_admision):
+                pass
+        self.eventos.flush()
+        return self.lista_pandas
@@ -4,37 +4,23 @@
 from array_queue import ArrayQueue
 from paciente import Paciente
 from gestor_turnos import GestorColas
+from fuente_admision import FuenteAdmision, leer_pacientes
 import sys
 import pandas as pd
 
 if __name__ == "__main__":
     """
     Punto de entrada principal para la gestión de turnos de pacientes.
-    Lee los datos de los pacientes desde un archivo de texto, los agrega a la cola de admisión,
+    Lee los datos de los pacientes desde un archivo de texto a medida que se admiten
     y gestiona las colas de espera.
     """
 
-    cola_admision = ArrayQueue()  # Crear una cola de admisión para almacenar pacientes.
-    
-    with open("patients1.txt", "r", encoding="utf-8") as file:
-        """
-        Abre y lee el archivo de texto que contiene la información de los pacientes.
-        Procesa cada línea del archivo y extrae los datos necesarios para crear instancias de pacientes.
-        """
-        for line in file:
-            parts = line.strip().split()  # Dividir la línea en partes
-            IDPac = parts[0]
-            tipo_consulta = parts[1]
-            urgencia = parts[2]
-            tiempo_estimado = int(parts[3])
-
-            """
-            Crea una instancia de la clase Paciente con la información extraída de cada línea.
-            Luego, agrega al paciente a la cola de admisión.
-            """
-            cola_admision.enqueue(Paciente(IDPac=IDPac, tipo_consulta=tipo_consulta, urgencia=urgencia, 
-                                           tiempo_estimado=tiempo_estimado, tiempo_llegada=None, 
-                                           tiempo_entrada_consulta=None, priorizacion=False))
+    cola_admision = FuenteAdmision(leer_pacientes("patients1.txt"))
+    """
+    Crea la fuente de admisión a partir del archivo de texto con la información de los pacientes.
+    El archivo se lee de forma perezosa: cada línea se convierte en una instancia de Paciente
+    solo cuando el gestor de colas va a admitirla.
+    """
 
     listas_espera = GestorColas(
         general_priority=ArrayQueue(), general_no_priority=ArrayQueue(), 
@@ -82,3 +68,12 @@ if __name__ == "__main__":
     print(" Tiempo medio de espera agrupado por cola de espera      ")
     print("###############################################\n")
     print(data_pandas1)
+
+    print("##############################################")
+    print(" Percentiles de espera por cola y tipo de consulta      ")
+    print("###############################################\n")
+    print(pd.DataFrame(listas_espera.metricas.resumen(), columns=['grupo', 'n', 'media', 'p50', 'p95', 'p99']))
+    """
+    Muestra las métricas de espera calculadas en línea por el gestor de colas: número de pacientes,
+    media y percentiles 50, 95 y 99 por cola de espera y por tipo de consulta.
+    """
@@ -0,0 +1,210 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+import math
+
+class SketchCuantiles:
+    """
+    Clase SketchCuantiles que estima cuantiles de una serie de valores no negativos en memoria
+    constante. Los valores se agrupan en cubetas de crecimiento logarítmico (gamma = (1+alpha)/(1-alpha)),
+    de modo que cada cuantil estimado tiene un error relativo máximo de alpha. El número de cubetas
+    depende solo del rango de los valores, no de cuántos se añaden, y dos sketches con el mismo
+    alpha se combinan sumando sus cubetas.
+
+    Métodos
+    -------
+    añadir(valor):
+        Añade un valor al sketch.
+
+    cuantil(q):
+        Devuelve una estimación del cuantil q.
+
+    merge(otro):
+        Combina en este sketch las cuentas de otro.
+    """
+
+    def __init__(self, alpha=0.01):
+        """
+        Parámetros:
+        -----------
+        alpha : float
+            Error relativo máximo de los cuantiles estimados (0.01 por defecto).
+        """
+        if not 0 < alpha < 1:
+            raise ValueError("alpha must be between 0 and 1")
+        self.alpha = alpha
+        self._gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self._gamma)
+        self._cubetas = {}
+        self._ceros = 0
+        self.n = 0
+
+    def añadir(self, valor):
+        """
+        Añade un valor no negativo al sketch.
+        """
+        if valor <= 0:
+            self._ceros += 1
+        else:
+            indice = math.ceil(math.log(valor) / self._log_gamma)
+            self._cubetas[indice] = self._cubetas.get(indice, 0) + 1
+        self.n += 1
+
+    def cuantil(self, q):
+        """
+        Devuelve una estimación del cuantil q (entre 0 y 1), o None si el sketch está vacío.
+        """
+        if self.n == 0:
+            return None
+        rango = q * (self.n - 1)
+        acumulado = self._ceros
+        if rango < acumulado:
+            return 0
+        for indice in sorted(self._cubetas):
+            acumulado += self._cubetas[indice]
+            if rango < acumulado:
+                return 2 * self._gamma ** indice / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._cubetas) / (self._gamma + 1)
+
+    def merge(self, otro):
+        """
+        Combina en este sketch las cuentas de otro sketch con el mismo alpha.
+
+        Excepciones:
+        ------------
+        ValueError
+            Si los dos sketches no tienen el mismo alpha.
+        """
+        if otro.alpha != self.alpha:
+            raise ValueError("cannot merge sketches with different alpha")
+        for indice, cuenta in otro._cubetas.items():
+            self._cubetas[indice] = self._cubetas.get(indice, 0) + cuenta
+        self._ceros += otro._ceros
+        self.n += otro.n
+
+
+class MetricasEspera:
+    """
+    Clase MetricasEspera que acumula en línea los tiempos de espera de un grupo de pacientes:
+    número, media, mínimo, máximo y un SketchCuantiles para los percentiles.
+    """
+
+    def __init__(self, alpha=0.01):
+        self.n = 0
+        self.suma = 0
+        self.minimo = None
+        self.maximo = None
+        self.sketch = SketchCuantiles(alpha)
+
+    def añadir(self, espera):
+        """
+        Registra un tiempo de espera.
+        """
+        self.n += 1
+        self.suma += espera
+        if self.minimo is None or espera < self.minimo:
+            self.minimo = espera
+        if self.maximo is None or espera > self.maximo:
+            self.maximo = espera
+        self.sketch.añadir(espera)
+
+    @property
+    def media(self):
+        """
+        Tiempo medio de espera, o None si no hay datos.
+        """
+        return self.suma / self.n if self.n else None
+
+    def cuantil(self, q):
+        """
+        Estimación del cuantil q del tiempo de espera, acotada por el mínimo y el máximo exactos.
+        """
+        valor = self.sketch.cuantil(q)
+        if valor is None:
+            return None
+        return min(max(valor, self.minimo), self.maximo)
+
+    def merge(self, otra):
+        """
+        Combina en estas métricas las de otro grupo.
+        """
+        if otra.n == 0:
+            return
+        self.n += otra.n
+        self.suma += otra.suma
+        self.minimo = otra.minimo if self.minimo is None else min(self.minimo, otra.minimo)
+        self.maximo = otra.maximo if self.maximo is None else max(self.maximo, otra.maximo)
+        self.sketch.merge(otra.sketch)
+
+
+class MetricasColas:
+    """
+    Clase MetricasColas con las métricas de espera en línea de GestorColas, agrupadas por cola de
+    espera (general_priority, general_no_priority, ...) y por tipo de consulta (general, specialist).
+    Se puede consultar en cualquier momento de la ejecución y combinar con las de otras ejecuciones.
+
+    Métodos
+    -------
+    registrar(cola_espera, tipo_consulta, espera):
+        Registra el tiempo de espera de un paciente que entra en consulta.
+
+    cuantiles(clave, qs):
+        Devuelve los cuantiles indicados de una cola o tipo de consulta.
+
+    merge(otras):
+        Combina en estas métricas las de otra ejecución.
+    """
+
+    def __init__(self, alpha=0.01):
+        """
+        Parámetros:
+        -----------
+        alpha : float
+            Error relativo máximo de los percentiles estimados.
+        """
+        self.alpha = alpha
+        self.por_cola = {}
+        self.por_tipo = {}
+
+    def _grupo(self, grupos, clave):
+        metricas = grupos.get(clave)
+        if metricas is None:
+            metricas = grupos[clave] = MetricasEspera(self.alpha)
+        return metricas
+
+    def registrar(self, cola_espera, tipo_consulta, espera):
+        """
+        Registra el tiempo de espera de un paciente en su cola de espera y en su tipo de consulta.
+        """
+        self._grupo(self.por_cola, cola_espera).añadir(espera)
+        self._grupo(self.por_tipo, tipo_consulta).añadir(espera)
+
+    def __getitem__(self, clave):
+        """
+        Devuelve las MetricasEspera de una cola de espera o de un tipo de consulta.
+        """
+        if clave in self.por_cola:
+            return self.por_cola[clave]
+        return self.por_tipo[clave]
+
+    def cuantiles(self, clave, qs=(0.5, 0.95, 0.99)):
+        """
+        Devuelve los cuantiles qs del tiempo de espera de una cola o tipo de consulta.
+        """
+        metricas = self[clave]
+        return tuple(metricas.cuantil(q) for q in qs)
+
+    def merge(self, otras):
+        """
+        Combina en estas métricas las de otra ejecución.
+        """
+        for grupos, grupos_otras in ((self.por_cola, otras.por_cola), (self.por_tipo, otras.por_tipo)):
+            for clave, metricas in grupos_otras.items():
+                self._grupo(grupos, clave).merge(metricas)
+
+    def resumen(self, qs=(0.5, 0.95, 0.99)):
+        """
+        Devuelve una lista de filas (clave, n, media, cuantiles...) con todas las colas y tipos de consulta.
+        """
+        return [(clave, metricas.n, metricas.media) + tuple(metricas.cuantil(q) for q in qs)
+                for grupos in (self.por_cola, self.por_tipo) for clave, metricas in sorted(grupos.items())]
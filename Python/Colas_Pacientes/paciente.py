@@ -3,6 +3,7 @@
 
 
 from array_queue import ArrayQueue
+from enum import IntEnum
 
 class Paciente:
     """
@@ -45,6 +46,7 @@ class Paciente:
         self.tiempo_estimado = tiempo_estimado
         self.tiempo_entrada_consulta = None
         self.priorizacion = False
+        self.orden_cola = None
 
     @property 
     def IDPac (self):
@@ -102,4 +104,76 @@ class Paciente:
            
         """
         return f"{self.IDPac}, {self.tipo_consulta}, {self.urgencia}, {self.tiempo_estimado}, {self.tiempo_llegada}, {self.tiempo_entrada_consulta}, {self.priorizacion}"
-        
\ No newline at end of file
+
+
+class TipoConsulta(IntEnum):
+    """
+    Códigos compactos para el tipo de consulta de un paciente.
+    """
+    GENERAL = 0
+    SPECIALIST = 1
+
+    def __str__(self):
+        return self.name.lower()
+
+
+class Urgencia(IntEnum):
+    """
+    Códigos compactos para la urgencia de un paciente.
+    """
+    PRIORITY = 0
+    NO_PRIORITY = 1
+
+    def __str__(self):
+        return self.name.lower()
+
+
+TEXTOS_TIPO_CONSULTA = tuple(str(codigo) for codigo in TipoConsulta)
+TEXTOS_URGENCIA = tuple(str(codigo) for codigo in Urgencia)
+CODIGOS_TIPO_CONSULTA = {str(codigo): codigo for codigo in TipoConsulta}
+CODIGOS_URGENCIA = {str(codigo): codigo for codigo in Urgencia}
+
+
+class RegistroPaciente:
+    """
+    Registro compacto de un paciente, con __slots__ y sin validación en cada atributo, pensado para
+    la carga masiva (ver carga_pacientes). El tipo de consulta y la urgencia se guardan como códigos
+    TipoConsulta/Urgencia, pero se exponen como texto para que GestorColas pueda usar el registro
+    igual que un Paciente.
+    """
+
+    __slots__ = ("IDPac", "codigo_tipo", "codigo_urgencia", "tiempo_estimado",
+                 "tiempo_llegada", "tiempo_entrada_consulta", "priorizacion", "orden_cola")
+
+    def __init__(self, IDPac, codigo_tipo, codigo_urgencia, tiempo_estimado):
+        """
+        Parameters
+        ----------
+        IDPac : str
+            Identificador del paciente.
+        codigo_tipo : TipoConsulta
+            Código del tipo de consulta.
+        codigo_urgencia : Urgencia
+            Código de la urgencia.
+        tiempo_estimado : int
+            Tiempo estimado de consulta.
+        """
+        self.IDPac = IDPac
+        self.codigo_tipo = codigo_tipo
+        self.codigo_urgencia = codigo_urgencia
+        self.tiempo_estimado = tiempo_estimado
+        self.tiempo_llegada = None
+        self.tiempo_entrada_consulta = None
+        self.priorizacion = False
+        self.orden_cola = None
+
+    @property
+    def tipo_consulta(self):
+        return TEXTOS_TIPO_CONSULTA[self.codigo_tipo]
+
+    @property
+    def urgencia(self):
+        return TEXTOS_URGENCIA[self.codigo_urgencia]
+
+    def __str__(self):
+        return f"{self.IDPac}, {self.tipo_consulta}, {self.urgencia}, {self.tiempo_estimado}, {self.tiempo_llegada}, {self.tiempo_entrada_consulta}, {self.priorizacion}"
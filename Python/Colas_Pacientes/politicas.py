@@ -0,0 +1,192 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+import heapq
+
+from array_queue import Empty
+
+class ColaHeap:
+    """
+    Clase ColaHeap con la misma interfaz que ArrayQueue (enqueue, dequeue, first, is_empty, len),
+    pero que devuelve primero el paciente con menor clave. Está respaldada por un montículo binario,
+    por lo que encolar y desencolar cuestan O(log n); a igual clave se respeta el orden de llegada.
+    """
+
+    def __init__(self, clave):
+        """
+        Parámetros:
+        -----------
+        clave : callable
+            Función que devuelve la clave de ordenación de un paciente.
+        """
+        self._clave = clave
+        self._datos = []
+        self._contador = 0
+
+    def __len__(self):
+        return len(self._datos)
+
+    def __iter__(self):
+        """
+        Recorre los pacientes en el orden en que saldrían, sin quitarlos.
+        """
+        return (paciente for _, _, paciente in sorted(self._datos))
+
+    def is_empty(self):
+        return not self._datos
+
+    def enqueue(self, paciente):
+        heapq.heappush(self._datos, (self._clave(paciente), self._contador, paciente))
+        self._contador += 1
+
+    def first(self):
+        if not self._datos:
+            raise Empty("Queue is empty")
+        return self._datos[0][2]
+
+    def dequeue(self):
+        if not self._datos:
+            raise Empty("Queue is empty")
+        return heapq.heappop(self._datos)[2]
+
+
+class PoliticaFIFO:
+    """
+    Política de planificación por defecto: orden de llegada dentro de cada cola y la cola con
+    prioridad siempre antes que la cola sin prioridad.
+
+    Una política decide dos cosas: qué estructura usan las colas de espera (nueva_cola) y de cuál
+    de las dos colas de un tipo de consulta sale el siguiente paciente (elegir). GestorColas llama a
+    iniciar al preparar cada ejecución, para que las políticas con estado lo descarten, y las
+    instantáneas de registro_durable guardan y restauran ese estado con estado y restaurar.
+    """
+
+    def iniciar(self):
+        """
+        Descarta el estado de una ejecución anterior. PoliticaFIFO no tiene estado.
+        """
+
+    def estado(self):
+        """
+        Devuelve el estado de la política en una forma serializable en JSON, o None si no tiene.
+        """
+        return None
+
+    def restaurar(self, estado):
+        """
+        Restaura el estado devuelto por estado().
+        """
+
+    def atendida(self, tipo_consulta, nombre_cola):
+        """
+        Anota que un paciente de la cola indicada ha entrado en consulta sin pasar por elegir, al
+        reaplicar un registro durable.
+        """
+
+    def nueva_cola(self):
+        """
+        Devuelve una cola vacía para la política, o None si sirven las ArrayQueue recibidas por GestorColas.
+        """
+        return None
+
+    def elegir(self, priority, no_priority, tiempo_actual, tipo_consulta=None):
+        """
+        Devuelve la cola de la que debe salir el siguiente paciente, o None si ambas están vacías.
+
+        Parámetros:
+        -----------
+        priority : ArrayQueue
+            Cola con prioridad del tipo de consulta.
+        no_priority : ArrayQueue
+            Cola sin prioridad del tipo de consulta.
+        tiempo_actual : int
+            El contador del tiempo actual.
+        tipo_consulta : str or None
+            Tipo de consulta de las dos colas ('general' o 'specialist').
+        """
+        if not priority.is_empty():
+            return priority
+        if not no_priority.is_empty():
+            return no_priority
+        return None
+
+
+class PoliticaMasCortoPrimero(PoliticaFIFO):
+    """
+    Política del más corto primero: dentro de cada cola se atiende antes al paciente con menor
+    tiempo_estimado (colas ColaHeap), manteniendo la cola con prioridad antes que la cola sin prioridad.
+    """
+
+    def nueva_cola(self):
+        return ColaHeap(lambda paciente: paciente.tiempo_estimado)
+
+
+class PoliticaEnvejecimiento(PoliticaFIFO):
+    """
+    Política de envejecimiento ponderado: se atiende la cola cuyo primer paciente tiene mayor
+    peso * (espera + 1), de modo que un paciente sin prioridad que lleva mucho esperando acaba
+    pasando por delante de uno con prioridad recién llegado. A igual puntuación gana la cola con prioridad.
+    """
+
+    def __init__(self, peso_priority=3, peso_no_priority=1):
+        """
+        Parámetros:
+        -----------
+        peso_priority : float
+            Peso de la espera de los pacientes con prioridad.
+        peso_no_priority : float
+            Peso de la espera de los pacientes sin prioridad.
+        """
+        if peso_priority <= 0 or peso_no_priority <= 0:
+            raise ValueError("weights must be positive")
+        self.peso_priority = peso_priority
+        self.peso_no_priority = peso_no_priority
+
+    def elegir(self, priority, no_priority, tiempo_actual, tipo_consulta=None):
+        if priority.is_empty() or no_priority.is_empty():
+            return PoliticaFIFO.elegir(self, priority, no_priority, tiempo_actual)
+        puntuacion_priority = self.peso_priority * (tiempo_actual - priority.first().tiempo_llegada + 1)
+        puntuacion_no_priority = self.peso_no_priority * (tiempo_actual - no_priority.first().tiempo_llegada + 1)
+        return priority if puntuacion_priority >= puntuacion_no_priority else no_priority
+
+
+class PoliticaRoundRobin(PoliticaFIFO):
+    """
+    Política round-robin: cuando las dos colas de un tipo de consulta tienen pacientes, se alternan,
+    empezando por la cola con prioridad. Para cada tipo de consulta se guarda el nombre de la última
+    cola atendida ('priority' o 'no_priority').
+    """
+
+    def __init__(self):
+        self.iniciar()
+
+    def iniciar(self):
+        self._ultima = {}
+
+    def estado(self):
+        return dict(self._ultima)
+
+    def restaurar(self, estado):
+        self._ultima = dict(estado or {})
+
+    def atendida(self, tipo_consulta, nombre_cola):
+        self._ultima[tipo_consulta] = nombre_cola[len(tipo_consulta) + 1:]
+
+    def elegir(self, priority, no_priority, tiempo_actual, tipo_consulta=None):
+        if priority.is_empty() or no_priority.is_empty():
+            cola = PoliticaFIFO.elegir(self, priority, no_priority, tiempo_actual)
+        elif self._ultima.get(tipo_consulta) == "priority":
+            cola = no_priority
+        else:
+            cola = priority
+        if cola is not None:
+            self._ultima[tipo_consulta] = "priority" if cola is priority else "no_priority"
+        return cola
+
+
+POLITICAS = {
+    "fifo": PoliticaFIFO,
+    "mas_corto_primero": PoliticaMasCortoPrimero,
+    "envejecimiento": PoliticaEnvejecimiento,
+    "round_robin": PoliticaRoundRobin,
+}
@@ -0,0 +1,239 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+import random
+from abc import ABC, abstractmethod
+
+from paciente import Paciente
+
+def leer_traza(ruta):
+    """
+    Generador que lee un archivo de llegadas con marca de tiempo, línea a línea.
+
+    Parámetros:
+    -----------
+    ruta : str
+        Ruta del archivo (tiempo IDPac tipo_consulta urgencia tiempo_estimado), ordenado por tiempo.
+
+    Retorna:
+    --------
+    generator
+        Tuplas (tiempo, Paciente) en el orden del archivo.
+    """
+    with open(ruta, "r", encoding="utf-8") as file:
+        for line in file:
+            parts = line.split()
+            if not parts:
+                continue
+            yield int(parts[0]), Paciente(IDPac=parts[1], tipo_consulta=parts[2], urgencia=parts[3],
+                                          tiempo_estimado=int(parts[4]), tiempo_llegada=None,
+                                          tiempo_entrada_consulta=None, priorizacion=False)
+
+
+class ProcesoLlegadas(ABC):
+    """
+    Clase base de los procesos de llegada que usa GestorColas para la admisión. Un proceso reparte
+    los pacientes de una fuente en instantes de llegada (no decrecientes) y, en cada unidad de tiempo,
+    entrega de una vez todos los que han llegado, de modo que una ráfaga se admite en un solo lote.
+    Las subclases solo definen _generar, que produce las tuplas (tiempo, paciente).
+
+    Como el proceso conoce el instante de la siguiente llegada, GestorColas puede saltarse las
+    unidades de tiempo en las que no puede ocurrir nada.
+
+    Métodos
+    -------
+    is_empty():
+        Indica si no quedan llegadas.
+    siguiente_llegada():
+        Devuelve el instante de la siguiente llegada.
+    llegadas(tiempo_actual):
+        Devuelve la lista de pacientes que llegan hasta el tiempo actual.
+    """
+
+    def __init__(self):
+        self._llegadas = self._generar()
+        self._pendiente = None
+        self._agotado = False
+
+    @abstractmethod
+    def _generar(self):
+        """
+        Generador de tuplas (tiempo, paciente) ordenadas por tiempo.
+        """
+
+    def _leer(self):
+        """
+        Lee la siguiente llegada en _pendiente, si no está ya leída y quedan llegadas.
+        """
+        if self._pendiente is None and not self._agotado:
+            try:
+                self._pendiente = next(self._llegadas)
+            except StopIteration:
+                self._agotado = True
+
+    def is_empty(self):
+        self._leer()
+        return self._pendiente is None
+
+    def siguiente_llegada(self):
+        """
+        Devuelve el instante de la siguiente llegada, o infinito si no quedan.
+        """
+        self._leer()
+        return self._pendiente[0] if self._pendiente is not None else float("inf")
+
+    def llegadas(self, tiempo_actual):
+        """
+        Devuelve, en orden de llegada, los pacientes que llegan en un instante menor o igual que el actual.
+
+        Parámetros:
+        -----------
+        tiempo_actual : int
+            El contador del tiempo actual.
+
+        Retorna:
+        --------
+        list
+        """
+        lote = []
+        self._leer()
+        while self._pendiente is not None and self._pendiente[0] <= tiempo_actual:
+            lote.append(self._pendiente[1])
+            self._pendiente = None
+            self._leer()
+        return lote
+
+
+class LlegadasPeriodicas(ProcesoLlegadas):
+    """
+    Un paciente cada 'periodo' unidades de tiempo, empezando en 0: el comportamiento original de
+    gestion_lista_espera con periodo_admision.
+    """
+
+    def __init__(self, pacientes, periodo=3):
+        """
+        Parámetros:
+        -----------
+        pacientes : iterable
+            Pacientes en orden de admisión.
+        periodo : int
+            Unidades de tiempo entre dos llegadas.
+        """
+        if not isinstance(periodo, int) or periodo <= 0:
+            raise ValueError("periodo must be a positive integer")
+        self._pacientes = pacientes
+        self.periodo = periodo
+        super().__init__()
+
+    def _generar(self):
+        for i, paciente in enumerate(self._pacientes):
+            yield i * self.periodo, paciente
+
+
+class LlegadasTraza(ProcesoLlegadas):
+    """
+    Llegadas tomadas de una traza con marcas de tiempo (por ejemplo, de leer_traza), para reproducir
+    un día real. Los pacientes con la misma marca de tiempo llegan juntos.
+    """
+
+    def __init__(self, llegadas):
+        """
+        Parámetros:
+        -----------
+        llegadas : iterable
+            Tuplas (tiempo, paciente) ordenadas por tiempo.
+        """
+        self._traza = llegadas
+        super().__init__()
+
+    def _generar(self):
+        anterior = 0
+        for tiempo, paciente in self._traza:
+            if tiempo < anterior:
+                raise ValueError(f"arrival trace is not sorted: {tiempo} after {anterior}")
+            anterior = tiempo
+            yield tiempo, paciente
+
+
+class LlegadasPoisson(ProcesoLlegadas):
+    """
+    Llegadas en lotes según un proceso de Poisson: los lotes llegan con una tasa media de 'tasa'
+    lotes por unidad de tiempo y cada lote trae 'tam_lote' pacientes.
+    """
+
+    def __init__(self, pacientes, tasa, tam_lote=1, semilla=None):
+        """
+        Parámetros:
+        -----------
+        pacientes : iterable
+            Pacientes en orden de admisión.
+        tasa : float
+            Número medio de lotes por unidad de tiempo.
+        tam_lote : int or callable
+            Pacientes por lote, o función que recibe el generador aleatorio y devuelve el tamaño de cada lote.
+        semilla : int, str or None
+            Semilla del generador aleatorio.
+        """
+        if tasa <= 0:
+            raise ValueError("tasa must be positive")
+        self._pacientes = pacientes
+        self.tasa = tasa
+        self.tam_lote = tam_lote
+        self._rnd = random.Random(semilla)
+        super().__init__()
+
+    def _instantes(self):
+        """
+        Generador de los instantes (continuos) de llegada de los lotes.
+        """
+        t = 0.0
+        while True:
+            t += self._rnd.expovariate(self.tasa)
+            yield t
+
+    def _generar(self):
+        pacientes = iter(self._pacientes)
+        for t in self._instantes():
+            n = self.tam_lote(self._rnd) if callable(self.tam_lote) else self.tam_lote
+            for _ in range(n):
+                paciente = next(pacientes, None)
+                if paciente is None:
+                    return
+                yield int(t), paciente
+
+
+class LlegadasCurva(LlegadasPoisson):
+    """
+    Llegadas según un proceso de Poisson cuya tasa cambia a lo largo del día: 'tasas' da la tasa de
+    cada franja (por ejemplo, 24 franjas de una hora) y la curva se repite cada día. Los instantes se
+    generan por aceptación-rechazo (thinning) sobre la tasa máxima de la curva.
+    """
+
+    def __init__(self, pacientes, tasas, ticks_por_franja, tam_lote=1, semilla=None):
+        """
+        Parámetros:
+        -----------
+        pacientes : iterable
+            Pacientes en orden de admisión.
+        tasas : sequence
+            Número medio de lotes por unidad de tiempo en cada franja del día.
+        ticks_por_franja : int
+            Unidades de tiempo que dura cada franja.
+        tam_lote : int or callable
+            Como en LlegadasPoisson.
+        semilla : int, str or None
+            Semilla del generador aleatorio.
+        """
+        if not tasas or min(tasas) < 0 or max(tasas) <= 0:
+            raise ValueError("tasas must be non-negative with at least one positive rate")
+        if not isinstance(ticks_por_franja, int) or ticks_por_franja <= 0:
+            raise ValueError("ticks_por_franja must be a positive integer")
+        self.tasas = tuple(tasas)
+        self.ticks_por_franja = ticks_por_franja
+        super().__init__(pacientes, max(tasas), tam_lote, semilla)
+
+    def _instantes(self):
+        tasas, franja, rnd = self.tasas, self.ticks_por_franja, self._rnd
+        for t in super()._instantes():
+            if rnd.random() * self.tasa < tasas[int(t // franja) % len(tasas)]:
+                yield t
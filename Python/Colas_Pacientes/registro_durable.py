@@ -0,0 +1,364 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+import glob
+import itertools
+import json
+import os
+import time
+
+from fuente_admision import FuenteAdmision
+from paciente import RegistroPaciente, CODIGOS_TIPO_CONSULTA, CODIGOS_URGENCIA
+from eventos import EN_COLA, PRIORIZACION_APLICADA, PRIORIZACION_ACTIVA, ENTRA, SALE, CANCELA
+
+FIN_PASO = "T"
+NOMBRE_SNAPSHOT = "snapshot.json"
+NOMBRES_COLAS = ("general_priority", "general_no_priority", "specialist_priority", "specialist_no_priority")
+
+def _ruta_wal(directorio, generacion):
+    return os.path.join(directorio, f"wal.{generacion:08d}.log")
+
+
+def _contenido_cola(cola):
+    """
+    Devuelve los pacientes de una cola (ArrayQueue o ColaHeap) en el orden en que saldrían, sin
+    sacarlos.
+    """
+    return list(cola)
+
+
+def _a_lista(paciente):
+    return [paciente.IDPac, paciente.tipo_consulta, paciente.urgencia, paciente.tiempo_estimado,
+            paciente.tiempo_llegada, paciente.tiempo_entrada_consulta, paciente.priorizacion]
+
+
+def _de_lista(datos):
+    IDPac, tipo_consulta, urgencia, tiempo_estimado, tiempo_llegada, tiempo_entrada_consulta, priorizacion = datos
+    paciente = RegistroPaciente(IDPac, CODIGOS_TIPO_CONSULTA[tipo_consulta], CODIGOS_URGENCIA[urgencia], tiempo_estimado)
+    paciente.tiempo_llegada = tiempo_llegada
+    paciente.tiempo_entrada_consulta = tiempo_entrada_consulta
+    paciente.priorizacion = priorizacion
+    return paciente
+
+
+class RegistroDurable:
+    """
+    Destino de eventos que hace durable el estado de GestorColas. Cada admisión (en cola), entrada
+    en consulta, escalado de prioridad, cancelación y salida de consulta se añade a un registro de
+    escritura anticipada (write-ahead log) de solo añadido. Las líneas se acumulan y se escriben con un único
+    fsync por lote (group commit), cuando el lote se llena o ha pasado 'intervalo_fsync' segundos.
+
+    Al final de cada unidad de tiempo con eventos se escribe una marca de fin de paso; en la
+    recuperación solo se aplican los pasos completos. Cada 'snapshot_cada' eventos se guarda una
+    instantánea compacta del estado y se empieza un registro nuevo, lo que acota el tiempo de
+    recuperación.
+
+    Métodos
+    -------
+    emitir(evento):
+        Añade el evento al registro.
+
+    fin_paso(gestor):
+        Cierra la unidad de tiempo actual y guarda una instantánea si corresponde.
+
+    snapshot(gestor):
+        Guarda una instantánea del estado del gestor y rota el registro.
+    """
+    activo = True
+
+    def __init__(self, directorio, tam_lote=4096, intervalo_fsync=0.05, snapshot_cada=1_000_000, siguiente=None):
+        """
+        Parámetros:
+        -----------
+        directorio : str
+            Directorio del registro y de las instantáneas (se crea si no existe).
+        tam_lote : int
+            Número máximo de eventos por escritura con fsync.
+        intervalo_fsync : float
+            Tiempo máximo en segundos que un evento puede esperar a ser escrito.
+        snapshot_cada : int
+            Número de eventos entre instantáneas.
+        siguiente : sink or None
+            Otro destino de eventos al que reenviar cada evento (por ejemplo, un SinkTexto).
+        """
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.tam_lote = tam_lote
+        self.intervalo_fsync = intervalo_fsync
+        self.snapshot_cada = snapshot_cada
+        self.siguiente = siguiente
+        self.admitidos = 0
+        self._lineas = []
+        self._ultimo_fsync = time.monotonic()
+        self._eventos_desde_snapshot = 0
+        self._paso_con_eventos = False
+        generaciones = _generaciones(directorio)
+        self._generacion = generaciones[-1] if generaciones else 0
+        self._wal = open(_ruta_wal(directorio, self._generacion), "a", encoding="utf-8")
+
+    def emitir(self, evento):
+        t = evento.tiempo
+        if evento.tipo == EN_COLA:
+            self.admitidos += 1
+            linea = (f"{EN_COLA}\t{t}\t{evento.IDPac}\t{evento.tipo_consulta}\t{evento.urgencia}\t"
+                     f"{evento.tiempo_estimado}\t{evento.cola}")
+        elif evento.tipo == ENTRA:
+            linea = f"{ENTRA}\t{t}\t{evento.IDPac}\t{evento.cola}\t{evento.sala}"
+        elif evento.tipo == SALE:
+            linea = f"{SALE}\t{t}\t{evento.IDPac}\t{evento.tipo_consulta}\t{evento.sala}"
+        elif evento.tipo == CANCELA:
+            linea = f"{CANCELA}\t{t}\t{evento.IDPac}\t{evento.cola}"
+        else:
+            linea = f"{evento.tipo}\t{t}\t{evento.IDPac}"
+        self._lineas.append(linea)
+        self._paso_con_eventos = True
+        self._eventos_desde_snapshot += 1
+        if self.siguiente is not None and self.siguiente.activo:
+            self.siguiente.emitir(evento)
+
+    def fin_paso(self, gestor):
+        """
+        Marca el final de la unidad de tiempo que acaba de ejecutar el gestor, hace group commit
+        si el lote está lleno o ha pasado el intervalo, y guarda una instantánea si toca.
+
+        Parámetros:
+        -----------
+        gestor : GestorColas
+            El gestor cuyo paso acaba de terminar.
+        """
+        if not self._paso_con_eventos:
+            return
+        self._lineas.append(f"{FIN_PASO}\t{gestor.tiempo_actual - 1}")
+        self._paso_con_eventos = False
+        if len(self._lineas) >= self.tam_lote or time.monotonic() - self._ultimo_fsync >= self.intervalo_fsync:
+            self._commit()
+        if self._eventos_desde_snapshot >= self.snapshot_cada:
+            self.snapshot(gestor)
+
+    def _commit(self):
+        """
+        Escribe las líneas pendientes y las hace durables con un único fsync.
+        """
+        if self._lineas:
+            self._wal.write("\n".join(self._lineas) + "\n")
+            self._lineas = []
+        self._wal.flush()
+        os.fsync(self._wal.fileno())
+        self._ultimo_fsync = time.monotonic()
+
+    def snapshot(self, gestor):
+        """
+        Guarda una instantánea del estado del gestor al final de su último paso y empieza un
+        registro nuevo. La instantánea se escribe en un archivo temporal y se renombra, de modo que
+        una caída a mitad deja intacta la anterior; los registros antiguos se borran después.
+
+        Parámetros:
+        -----------
+        gestor : GestorColas
+            El gestor, entre dos pasos.
+        """
+        self._commit()
+        self._wal.close()
+        for nombre in NOMBRES_COLAS:
+            gestor.compactar(nombre)
+        self._generacion += 1
+        self._wal = open(_ruta_wal(self.directorio, self._generacion), "a", encoding="utf-8")
+        estado = {
+            "generacion": self._generacion,
+            "tiempo_actual": gestor.tiempo_actual,
+            "admitidos": self.admitidos,
+            "priorizacion": list(gestor.priorizacion),
+            "politica": gestor.politica.estado(),
+            "priorizados": [IDPac for IDPac, veces in gestor._lista_pacientes_priorizados.items() for _ in range(veces)],
+            "colas": {nombre: [_a_lista(p) for p in _contenido_cola(getattr(gestor, nombre))]
+                      for nombre in NOMBRES_COLAS},
+            "salas": {tipo: [[sala] + _a_lista(p) for sala, p in salas.ocupadas()]
+                      for tipo, salas in (("general", gestor.consultas_general),
+                                          ("specialist", gestor.consultas_specialist))},
+        }
+        ruta = os.path.join(self.directorio, NOMBRE_SNAPSHOT)
+        with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(estado, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(ruta + ".tmp", ruta)
+        for generacion in _generaciones(self.directorio):
+            if generacion < self._generacion:
+                os.remove(_ruta_wal(self.directorio, generacion))
+        self._eventos_desde_snapshot = 0
+
+    def flush(self):
+        self._commit()
+        if self.siguiente is not None:
+            self.siguiente.flush()
+
+    def close(self):
+        self.flush()
+        self._wal.close()
+
+
+def _generaciones(directorio):
+    return sorted(int(os.path.basename(ruta)[4:-4]) for ruta in glob.glob(os.path.join(directorio, "wal.*.log")))
+
+
+def recuperar(directorio, gestor):
+    """
+    Reconstruye el estado de un gestor a partir de la última instantánea y del registro posterior:
+    las cuatro colas, las salas ocupadas, la lista de priorización, el estado de la política de
+    planificación y el contador de tiempo. Solo se
+    aplican los pasos completos del registro; el resto, que pudo quedar a medias en la caída, se
+    trunca. Las métricas y la lista de resultados no se recuperan: reflejan solo lo ejecutado tras
+    la recuperación.
+
+    Parámetros:
+    -----------
+    directorio : str
+        Directorio del registro durable.
+    gestor : GestorColas
+        Gestor recién creado, con la misma configuración (colas vacías y número de salas) que el original.
+
+    Retorna:
+    --------
+    int
+        Número de pacientes ya admitidos, que hay que saltar en la fuente de admisión al continuar.
+    """
+    gestor.iniciar()
+    salas = {"general": gestor.consultas_general, "specialist": gestor.consultas_specialist}
+    admitidos = 0
+    generacion = 0
+    ruta = os.path.join(directorio, NOMBRE_SNAPSHOT)
+    if os.path.exists(ruta):
+        with open(ruta, encoding="utf-8") as f:
+            estado = json.load(f)
+        generacion = estado["generacion"]
+        gestor.tiempo_actual = estado["tiempo_actual"]
+        admitidos = estado["admitidos"]
+        gestor.priorizacion.update(dict.fromkeys(estado["priorizacion"]))
+        gestor.politica.restaurar(estado.get("politica"))
+        for IDPac in estado["priorizados"]:
+            gestor._añadir_priorizado(IDPac)
+        for nombre in NOMBRES_COLAS:
+            for datos in estado["colas"][nombre]:
+                paciente = _de_lista(datos)
+                gestor.almacenar_paciente(paciente, paciente.tiempo_llegada)
+        for esperando in gestor._en_espera.values():
+            # Las colas se restauran una tras otra; cancelar() necesita los repetidos en orden de admisión.
+            esperando.sort(key=lambda paciente: paciente.tiempo_llegada)
+        for tipo, ocupadas in estado["salas"].items():
+            for sala, *datos in ocupadas:
+                salas[tipo].asignar(_de_lista(datos), sala)
+
+    priorizado = set()
+    liberadas = set()
+    for gen in _generaciones(directorio):
+        if gen < generacion:
+            continue
+        ruta_wal = _ruta_wal(directorio, gen)
+        with open(ruta_wal, "r+", encoding="utf-8") as f:
+            valido = 0
+            pendientes = []
+            while True:
+                linea = f.readline()
+                if not linea.endswith("\n"):
+                    break
+                campos = linea.rstrip("\n").split("\t")
+                if campos[0] != FIN_PASO:
+                    pendientes.append(campos)
+                    continue
+                for campos_evento in pendientes:
+                    admitidos += _aplicar(gestor, salas, campos_evento, priorizado, liberadas)
+                pendientes = []
+                gestor.tiempo_actual = int(campos[1]) + 1
+                valido = f.tell()
+            f.truncate(valido)
+    return admitidos
+
+
+def _aplicar(gestor, salas, campos, priorizado, liberadas):
+    """
+    Aplica al gestor un evento del registro. Devuelve 1 si el evento es una admisión y 0 si no.
+    """
+    tipo, t = campos[0], int(campos[1])
+    IDPac = campos[2]
+    if tipo == EN_COLA:
+        _, _, _, tipo_consulta, urgencia, tiempo_estimado, cola = campos
+        paciente = RegistroPaciente(IDPac, CODIGOS_TIPO_CONSULTA[tipo_consulta], CODIGOS_URGENCIA[urgencia],
+                                    int(tiempo_estimado))
+        paciente.priorizacion = IDPac in priorizado
+        priorizado.discard(IDPac)
+        if gestor.almacenar_paciente(paciente, t) != cola:
+            raise ValueError(f"write-ahead log out of sync: {IDPac} should be in {cola}")
+        return 1
+    if tipo == PRIORIZACION_APLICADA:
+        del gestor.priorizacion[IDPac]
+        gestor._añadir_priorizado(IDPac)
+        priorizado.add(IDPac)
+    elif tipo == PRIORIZACION_ACTIVA:
+        gestor.priorizacion[IDPac] = None
+    elif tipo == ENTRA:
+        _, _, _, cola, sala = campos
+        paciente = gestor._sacar_de_cola(getattr(gestor, cola), cola)
+        if paciente.IDPac != IDPac:
+            raise ValueError(f"write-ahead log out of sync: expected {IDPac} at the head of {cola}")
+        paciente.tiempo_entrada_consulta = t
+        tipo_consulta = "general" if cola.startswith("general") else "specialist"
+        salas[tipo_consulta].asignar(paciente, int(sala))
+        gestor.politica.atendida(tipo_consulta, cola)
+        if IDPac in gestor._lista_pacientes_priorizados:
+            gestor._quitar_priorizado(IDPac)
+    elif tipo == CANCELA:
+        cola = campos[3]
+        paciente = gestor._en_espera[IDPac][0]
+        if gestor._nombre_cola(paciente) != cola:
+            raise ValueError(f"write-ahead log out of sync: {IDPac} should be waiting in {cola}")
+        gestor._retirar(paciente, cola)
+    elif tipo == SALE:
+        tipo_consulta = campos[3]
+        if (tipo_consulta, t) not in liberadas:
+            liberadas.add((tipo_consulta, t))
+            salas[tipo_consulta].liberar(t)
+    return 0
+
+
+def ejecutar_durable(gestor, pacientes, directorio, **opciones):
+    """
+    Ejecuta gestion_lista_espera en modo durable. Si el directorio contiene el estado de una
+    ejecución anterior interrumpida, la recupera y continúa desde el último paso completo,
+    saltando en la fuente los pacientes que ya se habían admitido.
+
+    Parámetros:
+    -----------
+    gestor : GestorColas
+        Gestor recién creado. Su destino de eventos se sustituye por un RegistroDurable que
+        reenvía los eventos al destino que tuviera.
+    pacientes : iterable
+        Fuente de admisión reiniciable (por ejemplo, leer_pacientes(ruta)), en el mismo orden que
+        en la ejecución original.
+    directorio : str
+        Directorio del registro durable.
+    **opciones :
+        Parámetros adicionales de RegistroDurable (tam_lote, intervalo_fsync, snapshot_cada).
+
+    Retorna:
+    --------
+    list
+        La lista de resultados de los pacientes que han entrado en consulta en esta ejecución.
+    """
+    if _generaciones(directorio):
+        admitidos = recuperar(directorio, gestor)
+    else:
+        gestor.iniciar()
+        admitidos = 0
+    registro = RegistroDurable(directorio, siguiente=gestor.eventos, **opciones)
+    registro.admitidos = admitidos
+    gestor.eventos = registro
+    cola_admision = FuenteAdmision(itertools.islice(pacientes, admitidos, None))
+    try:
+        while True:
+            terminado = gestor.paso(cola_admision)
+            registro.fin_paso(gestor)
+            if terminado:
+                break
+    finally:
+        registro.close()
+    return gestor.lista_pandas
@@ -0,0 +1,221 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+import math
+import os
+import random
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from array_queue import ArrayQueue
+from gestor_turnos import GestorColas
+from metricas import MetricasColas
+from eventos import SinkNulo
+from paciente import RegistroPaciente, TipoConsulta, Urgencia
+
+DISTRIBUCIONES = ("uniforme", "exponencial", "constante")
+
+class Escenario:
+    """
+    Clase Escenario que describe un escenario sintético de llegadas de pacientes para el
+    dimensionamiento de salas: ritmo de admisión, mezcla general/especialista, proporción de
+    pacientes con prioridad y distribución de los tiempos de consulta.
+    """
+
+    def __init__(self, nombre, num_pacientes, periodo_admision=3, prop_general=0.5, prop_priority=0.3,
+                 distribucion="uniforme", tiempo_medio=6, salas_general=1, salas_specialist=1):
+        """
+        Parámetros:
+        -----------
+        nombre : str
+            Nombre del escenario, usado en el informe y para derivar las semillas.
+        num_pacientes : int
+            Número de pacientes de cada réplica.
+        periodo_admision : int
+            Cada cuántas unidades de tiempo se admite un paciente.
+        prop_general : float
+            Proporción de pacientes de consulta general.
+        prop_priority : float
+            Proporción de pacientes con prioridad.
+        distribucion : str
+            Distribución de los tiempos de consulta: "uniforme" (entre 1 y 2*tiempo_medio-1),
+            "exponencial" (redondeada, mínimo 1) o "constante".
+        tiempo_medio : int
+            Tiempo medio de consulta.
+        salas_general : int
+            Número de salas de consulta general.
+        salas_specialist : int
+            Número de salas de consulta de especialista.
+        """
+        if distribucion not in DISTRIBUCIONES:
+            raise ValueError(f"distribucion must be one of {DISTRIBUCIONES}")
+        if not 0 <= prop_general <= 1 or not 0 <= prop_priority <= 1:
+            raise ValueError("prop_general and prop_priority must be between 0 and 1")
+        if not isinstance(tiempo_medio, int) or tiempo_medio < 1:
+            raise ValueError("tiempo_medio must be a positive integer")
+        self.nombre = nombre
+        self.num_pacientes = num_pacientes
+        self.periodo_admision = periodo_admision
+        self.prop_general = prop_general
+        self.prop_priority = prop_priority
+        self.distribucion = distribucion
+        self.tiempo_medio = tiempo_medio
+        self.salas_general = salas_general
+        self.salas_specialist = salas_specialist
+
+    def __str__(self):
+        return (f"{self.nombre}: {self.num_pacientes} pacientes, 1 cada {self.periodo_admision}, "
+                f"general {self.prop_general:.0%}, prioridad {self.prop_priority:.0%}, "
+                f"{self.distribucion}({self.tiempo_medio}), salas {self.salas_general}/{self.salas_specialist}")
+
+
+def generar_traza(escenario, semilla):
+    """
+    Generador de la traza sintética de pacientes de una réplica del escenario.
+
+    Parámetros:
+    -----------
+    escenario : Escenario
+        Escenario a simular.
+    semilla : int or str
+        Semilla de la réplica; la misma semilla produce siempre la misma traza.
+
+    Retorna:
+    --------
+    generator
+        Los RegistroPaciente de la réplica en orden de admisión.
+    """
+    rnd = random.Random(semilla)
+    for i in range(escenario.num_pacientes):
+        tipo = TipoConsulta.GENERAL if rnd.random() < escenario.prop_general else TipoConsulta.SPECIALIST
+        urgencia = Urgencia.PRIORITY if rnd.random() < escenario.prop_priority else Urgencia.NO_PRIORITY
+        if escenario.distribucion == "uniforme":
+            tiempo = rnd.randint(1, 2 * escenario.tiempo_medio - 1)
+        elif escenario.distribucion == "exponencial":
+            tiempo = max(1, round(rnd.expovariate(1 / escenario.tiempo_medio)))
+        else:
+            tiempo = escenario.tiempo_medio
+        yield RegistroPaciente(f"user{i}", tipo, urgencia, tiempo)
+
+
+def ejecutar_replicacion(escenario, semilla):
+    """
+    Ejecuta una réplica del escenario sin registro de eventos.
+
+    Parámetros:
+    -----------
+    escenario : Escenario
+        Escenario a simular.
+    semilla : int or str
+        Semilla de la réplica.
+
+    Retorna:
+    --------
+    MetricasColas
+        Métricas de espera de la réplica por cola de espera y tipo de consulta.
+    """
+    gestor = GestorColas(ArrayQueue(), ArrayQueue(), ArrayQueue(), ArrayQueue(), [],
+                         salas_general=escenario.salas_general, salas_specialist=escenario.salas_specialist,
+                         periodo_admision=escenario.periodo_admision, eventos=SinkNulo())
+    gestor.gestion_lista_espera(generar_traza(escenario, semilla))
+    return gestor.metricas
+
+
+def _ejecutar(tarea):
+    """
+    Adaptador de ejecutar_replicacion para ProcessPoolExecutor.map.
+    """
+    indice, escenario, semilla = tarea
+    return indice, ejecutar_replicacion(escenario, semilla)
+
+
+def resumir(replicas, nivel=0.95):
+    """
+    Agrega las réplicas de un escenario por cola de espera: distribución conjunta de los tiempos de
+    espera (media y percentiles, combinando los sketches de todas las réplicas) e intervalo de
+    confianza de la espera media entre réplicas. El intervalo usa la aproximación normal, por lo que
+    conviene lanzar al menos unas 30 réplicas.
+
+    Parámetros:
+    -----------
+    replicas : list
+        Lista de MetricasColas devueltas por ejecutar_replicacion.
+    nivel : float
+        Nivel de confianza del intervalo.
+
+    Retorna:
+    --------
+    dict
+        Para cada cola de espera, un diccionario con n, media, p50, p90, p95, p99 e ic (inferior, superior).
+    """
+    z = statistics.NormalDist().inv_cdf(0.5 + nivel / 2)
+    total = MetricasColas()
+    for metricas in replicas:
+        total.merge(metricas)
+    resumen = {}
+    for cola, conjunta in sorted(total.por_cola.items()):
+        medias = [metricas.por_cola[cola].media for metricas in replicas if cola in metricas.por_cola]
+        margen = z * statistics.stdev(medias) / math.sqrt(len(medias)) if len(medias) > 1 else math.inf
+        media = statistics.fmean(medias)
+        resumen[cola] = {"n": conjunta.n, "media": media, "p50": conjunta.cuantil(0.5), "p90": conjunta.cuantil(0.9),
+                         "p95": conjunta.cuantil(0.95), "p99": conjunta.cuantil(0.99),
+                         "ic": (media - margen, media + margen)}
+    return resumen
+
+
+def ejecutar_replicaciones(escenarios, num_replicaciones, semilla_base=0, max_workers=None):
+    """
+    Ejecuta num_replicaciones réplicas de cada escenario repartidas en un conjunto de procesos y
+    agrega los resultados por escenario y cola de espera. La semilla de cada réplica se deriva del
+    nombre del escenario, de la semilla base y del número de réplica, por lo que los resultados son
+    reproducibles con independencia del número de procesos.
+
+    Parámetros:
+    -----------
+    escenarios : list
+        Lista de Escenario.
+    num_replicaciones : int
+        Número de réplicas por escenario.
+    semilla_base : int
+        Semilla base de todas las réplicas.
+    max_workers : int or None
+        Número de procesos (por defecto, el número de CPUs).
+
+    Retorna:
+    --------
+    dict
+        Para cada nombre de escenario, el resumen devuelto por resumir.
+    """
+    tareas = [(i, escenario, f"{semilla_base}-{escenario.nombre}-{r}")
+              for i, escenario in enumerate(escenarios) for r in range(num_replicaciones)]
+    replicas = [[] for _ in escenarios]
+    chunksize = max(1, len(tareas) // (4 * (max_workers or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for indice, metricas in pool.map(_ejecutar, tareas, chunksize=chunksize):
+            replicas[indice].append(metricas)
+    return {escenario.nombre: resumir(replicas[i]) for i, escenario in enumerate(escenarios)}
+
+
+if __name__ == "__main__":
+    """
+    Ejemplo de dimensionamiento: compara una y dos salas por tipo de consulta con el mismo ritmo
+    de llegadas. Uso: python replicaciones.py [num_replicaciones] [num_pacientes]
+    """
+    num_replicaciones = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    num_pacientes = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    escenarios = [
+        Escenario("una_sala", num_pacientes, periodo_admision=3, distribucion="exponencial", tiempo_medio=5),
+        Escenario("dos_salas", num_pacientes, periodo_admision=3, distribucion="exponencial", tiempo_medio=5,
+                  salas_general=2, salas_specialist=2),
+    ]
+    resultados = ejecutar_replicaciones(escenarios, num_replicaciones)
+    for escenario in escenarios:
+        print("###############################################")
+        print(f" {escenario}")
+        print("###############################################")
+        for cola, datos in resultados[escenario.nombre].items():
+            inferior, superior = datos["ic"]
+            print(f"{cola:<24} n={datos['n']:<8} media={datos['media']:.2f} IC95=[{inferior:.2f}, {superior:.2f}] "
+                  f"p50={datos['p50']:.1f} p90={datos['p90']:.1f} p95={datos['p95']:.1f} p99={datos['p99']:.1f}")
+        print()
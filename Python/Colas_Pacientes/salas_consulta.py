@@ -0,0 +1,156 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+import heapq
+
+class SalasConsulta:
+    """
+    Clase SalasConsulta que representa un conjunto de N salas de un mismo tipo de consulta.
+    Las salas libres se guardan en un montículo de identificadores (se reutiliza siempre la de
+    menor número) y las ocupadas en un montículo ordenado por el instante de fin de consulta,
+    de forma que asignar y liberar una sala cuesta O(log salas).
+
+    Métodos
+    -------
+    hay_sala_libre():
+        Indica si queda alguna sala libre.
+
+    asignar(paciente):
+        Ocupa una sala libre con el paciente indicado.
+
+    liberar(tiempo_actual):
+        Libera las salas cuya consulta ha terminado en el tiempo actual.
+    """
+
+    def __init__(self, num_salas=1):
+        """
+        Inicializa el conjunto de salas, todas libres.
+
+        Parámetros:
+        -----------
+        num_salas : int
+            Número de salas de este tipo de consulta.
+        """
+        self.num_salas = num_salas
+        self._libres = list(range(num_salas))
+        self._ocupadas = []
+        self._pacientes = [None] * num_salas
+        self._suma_fines = 0
+
+    @property
+    def num_salas(self):
+        """
+        Getter para el número de salas.
+        """
+        return self._num_salas
+
+    @num_salas.setter
+    def num_salas(self, value:int):
+        """
+        Setter para el número de salas. Se asegura de que sea un entero positivo.
+
+        Excepciones:
+        ------------
+        ValueError
+            Si el valor no es un entero mayor que cero.
+        """
+        if isinstance(value, int) and value > 0:
+            self._num_salas = value
+        else:
+            raise ValueError("num_salas must be a positive integer")
+
+    def __len__(self):
+        """
+        Devuelve el número de salas ocupadas.
+        """
+        return len(self._ocupadas)
+
+    def is_empty(self):
+        """
+        Indica si todas las salas están libres.
+        """
+        return not self._ocupadas
+
+    def hay_sala_libre(self):
+        """
+        Indica si queda alguna sala libre.
+        """
+        return len(self._libres) > 0
+
+    def paciente_en_sala(self, sala):
+        """
+        Devuelve el paciente que ocupa la sala indicada, o None si está libre.
+        """
+        return self._pacientes[sala]
+
+    def asignar(self, paciente, sala=None):
+        """
+        Ocupa la sala libre de menor número con el paciente. El paciente debe tener ya
+        asignado su tiempo de entrada en consulta.
+
+        Parámetros:
+        -----------
+        paciente : class
+            Paciente que entra en consulta.
+        sala : int or None
+            Sala libre concreta que se quiere ocupar, al restaurar un estado guardado. Elegirla
+            cuesta O(salas); en el funcionamiento normal se deja en None.
+
+        Retorna:
+        --------
+        int
+            El número de la sala asignada.
+        """
+        if sala is None:
+            sala = heapq.heappop(self._libres)
+        else:
+            self._libres.remove(sala)
+            heapq.heapify(self._libres)
+        self._pacientes[sala] = paciente
+        fin = paciente.tiempo_entrada_consulta + paciente.tiempo_estimado
+        heapq.heappush(self._ocupadas, (fin, sala))
+        self._suma_fines += fin
+        return sala
+
+    def ocupadas(self):
+        """
+        Devuelve una lista de tuplas (sala, paciente) con las salas ocupadas, ordenada por sala.
+        """
+        return [(sala, self._pacientes[sala]) for _, sala in sorted(self._ocupadas, key=lambda par: par[1])]
+
+    def trabajo_restante(self, tiempo_actual):
+        """
+        Devuelve, en O(1), la suma del tiempo que les queda a las consultas en curso, a partir de la
+        suma de los instantes de fin de las salas ocupadas.
+        """
+        return self._suma_fines - tiempo_actual * len(self._ocupadas)
+
+    def proxima_liberacion(self):
+        """
+        Devuelve el instante en que termina la próxima consulta en curso, o infinito si todas las salas están libres.
+        """
+        return self._ocupadas[0][0] if self._ocupadas else float("inf")
+
+    def liberar(self, tiempo_actual):
+        """
+        Libera, en orden de fin de consulta, todas las salas cuya consulta termina en un instante
+        menor o igual que el tiempo actual.
+
+        Parámetros:
+        -----------
+        tiempo_actual : int
+            El contador del tiempo actual.
+
+        Retorna:
+        --------
+        list
+            Lista de tuplas (sala, paciente) con las consultas finalizadas.
+        """
+        finalizados = []
+        while self._ocupadas and self._ocupadas[0][0] <= tiempo_actual:
+            fin, sala = heapq.heappop(self._ocupadas)
+            self._suma_fines -= fin
+            finalizados.append((sala, self._pacientes[sala]))
+            self._pacientes[sala] = None
+            heapq.heappush(self._libres, sala)
+        return finalizados
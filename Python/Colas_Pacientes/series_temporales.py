@@ -0,0 +1,117 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+import csv
+from array import array
+
+COLUMNAS = ("tiempo", "general_priority", "general_no_priority", "specialist_priority", "specialist_no_priority",
+            "salas_general_ocupadas", "salas_specialist_ocupadas", "escalados", "cancelados")
+
+class SeriesTemporales:
+    """
+    Clase SeriesTemporales que registra la evolución de GestorColas durante una ejecución: cada
+    'cada' unidades de tiempo guarda, al final del paso, la profundidad de las cuatro colas de espera,
+    el número de salas ocupadas de cada tipo (las demás están libres) y los totales acumulados de
+    pacientes escalados a prioridad y de cancelaciones.
+
+    Cada columna es un array tipado de tamaño fijo usado como buffer circular: cuando se llena, las
+    muestras nuevas sobrescriben las más antiguas, por lo que la memoria no crece con la ejecución y
+    muestrear no reserva memoria.
+
+    Métodos
+    -------
+    muestrear(gestor):
+        Guarda una muestra del estado del gestor.
+    arrays():
+        Devuelve las columnas en orden cronológico.
+    a_csv(destino):
+        Escribe las muestras en formato CSV.
+    """
+
+    def __init__(self, cada=10, capacidad=100_000):
+        """
+        Parámetros:
+        -----------
+        cada : int
+            Cada cuántas unidades de tiempo se toma una muestra.
+        capacidad : int
+            Número máximo de muestras que se conservan.
+        """
+        if not isinstance(cada, int) or cada <= 0:
+            raise ValueError("cada must be a positive integer")
+        if not isinstance(capacidad, int) or capacidad <= 0:
+            raise ValueError("capacidad must be a positive integer")
+        self.cada = cada
+        self.capacidad = capacidad
+        self._columnas = {nombre: array("q", bytes(8 * capacidad)) for nombre in COLUMNAS}
+        self._orden = tuple(self._columnas[nombre] for nombre in COLUMNAS)
+        self.vaciar()
+
+    def __len__(self):
+        return min(self.num_muestras, self.capacidad)
+
+    def vaciar(self):
+        """
+        Descarta todas las muestras.
+        """
+        self.num_muestras = 0
+        self._siguiente = 0
+
+    def muestrear(self, gestor):
+        """
+        Guarda una muestra del estado actual del gestor, sobrescribiendo la más antigua si el buffer está lleno.
+
+        Parámetros:
+        -----------
+        gestor : GestorColas
+            El gestor a muestrear, al final de un paso.
+        """
+        i = self._siguiente
+        tiempo, gp, gnp, sp, snp, salas_general, salas_specialist, escalados, cancelados = self._orden
+        # Los contadores de las colas se leen de sus SumasPrefijas, sin recorrer las colas.
+        sumas = gestor.sumas_colas
+        tiempo[i] = gestor.tiempo_actual
+        gp[i] = sumas["general_priority"].vivos
+        gnp[i] = sumas["general_no_priority"].vivos
+        sp[i] = sumas["specialist_priority"].vivos
+        snp[i] = sumas["specialist_no_priority"].vivos
+        # SalasConsulta.ocupadas() construye la lista ordenada de (sala, paciente); para contar basta len.
+        salas_general[i] = len(gestor.consultas_general)
+        salas_specialist[i] = len(gestor.consultas_specialist)
+        escalados[i] = gestor.escalados
+        cancelados[i] = gestor.cancelados
+        self._siguiente = i + 1 if i + 1 < self.capacidad else 0
+        self.num_muestras += 1
+
+    def arrays(self):
+        """
+        Devuelve las muestras conservadas en orden cronológico.
+
+        Retorna:
+        --------
+        dict
+            Un array('q') por cada nombre de COLUMNAS, todos de la misma longitud.
+        """
+        n = len(self)
+        if self.num_muestras <= self.capacidad:
+            return {nombre: columna[:n] for nombre, columna in self._columnas.items()}
+        i = self._siguiente
+        return {nombre: columna[i:] + columna[:i] for nombre, columna in self._columnas.items()}
+
+    def a_csv(self, destino):
+        """
+        Escribe las muestras en formato CSV, con una fila de cabecera con los nombres de COLUMNAS.
+
+        Parámetros:
+        -----------
+        destino : str or file
+            Ruta del archivo o archivo de texto abierto.
+        """
+        if isinstance(destino, str):
+            with open(destino, "w", encoding="utf-8", newline="") as f:
+                self.a_csv(f)
+            return
+        columnas = self.arrays()
+        escritor = csv.writer(destino)
+        escritor.writerow(COLUMNAS)
+        escritor.writerows(zip(*(columnas[nombre] for nombre in COLUMNAS)))
@@ -0,0 +1,269 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+import asyncio
+import json
+import sys
+
+from array_queue import ArrayQueue
+from gestor_turnos import GestorColas
+from paciente import Paciente, CODIGOS_TIPO_CONSULTA, CODIGOS_URGENCIA
+from eventos import ENTRA, SALE
+
+class SinkSuscriptores:
+    """
+    Destino de eventos que envía a los clientes suscritos una línea JSON por cada entrada y salida
+    de consulta. Solo está activo mientras haya suscriptores, de modo que sin clientes GestorColas
+    no construye los eventos. Las escrituras no bloquean el bucle: los clientes que no leen y
+    acumulan más de 'limite_buffer' bytes pendientes se desconectan.
+    """
+
+    def __init__(self, limite_buffer=1 << 20):
+        """
+        Parámetros:
+        -----------
+        limite_buffer : int
+            Bytes pendientes de envío a partir de los cuales se desconecta a un cliente lento.
+        """
+        self.limite_buffer = limite_buffer
+        self.suscriptores = set()
+
+    @property
+    def activo(self):
+        return bool(self.suscriptores)
+
+    def emitir(self, evento):
+        if evento.tipo != ENTRA and evento.tipo != SALE:
+            return
+        linea = (json.dumps(evento._asdict(), ensure_ascii=False) + "\n").encode("utf-8")
+        for writer in list(self.suscriptores):
+            if writer.transport.is_closing() or writer.transport.get_write_buffer_size() > self.limite_buffer:
+                self.suscriptores.discard(writer)
+                writer.close()
+            else:
+                writer.write(linea)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        for writer in self.suscriptores:
+            writer.close()
+        self.suscriptores.clear()
+
+
+class ServidorAdmision:
+    """
+    Clase ServidorAdmision que ejecuta GestorColas en tiempo real sobre un reloj escalado y recibe
+    las admisiones por un socket local, con un protocolo de líneas de texto:
+
+        ADMIT <IDPac> <tipo_consulta> <urgencia> <tiempo_estimado>   ->  OK <IDPac> | ERROR <motivo>
+        CANCEL <IDPac>                                               ->  OK <IDPac> | ERROR <motivo>
+        SUBSCRIBE                                                    ->  OK, y después una línea JSON
+                                                                         por cada evento entra/sale
+
+    Las admisiones recibidas se acumulan y se admiten todas al comienzo de la siguiente unidad de
+    tiempo. Cada conexión es una corrutina independiente, por lo que miles de clientes no bloquean
+    el bucle de planificación.
+
+    Métodos
+    -------
+    iniciar():
+        Abre el socket de escucha.
+
+    ejecutar(num_ticks):
+        Ejecuta el reloj del gestor y atiende conexiones.
+    """
+
+    LIMITE_LINEA = 1 << 16
+
+    def __init__(self, gestor, host="127.0.0.1", port=8765, ticks_por_segundo=1.0):
+        """
+        Parámetros:
+        -----------
+        gestor : GestorColas
+            Gestor de colas a ejecutar. Su destino de eventos se sustituye por un SinkSuscriptores.
+        host : str
+            Dirección de escucha (local por defecto).
+        port : int
+            Puerto de escucha (0 para que lo elija el sistema).
+        ticks_por_segundo : float
+            Unidades de tiempo del gestor que se simulan por segundo real.
+        """
+        if ticks_por_segundo <= 0:
+            raise ValueError("ticks_por_segundo must be positive")
+        self.gestor = gestor
+        self.host = host
+        self.port = port
+        self.ticks_por_segundo = ticks_por_segundo
+        self.sink = SinkSuscriptores()
+        self.gestor.eventos = self.sink
+        self._pendientes = ArrayQueue()
+        self._servidor = None
+        self._conexiones = {}
+
+    async def iniciar(self):
+        """
+        Abre el socket de escucha. Si el puerto era 0, actualiza self.port con el asignado.
+        """
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.port, backlog=4096,
+                                                    limit=self.LIMITE_LINEA)
+        self.port = self._servidor.sockets[0].getsockname()[1]
+
+    async def _atender(self, reader, writer):
+        """
+        Atiende las peticiones de una conexión hasta que el cliente la cierra. Cada respuesta espera
+        a que el buffer de envío se vacíe (drain), de modo que un cliente que no lee deja de ser
+        atendido en lugar de acumular respuestas sin límite. Una línea de más de LIMITE_LINEA bytes
+        cierra la conexión.
+        """
+        self._conexiones[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    linea = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(b"ERROR line too long\n")
+                    await writer.drain()
+                    break
+                if not linea:
+                    break
+                partes = linea.decode("utf-8", errors="replace").split()
+                if not partes:
+                    continue
+                if partes[0] == "ADMIT":
+                    writer.write(self._admision(partes[1:]).encode("utf-8"))
+                elif partes[0] == "CANCEL":
+                    writer.write(self._cancelacion(partes[1:]).encode("utf-8"))
+                elif partes[0] == "SUBSCRIBE":
+                    writer.write(b"OK\n")
+                    self.sink.suscriptores.add(writer)
+                else:
+                    writer.write(b"ERROR unknown command\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sink.suscriptores.discard(writer)
+            self._conexiones.pop(writer, None)
+            writer.close()
+
+    def _admision(self, campos):
+        """
+        Valida una petición ADMIT y deja el paciente pendiente de admisión.
+
+        Retorna:
+        --------
+        str
+            La línea de respuesta para el cliente.
+        """
+        if len(campos) != 4:
+            return "ERROR ADMIT needs IDPac tipo_consulta urgencia tiempo_estimado\n"
+        IDPac, tipo_consulta, urgencia, tiempo_estimado = campos
+        if tipo_consulta not in CODIGOS_TIPO_CONSULTA or urgencia not in CODIGOS_URGENCIA:
+            return "ERROR unknown tipo_consulta/urgencia\n"
+        try:
+            paciente = Paciente(IDPac=IDPac, tipo_consulta=tipo_consulta, urgencia=urgencia,
+                                tiempo_estimado=int(tiempo_estimado), tiempo_llegada=None,
+                                tiempo_entrada_consulta=None, priorizacion=False)
+        except ValueError as error:
+            return f"ERROR {error}\n"
+        self._pendientes.enqueue(paciente)
+        return f"OK {IDPac}\n"
+
+    def _cancelacion(self, campos):
+        """
+        Atiende una petición CANCEL retirando al paciente de su cola de espera o, si su admisión
+        aún está pendiente del siguiente paso, de las admisiones pendientes. Se ejecuta en el mismo
+        bucle que el reloj, por lo que nunca coincide con un paso del gestor.
+
+        Retorna:
+        --------
+        str
+            La línea de respuesta para el cliente.
+        """
+        if len(campos) != 1:
+            return "ERROR CANCEL needs IDPac\n"
+        if self.gestor.cancelar(campos[0]) is None and not self._quitar_pendiente(campos[0]):
+            return f"ERROR {campos[0]} is not waiting\n"
+        return f"OK {campos[0]}\n"
+
+    def _quitar_pendiente(self, IDPac):
+        """
+        Quita de las admisiones pendientes la primera con el identificador indicado.
+
+        Retorna:
+        --------
+        bool
+            True si había una admisión pendiente con ese identificador.
+        """
+        pendientes = self._pendientes.dequeue_many(len(self._pendientes))
+        for i, paciente in enumerate(pendientes):
+            if paciente.IDPac == IDPac:
+                del pendientes[i]
+                self._pendientes.enqueue_many(pendientes)
+                return True
+        self._pendientes.enqueue_many(pendientes)
+        return False
+
+    async def ejecutar(self, num_ticks=None):
+        """
+        Ejecuta el reloj del gestor: en cada unidad de tiempo admite las admisiones pendientes y
+        avanza el gestor un paso. Las unidades se programan sobre el reloj del bucle, por lo que un
+        paso lento no desplaza los siguientes.
+
+        Parámetros:
+        -----------
+        num_ticks : int or None
+            Número de unidades de tiempo a ejecutar, o None para ejecutar indefinidamente.
+        """
+        if self._servidor is None:
+            await self.iniciar()
+        loop = asyncio.get_running_loop()
+        periodo = 1 / self.ticks_por_segundo
+        inicio = loop.time()
+        tick = 0
+        try:
+            while num_ticks is None or tick < num_ticks:
+                while not self._pendientes.is_empty():
+                    self.gestor.admitir(self._pendientes.dequeue())
+                self.gestor.paso()
+                tick += 1
+                await asyncio.sleep(max(0, inicio + tick * periodo - loop.time()))
+        finally:
+            await self.cerrar()
+
+    async def cerrar(self):
+        """
+        Cierra el socket de escucha y todas las conexiones abiertas, y espera a que terminen sus
+        corrutinas y a que el servidor quede cerrado.
+        """
+        servidor, self._servidor = self._servidor, None
+        if servidor is not None:
+            servidor.close()
+        self.sink.close()
+        conexiones = list(self._conexiones.items())
+        for writer, _ in conexiones:
+            writer.close()
+        await asyncio.gather(*(tarea for _, tarea in conexiones), return_exceptions=True)
+        if servidor is not None:
+            await servidor.wait_closed()
+
+
+if __name__ == "__main__":
+    """
+    Arranca el servidor de admisión. Uso: python servidor_admision.py [puerto] [ticks_por_segundo]
+    """
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    ticks_por_segundo = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    gestor = GestorColas(general_priority=ArrayQueue(), general_no_priority=ArrayQueue(),
+                         specialist_priority=ArrayQueue(), specialist_no_priority=ArrayQueue(), priorizacion=[])
+    servidor = ServidorAdmision(gestor, port=port, ticks_por_segundo=ticks_por_segundo)
+
+    async def arrancar():
+        # El mensaje se escribe ya escuchando, con el puerto asignado si se pidió el 0.
+        await servidor.iniciar()
+        print(f"Servidor de admisión en {servidor.host}:{servidor.port} ({ticks_por_segundo} ticks/s)", flush=True)
+        await servidor.ejecutar()
+
+    asyncio.run(arrancar())
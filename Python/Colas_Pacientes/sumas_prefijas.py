@@ -0,0 +1,165 @@
+# Martín Quinteiro González   martin.quinteiro.gonzalez@udc.es
+# Álvaro Sieira Rama          alvaro.sieira.rama@udc.es
+
+class SumasPrefijas:
+    """
+    Clase SumasPrefijas: sumas acumuladas de los valores de una cola (por ejemplo, el tiempo estimado
+    de sus pacientes) en orden de llegada, sobre un árbol de Fenwick.
+
+    Cada valor añadido recibe un número de orden creciente con el que luego se quita, esté al principio
+    o en medio de la cola. Junto a las sumas se lleva un segundo árbol con el número de valores vivos,
+    de modo que la suma de los k primeros valores que siguen en la cola se obtiene en O(log n) aunque
+    se hayan quitado valores intermedios. Cuando se llena, el árbol se reconstruye en O(n) desde el
+    primer valor vivo, por lo que añadir cuesta O(log n) amortizado.
+
+    Métodos
+    -------
+    añadir(valor):
+        Añade un valor al final y devuelve su número de orden.
+    quitar(orden):
+        Quita el valor con ese número de orden y lo devuelve.
+    suma_primeros(k):
+        Suma de los k primeros valores que siguen en la cola.
+
+    Atributos
+    ---------
+    total : int or float
+        Suma de todos los valores en la cola.
+    """
+
+    CAPACIDAD_INICIAL = 16
+
+    def __init__(self):
+        self._base = 0
+        self._siguiente = 0
+        self._valores = [None] * self.CAPACIDAD_INICIAL
+        self._suma = [0] * (self.CAPACIDAD_INICIAL + 1)
+        self._cuenta = [0] * (self.CAPACIDAD_INICIAL + 1)
+        self._vivos = 0
+        self.total = 0
+
+    def __len__(self):
+        return self._vivos
+
+    @property
+    def vivos(self):
+        """
+        Número de valores en la cola (los añadidos y no quitados).
+        """
+        return self._vivos
+
+    def añadir(self, valor):
+        """
+        Añade un valor al final de la cola.
+
+        Parámetros:
+        -----------
+        valor : int or float
+            Valor a acumular.
+
+        Retorna:
+        --------
+        int
+            El número de orden del valor, necesario para quitarlo.
+        """
+        if self._siguiente - self._base == len(self._valores):
+            self._reconstruir()
+        posicion = self._siguiente - self._base
+        self._valores[posicion] = valor
+        suma, cuenta, n = self._suma, self._cuenta, len(self._valores)
+        i = posicion + 1
+        while i <= n:
+            suma[i] += valor
+            cuenta[i] += 1
+            i += i & -i
+        self._vivos += 1
+        self.total += valor
+        self._siguiente += 1
+        return self._siguiente - 1
+
+    def quitar(self, orden):
+        """
+        Quita el valor con el número de orden indicado.
+
+        Parámetros:
+        -----------
+        orden : int
+            Número de orden devuelto por añadir.
+
+        Retorna:
+        --------
+        int or float
+            El valor quitado.
+
+        Excepciones:
+        ------------
+        KeyError
+            Si no hay ningún valor vivo con ese número de orden.
+        """
+        posicion = orden - self._base
+        if not 0 <= posicion < self._siguiente - self._base or self._valores[posicion] is None:
+            raise KeyError(orden)
+        valor = self._valores[posicion]
+        self._valores[posicion] = None
+        suma, cuenta, n = self._suma, self._cuenta, len(self._valores)
+        i = posicion + 1
+        while i <= n:
+            suma[i] -= valor
+            cuenta[i] -= 1
+            i += i & -i
+        self._vivos -= 1
+        self.total -= valor
+        return valor
+
+    def suma_primeros(self, k):
+        """
+        Devuelve la suma de los k primeros valores vivos en orden de llegada, en O(log n).
+
+        Parámetros:
+        -----------
+        k : int
+            Número de valores a sumar; si es mayor que los que hay, se suman todos.
+        """
+        if k <= 0:
+            return 0
+        if k >= self._vivos:
+            return self.total
+        # Descenso binario sobre el árbol de cuentas hasta el k-ésimo valor vivo, sumando a la vez.
+        suma, cuenta = self._suma, self._cuenta
+        i, acumulado = 0, 0
+        paso = 1 << (len(self._valores).bit_length() - 1)
+        while paso:
+            j = i + paso
+            if j < len(cuenta) and cuenta[j] < k:
+                i = j
+                k -= cuenta[j]
+                acumulado += suma[j]
+            paso >>= 1
+        # i es la última posición con menos de k valores vivos; el k-ésimo está en la posición i.
+        return acumulado + self._valores[i]
+
+    def _reconstruir(self):
+        """
+        Reconstruye el árbol desde el primer valor vivo, con el doble de capacidad de la que ocupan los
+        valores vivos (y los huecos entre ellos).
+        """
+        primero = 0
+        while primero < len(self._valores) and self._valores[primero] is None and primero < self._siguiente - self._base:
+            primero += 1
+        valores = self._valores[primero:self._siguiente - self._base]
+        capacidad = max(self.CAPACIDAD_INICIAL, 2 * len(valores))
+        valores.extend([None] * (capacidad - len(valores)))
+        suma = [0] * (capacidad + 1)
+        cuenta = [0] * (capacidad + 1)
+        for posicion, valor in enumerate(valores, 1):
+            if valor is not None:
+                suma[posicion] += valor
+                cuenta[posicion] += 1
+            padre = posicion + (posicion & -posicion)
+            if padre <= capacidad:
+                suma[padre] += suma[posicion]
+                cuenta[padre] += cuenta[posicion]
+        self._base += primero
+        self._valores = valores
+        self._suma = suma
+        self._cuenta = cuenta
@@ -0,0 +1,30 @@
+import pytest
+
+from carga_pacientes import TablaPacientes, cargar_pacientes
+
+VALIDAS = ["user0 general priority 3", "  user1\tspecialist no_priority 5  ", "", "   ", "user2 general no_priority 1"]
+
+
+def _archivo(tmp_path, lineas):
+    ruta = tmp_path / "pacientes.txt"
+    ruta.write_text("\n".join(lineas) + "\n", encoding="utf-8")
+    return str(ruta)
+
+
+def test_carga_lineas_validas(tmp_path):
+    pacientes = cargar_pacientes(_archivo(tmp_path, VALIDAS))
+    assert [paciente.IDPac for paciente in pacientes] == ["user0", "user1", "user2"]
+
+
+@pytest.mark.parametrize("erronea", ["user9 general priority", "user9 general priority 3 x"])
+@pytest.mark.parametrize("tam_bloque", [1, 1 << 20])
+def test_linea_sin_cuatro_campos(tmp_path, erronea, tam_bloque):
+    ruta = _archivo(tmp_path, VALIDAS + [erronea] + VALIDAS)
+    for cargar in (cargar_pacientes, lambda ruta: TablaPacientes.desde_archivo(ruta, tam_bloque)):
+        with pytest.raises(ValueError, match="line 6 "):
+            cargar(ruta)
+
+
+def test_tiempo_no_valido(tmp_path):
+    with pytest.raises(ValueError, match=r"line 6\)"):
+        cargar_pacientes(_archivo(tmp_path, VALIDAS + ["user9 general priority -2"]))
@@ -0,0 +1,19 @@
+import pytest
+
+from coordinador_clinicas import Clinica, CoordinadorClinicas
+from replicaciones import Escenario, generar_traza
+
+
+@pytest.mark.parametrize("periodo", [0, -3, 1.5])
+def test_periodo_admision_no_valido(periodo):
+    with pytest.raises(ValueError):
+        CoordinadorClinicas([Clinica("a")], periodo_admision=periodo)
+
+
+@pytest.mark.parametrize("periodo", [1, 3])
+def test_reparte_todos_los_pacientes(periodo):
+    coordinador = CoordinadorClinicas([Clinica("a", 1, 1), Clinica("b", 2, 1)], periodo_admision=periodo,
+                                      tiempo_limite=10.0)
+    resultados = coordinador.ejecutar(generar_traza(Escenario("x", 300, tiempo_medio=6), "0"))
+    assert sum(datos["admitidos"] for datos in resultados.values()) == 300
+    assert all(datos["ticks"] >= 300 * periodo - periodo + 1 for datos in resultados.values())
@@ -0,0 +1,19 @@
+import pytest
+
+from array_queue import ArrayQueue, Empty
+from fuente_admision import FuenteAdmision
+from politicas import ColaHeap
+
+
+@pytest.mark.parametrize("cola", [FuenteAdmision([]), ArrayQueue(), ColaHeap(lambda paciente: paciente)])
+def test_dequeue_vacia_lanza_empty(cola):
+    with pytest.raises(Empty):
+        cola.dequeue()
+
+
+def test_fuente_agotada():
+    fuente = FuenteAdmision(iter((1, 2)), anticipacion=2)
+    assert [fuente.dequeue(), fuente.dequeue()] == [1, 2]
+    assert fuente.is_empty()
+    with pytest.raises(Empty):
+        fuente.dequeue()
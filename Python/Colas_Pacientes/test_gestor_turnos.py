@@ -0,0 +1,45 @@
+import io
+
+import pytest
+
+from array_queue import ArrayQueue
+from eventos import SinkTexto
+from gestor_turnos import GestorColas
+from replicaciones import Escenario, generar_traza
+
+ESCENARIO = Escenario("metricas", 400, periodo_admision=2, tiempo_medio=4, salas_general=2, salas_specialist=1)
+
+
+def _gestor():
+    return GestorColas(ArrayQueue(), ArrayQueue(), ArrayQueue(), ArrayQueue(), [], salas_general=2,
+                       salas_specialist=1, periodo_admision=2, eventos=SinkTexto(io.StringIO()))
+
+
+def _resumen(gestor):
+    return gestor.metricas.resumen()
+
+
+def test_metricas_no_se_acumulan_entre_ejecuciones():
+    gestor = _gestor()
+    gestor.gestion_lista_espera(generar_traza(ESCENARIO, 1))
+    primera, resultados = _resumen(gestor), list(gestor.lista_pandas)
+    gestor.gestion_lista_espera(generar_traza(ESCENARIO, 1))
+    assert gestor.lista_pandas == resultados
+    assert _resumen(gestor) == primera
+    assert gestor.metricas["general"].n + gestor.metricas["specialist"].n == len(gestor.lista_pandas)
+
+    otra = _gestor()
+    otra.gestion_lista_espera(generar_traza(ESCENARIO, 2))
+    gestor.gestion_lista_espera(generar_traza(ESCENARIO, 2))
+    assert _resumen(gestor) == _resumen(otra)
+
+
+def test_colas_con_interfaz_de_cola():
+    from benchmark_colas import ColaDeque
+
+    colas = GestorColas(ColaDeque(), ColaDeque(), ColaDeque(), ColaDeque(), [], salas_general=2, salas_specialist=1,
+                        periodo_admision=2, eventos=SinkTexto(io.StringIO()))
+    assert colas.gestion_lista_espera(generar_traza(ESCENARIO, 1)) == \
+        _gestor().gestion_lista_espera(generar_traza(ESCENARIO, 1))
+    with pytest.raises(ValueError):
+        colas.general_priority = []
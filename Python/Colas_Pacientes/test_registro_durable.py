@@ -0,0 +1,78 @@
+import io
+
+import pytest
+
+import registro_durable
+from array_queue import ArrayQueue
+from eventos import SinkTexto
+from gestor_turnos import GestorColas
+from paciente import RegistroPaciente
+from politicas import ColaHeap, PoliticaFIFO, PoliticaMasCortoPrimero, PoliticaRoundRobin
+from replicaciones import Escenario, generar_traza
+
+ESCENARIO = Escenario("durable", 1500, periodo_admision=2, tiempo_medio=4, salas_general=2, salas_specialist=1)
+
+
+class _Caida(Exception):
+    pass
+
+
+class _SinkCaida:
+    """
+    Destino de eventos que simula una caída lanzando una excepción al recibir el evento n-ésimo.
+    """
+    activo = True
+
+    def __init__(self, n):
+        self.restantes = n
+
+    def emitir(self, evento):
+        self.restantes -= 1
+        if self.restantes == 0:
+            raise _Caida()
+
+    def flush(self):
+        pass
+
+
+def _gestor(eventos, politica):
+    return GestorColas(ArrayQueue(), ArrayQueue(), ArrayQueue(), ArrayQueue(), [], salas_general=2,
+                       salas_specialist=1, periodo_admision=2, eventos=eventos, politica=politica)
+
+
+def _tick(linea):
+    # SinkTexto escribe tiempo + 1, salvo en la priorización aplicada, que se anota antes del paso.
+    n = int(linea.split(":")[0])
+    return n if "aplicada" in linea else n - 1
+
+
+def test_contenido_cola_heap_no_destructivo():
+    cola = ColaHeap(lambda paciente: paciente.tiempo_estimado)
+    for i, tiempo in enumerate((3, 1, 2)):
+        cola.enqueue(RegistroPaciente(f"p{i}", 0, 0, tiempo))
+    contenido = registro_durable._contenido_cola(cola)
+    assert [paciente.tiempo_estimado for paciente in contenido] == [1, 2, 3]
+    assert [cola.dequeue().tiempo_estimado for _ in range(len(cola))] == [1, 2, 3]
+
+
+@pytest.mark.parametrize("politica", [PoliticaFIFO, PoliticaMasCortoPrimero, PoliticaRoundRobin])
+@pytest.mark.parametrize("caida", [700, 2500])
+def test_recuperacion_continua_igual(tmp_path, politica, caida):
+    referencia = io.StringIO()
+    _gestor(SinkTexto(referencia), politica()).gestion_lista_espera(generar_traza(ESCENARIO, 1))
+    esperado_completo = referencia.getvalue().splitlines()
+
+    with pytest.raises(_Caida):
+        registro_durable.ejecutar_durable(_gestor(_SinkCaida(caida), politica()), generar_traza(ESCENARIO, 1),
+                                          str(tmp_path), snapshot_cada=300)
+    assert (tmp_path / registro_durable.NOMBRE_SNAPSHOT).exists()
+
+    recuperado = _gestor(SinkTexto(io.StringIO()), politica())
+    registro_durable.recuperar(str(tmp_path), recuperado)
+    tiempo = recuperado.tiempo_actual
+
+    salida = io.StringIO()
+    registro_durable.ejecutar_durable(_gestor(SinkTexto(salida), politica()), generar_traza(ESCENARIO, 1),
+                                      str(tmp_path))
+    esperado = [linea for linea in esperado_completo if _tick(linea) >= tiempo]
+    assert salida.getvalue().splitlines() == esperado
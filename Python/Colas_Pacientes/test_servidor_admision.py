@@ -0,0 +1,21 @@
+import os
+import socket
+import subprocess
+import sys
+
+SERVIDOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "servidor_admision.py")
+
+
+def test_mensaje_de_arranque_con_puerto_asignado():
+    proceso = subprocess.Popen([sys.executable, SERVIDOR, "0", "100"], stdout=subprocess.PIPE, text=True)
+    try:
+        linea = proceso.stdout.readline()
+        direccion = linea.split()[4]
+        host, port = direccion.rsplit(":", 1)
+        assert int(port) != 0
+        with socket.create_connection((host, int(port)), timeout=5) as conexion:
+            conexion.sendall(b"ADMIT user0 general priority 3\n")
+            assert conexion.makefile().readline() == "OK user0\n"
+    finally:
+        proceso.kill()
+        proceso.wait()
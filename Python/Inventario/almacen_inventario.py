@@ -0,0 +1,414 @@
+import glob
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+
+from inventario import Pieza
+from catalogo import Inventario, Catalogo
+
+NOMBRE_SNAPSHOT = "inventario.snap"
+MAGIA = b"INVSNAP3"
+# Cabecera: magia, generación, ancho de los nombres de pieza y de modelo, número de piezas, de
+# modelos y de entradas (modelo, pieza), y número de altas de piezas del inventario.
+CABECERA = struct.Struct("<8sQIIQQQQ")
+
+PIEZA_AÑADIDA = "A"
+DESCUENTO = "D"
+PIEZA_ELIMINADA = "E"
+MODELO_AÑADIDO = "P"
+MODELO_ELIMINADO = "M"
+
+def _ruta_diario(directorio, generacion):
+    return os.path.join(directorio, f"diario.{generacion:08d}.log")
+
+
+def _generaciones(directorio):
+    return sorted(int(os.path.basename(ruta)[7:-4]) for ruta in glob.glob(os.path.join(directorio, "diario.*.log")))
+
+
+def _ancho(nombres):
+    return max((len(nombre) for nombre in nombres), default=1) or 1
+
+
+def escribir_snapshot(ruta, generacion, piezas, modelos, num_altas=0):
+    """
+    Escribe una instantánea binaria del inventario y del catálogo. El archivo tiene, tras la
+    cabecera:
+      - las piezas en el orden del stock, como registros de ancho fijo (nombre, cantidad, número de
+        alta), que es lo que ordena los empates del stock;
+      - un índice con los números de registro de las piezas ordenados por nombre;
+      - los modelos en el orden del catálogo, como registros (nombre, primera entrada, número de entradas);
+      - un índice con los números de registro de los modelos ordenados por nombre;
+      - las entradas (pieza, cantidad) de cada modelo, en el orden de su lista.
+    Se escribe en un archivo temporal que se renombra, de modo que una caída deja intacta la anterior.
+
+    Parámetros:
+    -----------
+    ruta : str
+        Ruta del archivo.
+    generacion : int
+        Generación del diario que sigue a la instantánea.
+    piezas : list
+        Tuplas (nombre_pieza, cantidad, número de alta) en el orden del stock.
+    modelos : list
+        Pares (modelo, lista de pares (nombre_pieza, cantidad)) en el orden del catálogo.
+    num_altas : int
+        Número de altas hechas en el inventario, del que sigue la numeración al cargarlo.
+    """
+    piezas = [(nombre.encode("utf-8"), *resto) for nombre, *resto in piezas]
+    modelos = [(modelo.encode("utf-8"), [(nombre.encode("utf-8"), cantidad) for nombre, cantidad in entradas])
+               for modelo, entradas in modelos]
+    ancho_pieza = _ancho([nombre for nombre, *_ in piezas] +
+                         [nombre for _, entradas in modelos for nombre, _ in entradas])
+    ancho_modelo = _ancho([modelo for modelo, _ in modelos])
+    registro_pieza = struct.Struct(f"<{ancho_pieza}sq")
+    registro_stock = struct.Struct(f"<{ancho_pieza}sqq")
+    registro_modelo = struct.Struct(f"<{ancho_modelo}sqq")
+    num_entradas = sum(len(entradas) for _, entradas in modelos)
+    with open(ruta + ".tmp", "wb") as f:
+        f.write(CABECERA.pack(MAGIA, generacion, ancho_pieza, ancho_modelo, len(piezas), len(modelos), num_entradas,
+                                 num_altas))
+        f.write(b"".join(registro_stock.pack(*pieza) for pieza in piezas))
+        f.write(array("q", sorted(range(len(piezas)), key=lambda i: piezas[i][0])).tobytes())
+        inicio = 0
+        for modelo, entradas in modelos:
+            f.write(registro_modelo.pack(modelo, inicio, len(entradas)))
+            inicio += len(entradas)
+        f.write(array("q", sorted(range(len(modelos)), key=lambda i: modelos[i][0])).tobytes())
+        for _, entradas in modelos:
+            f.write(b"".join(registro_pieza.pack(nombre, cantidad) for nombre, cantidad in entradas))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(ruta + ".tmp", ruta)
+
+
+class AlmacenInventario:
+    """
+    Almacenamiento persistente de un Inventario y un Catalogo: una instantánea binaria que se abre
+    con mmap y un diario de solo añadido con los movimientos posteriores (altas, descuentos y bajas
+    de piezas, altas y bajas de modelos).
+
+    Abrir el almacén solo proyecta la instantánea en memoria y relee el diario desde la última
+    instantánea, por lo que tarda milisegundos aunque haya millones de piezas; las consultas de
+    cantidad() y piezas_modelo() hacen una búsqueda binaria en la instantánea y miran los
+    movimientos del diario. cargar() construye los objetos Inventario y Catalogo cuando hacen falta,
+    reaplicando el diario sobre ellos para que el orden del stock sea el mismo que antes de cerrar.
+
+    Asignado como diario del Inventario y del Catalogo (lo hace cargar()), el almacén anota cada
+    movimiento. Las líneas se escriben con un único fsync por lote (group commit), cuando el lote se
+    llena, en flush() y close(), y a más tardar 'intervalo_fsync' segundos después del primer
+    movimiento pendiente: si no llega otro que lo escriba antes, lo hace un temporizador
+    (threading.Timer). snapshot() guarda el estado actual en una instantánea nueva y empieza un
+    diario vacío.
+
+    Métodos
+    -------
+    vacio():
+        Indica si el almacén está vacío.
+    cantidad(nombre_pieza):
+        Cantidad actual de una pieza.
+    piezas_modelo(modelo):
+        Piezas que necesita un modelo.
+    cargar():
+        Construye el Inventario y el Catalogo.
+    snapshot(inventario, catalogo):
+        Guarda una instantánea y rota el diario.
+    """
+
+    def __init__(self, directorio, tam_lote=1024, intervalo_fsync=0.05):
+        """
+        Parámetros:
+        -----------
+        directorio : str
+            Directorio de la instantánea y del diario (se crea si no existe).
+        tam_lote : int
+            Número máximo de movimientos por escritura con fsync.
+        intervalo_fsync : float
+            Tiempo máximo en segundos que un movimiento puede esperar a ser escrito.
+        """
+        os.makedirs(directorio, exist_ok=True)
+        self.directorio = directorio
+        self.tam_lote = tam_lote
+        self.intervalo_fsync = intervalo_fsync
+        self._mapa = None
+        self._abrir_snapshot()
+        # Movimientos del diario: cantidad actual (None si la pieza se ha eliminado) y piezas
+        # actuales (None si el modelo se ha eliminado) de lo que ha cambiado desde la instantánea.
+        self._cantidades = dict()
+        self._modelos = dict()
+        self._lineas = []
+        self._ultimo_fsync = time.monotonic()
+        self._cerrojo = threading.RLock()
+        self._temporizador = None
+        for movimiento in self._leer_diario():
+            self._aplicar(movimiento)
+        self._diario = open(_ruta_diario(directorio, self.generacion), "a", encoding="utf-8")
+
+    def _abrir_snapshot(self):
+        """
+        Proyecta la instantánea en memoria y calcula dónde empieza cada sección.
+        """
+        ruta = os.path.join(self.directorio, NOMBRE_SNAPSHOT)
+        if not os.path.exists(ruta) or os.path.getsize(ruta) == 0:
+            self.generacion = 0
+            self.num_piezas = self.num_modelos = 0
+            return
+        with open(ruta, "rb") as f:
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magia, self.generacion, ancho_pieza, ancho_modelo, self.num_piezas, self.num_modelos, num_entradas, \
+            self._num_altas = CABECERA.unpack_from(self._mapa, 0)
+        if magia != MAGIA:
+            raise ValueError(f"{ruta} is not an inventory snapshot")
+        self._ancho_pieza, self._ancho_modelo = ancho_pieza, ancho_modelo
+        self._registro_pieza = struct.Struct(f"<{ancho_pieza}sq")
+        self._registro_stock = struct.Struct(f"<{ancho_pieza}sqq")
+        self._registro_modelo = struct.Struct(f"<{ancho_modelo}sqq")
+        self._piezas = CABECERA.size
+        self._indice_piezas = self._piezas + self.num_piezas * self._registro_stock.size
+        self._modelos_snap = self._indice_piezas + 8 * self.num_piezas
+        self._indice_modelos = self._modelos_snap + self.num_modelos * self._registro_modelo.size
+        self._entradas = self._indice_modelos + 8 * self.num_modelos
+
+    def _leer_diario(self):
+        """
+        Generador de los movimientos del diario de la generación actual. Una última línea incompleta,
+        que pudo quedar a medias en una caída, se trunca.
+        """
+        ruta = _ruta_diario(self.directorio, self.generacion)
+        if not os.path.exists(ruta):
+            return
+        with open(ruta, "r+", encoding="utf-8") as f:
+            valido = 0
+            for linea in f:
+                if not linea.endswith("\n"):
+                    break
+                valido += len(linea.encode("utf-8"))
+                campos = linea[:-1].split("\t")
+                if campos[0] in (PIEZA_AÑADIDA, DESCUENTO):
+                    campos[2] = int(campos[2])
+                elif campos[0] == MODELO_AÑADIDO:
+                    campos[3] = int(campos[3])
+                yield tuple(campos)
+            f.truncate(valido)
+
+    def _buscar(self, inicio_indice, inicio_registros, registro, ancho, num, nombre):
+        """
+        Búsqueda binaria de un nombre en una sección de la instantánea a través de su índice ordenado.
+        Devuelve el registro desempaquetado, o None si no está.
+        """
+        clave = nombre.encode("utf-8")
+        if len(clave) > ancho:
+            return None
+        clave = clave.ljust(ancho, b"\0")
+        izquierda, derecha = 0, num
+        while izquierda < derecha:
+            medio = (izquierda + derecha) // 2
+            i = struct.unpack_from("<q", self._mapa, inicio_indice + 8 * medio)[0]
+            desplazamiento = inicio_registros + i * registro.size
+            actual = self._mapa[desplazamiento:desplazamiento + ancho]
+            if actual == clave:
+                return registro.unpack_from(self._mapa, desplazamiento)
+            if actual < clave:
+                izquierda = medio + 1
+            else:
+                derecha = medio
+        return None
+
+    def vacio(self):
+        """
+        Indica si el almacén no tiene instantánea ni movimientos.
+        """
+        return self._mapa is None and not self._cantidades and not self._modelos
+
+    def cantidad(self, nombre_pieza):
+        """
+        Devuelve la cantidad actual de una pieza, o None si no está en el inventario.
+        """
+        if nombre_pieza in self._cantidades:
+            return self._cantidades[nombre_pieza]
+        if self._mapa is None:
+            return None
+        encontrado = self._buscar(self._indice_piezas, self._piezas, self._registro_stock, self._ancho_pieza,
+                                  self.num_piezas, nombre_pieza)
+        return None if encontrado is None else encontrado[1]
+
+    def piezas_modelo(self, modelo):
+        """
+        Devuelve las piezas que necesita un modelo, o None si no está en el catálogo.
+
+        Retorna:
+        --------
+        list or None
+            Pares (nombre_pieza, cantidad) en el orden de la lista del modelo.
+        """
+        if modelo in self._modelos:
+            entradas = self._modelos[modelo]
+            return None if entradas is None else list(entradas)
+        return self._piezas_modelo_snapshot(modelo)
+
+    def _piezas_modelo_snapshot(self, modelo):
+        if self._mapa is None:
+            return None
+        encontrado = self._buscar(self._indice_modelos, self._modelos_snap, self._registro_modelo,
+                                  self._ancho_modelo, self.num_modelos, modelo)
+        if encontrado is None:
+            return None
+        return self._entradas_modelo(encontrado[1], encontrado[2])
+
+    def _entradas_modelo(self, inicio, cuenta):
+        registro = self._registro_pieza
+        return [(nombre.rstrip(b"\0").decode("utf-8"), cantidad) for nombre, cantidad in
+                registro.iter_unpack(self._mapa[self._entradas + inicio * registro.size:
+                                                self._entradas + (inicio + cuenta) * registro.size])]
+
+    def _aplicar(self, movimiento):
+        """
+        Aplica un movimiento a las cantidades y modelos que han cambiado desde la instantánea.
+        """
+        tipo = movimiento[0]
+        if tipo == PIEZA_AÑADIDA:
+            self._cantidades[movimiento[1]] = movimiento[2]
+        elif tipo == DESCUENTO:
+            self._cantidades[movimiento[1]] = self.cantidad(movimiento[1]) - movimiento[2]
+        elif tipo == PIEZA_ELIMINADA:
+            self._cantidades[movimiento[1]] = None
+        elif tipo == MODELO_AÑADIDO:
+            modelo = movimiento[1]
+            if modelo not in self._modelos:
+                self._modelos[modelo] = self._piezas_modelo_snapshot(modelo)
+            if self._modelos[modelo] is None:
+                self._modelos[modelo] = []
+            self._modelos[modelo].append((movimiento[2], movimiento[3]))
+        elif tipo == MODELO_ELIMINADO:
+            self._modelos[movimiento[1]] = None
+
+    def _anotar(self, movimiento):
+        with self._cerrojo:
+            self._aplicar(movimiento)
+            self._lineas.append("\t".join(map(str, movimiento)))
+            if len(self._lineas) >= self.tam_lote or time.monotonic() - self._ultimo_fsync >= self.intervalo_fsync:
+                self._commit()
+            elif self._temporizador is None:
+                self._temporizador = threading.Timer(self.intervalo_fsync, self._vencido)
+                self._temporizador.start()
+
+    def _vencido(self):
+        """
+        Escribe los movimientos pendientes cuando vence el temporizador, si nadie lo ha hecho antes.
+        """
+        with self._cerrojo:
+            if self._temporizador is threading.current_thread():
+                self._commit()
+
+    def pieza_añadida(self, pieza):
+        self._anotar((PIEZA_AÑADIDA, pieza.nombre_pieza, pieza.cantidad))
+
+    def descuento(self, nombre_pieza, cantidad):
+        self._anotar((DESCUENTO, nombre_pieza, cantidad))
+
+    def pieza_eliminada(self, nombre_pieza):
+        self._anotar((PIEZA_ELIMINADA, nombre_pieza))
+
+    def modelo_añadido(self, modelo, pieza):
+        self._anotar((MODELO_AÑADIDO, modelo, pieza.nombre_pieza, pieza.cantidad))
+
+    def modelo_eliminado(self, modelo):
+        self._anotar((MODELO_ELIMINADO, modelo))
+
+    def cargar(self):
+        """
+        Construye el Inventario y el Catalogo de la instantánea, reaplica sobre ellos los movimientos
+        del diario y los deja con el almacén como diario.
+
+        Retorna:
+        --------
+        tuple
+            (Inventario, Catalogo)
+        """
+        inventario = Inventario()
+        catalogo = Catalogo()
+        if self._mapa is not None:
+            piezas = self._registro_stock.iter_unpack(self._mapa[self._piezas:self._indice_piezas])
+            for nombre, cantidad, alta in piezas:
+                inventario._añadir(Pieza(nombre.rstrip(b"\0").decode("utf-8"), cantidad), alta)
+            inventario._num_altas = self._num_altas
+            for modelo, inicio, cuenta in self._registro_modelo.iter_unpack(self._mapa[self._modelos_snap:self._indice_modelos]):
+                modelo = modelo.rstrip(b"\0").decode("utf-8")
+                for nombre, cantidad in reversed(self._entradas_modelo(inicio, cuenta)):
+                    catalogo.añadir_modelo(modelo, Pieza(nombre, cantidad))
+        self._commit()
+        for movimiento in self._leer_diario():
+            tipo = movimiento[0]
+            if tipo == PIEZA_AÑADIDA:
+                inventario.añadir_pieza(Pieza(movimiento[1], movimiento[2]))
+            elif tipo == DESCUENTO:
+                inventario.descontar(inventario.buscar_pieza(movimiento[1]), movimiento[2])
+            elif tipo == PIEZA_ELIMINADA:
+                inventario._quitar(movimiento[1])
+            elif tipo == MODELO_AÑADIDO:
+                catalogo.añadir_modelo(movimiento[1], Pieza(movimiento[2], movimiento[3]))
+            elif tipo == MODELO_ELIMINADO:
+                catalogo.eliminar_modelo(movimiento[1])
+        inventario.diario = self
+        catalogo.diario = self
+        return inventario, catalogo
+
+    def snapshot(self, inventario, catalogo):
+        """
+        Guarda el estado del inventario y del catálogo en una instantánea nueva y empieza un diario
+        vacío; los diarios anteriores se borran después.
+
+        Parámetros:
+        -----------
+        inventario : Inventario
+            Inventario cuyo diario es este almacén.
+        catalogo : Catalogo
+            Catálogo cuyo diario es este almacén.
+        """
+        with self._cerrojo:
+            self._commit()
+            self._diario.close()
+            escribir_snapshot(os.path.join(self.directorio, NOMBRE_SNAPSHOT), self.generacion + 1,
+                              [(pieza.nombre_pieza, pieza.cantidad, inventario._altas[pieza.nombre_pieza])
+                               for pieza in inventario.inventario],
+                              [(modelo, [(pieza.nombre_pieza, pieza.cantidad) for pieza in piezas])
+                               for modelo, piezas in catalogo.catalogo.items()],
+                              inventario._num_altas)
+            if self._mapa is not None:
+                self._mapa.close()
+            self._abrir_snapshot()
+            self._cantidades = dict()
+            self._modelos = dict()
+            self._diario = open(_ruta_diario(self.directorio, self.generacion), "a", encoding="utf-8")
+            for generacion in _generaciones(self.directorio):
+                if generacion < self.generacion:
+                    os.remove(_ruta_diario(self.directorio, generacion))
+
+    def _commit(self):
+        """
+        Escribe los movimientos pendientes y los hace durables con un único fsync.
+        """
+        with self._cerrojo:
+            if self._temporizador is not None:
+                self._temporizador.cancel()
+                self._temporizador = None
+            if self._lineas:
+                self._diario.write("\n".join(self._lineas) + "\n")
+                self._lineas = []
+            self._diario.flush()
+            os.fsync(self._diario.fileno())
+            self._ultimo_fsync = time.monotonic()
+
+    def flush(self):
+        self._commit()
+
+    def close(self):
+        with self._cerrojo:
+            self._commit()
+            self._diario.close()
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
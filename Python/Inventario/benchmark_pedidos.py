@@ -0,0 +1,71 @@
+import contextlib
+import io
+import random
+import sys
+import threading
+import time
+
+from inventario import Pieza
+from catalogo import Inventario, Catalogo
+from pedidos_concurrentes import PedidosConcurrentes
+
+def generar(num_piezas, num_modelos, num_pedidos, piezas_por_modelo=5, semilla=0):
+    """
+    Genera un inventario, un catálogo y una lista de pedidos sintéticos. Hay stock de sobra para que
+    casi todos los pedidos se atiendan.
+
+    Retorna:
+    --------
+    tuple
+        (Inventario, Catalogo, lista de nombres de modelo pedidos)
+    """
+    rnd = random.Random(semilla)
+    inventario = Inventario()
+    media = 10 * num_pedidos // num_piezas + 10
+    for i in range(num_piezas):
+        inventario.añadir_pieza(Pieza(f"p{i}", rnd.randint(media, 2 * media)))
+    catalogo = Catalogo()
+    for m in range(num_modelos):
+        for j in rnd.sample(range(num_piezas), piezas_por_modelo):
+            catalogo.añadir_modelo(f"m{m}", Pieza(f"p{j}", rnd.randint(1, 3)))
+    pedidos = [f"m{rnd.randrange(num_modelos)}" for _ in range(num_pedidos)]
+    return inventario, catalogo, pedidos
+
+
+def secuencial(inventario, catalogo, pedidos):
+    """
+    Atiende los pedidos en un solo hilo con Catalogo.realizar_pedido.
+    """
+    for modelo in pedidos:
+        if modelo in catalogo.catalogo:
+            catalogo.realizar_pedido(modelo, inventario)
+
+
+def concurrente(inventario, catalogo, pedidos, hilos):
+    """
+    Reparte los pedidos entre varios hilos que los atienden con PedidosConcurrentes.
+    """
+    procesador = PedidosConcurrentes(catalogo, inventario)
+    trabajos = [threading.Thread(target=lambda parte: [procesador.realizar_pedido(m) for m in parte],
+                                 args=(pedidos[i::hilos],)) for i in range(hilos)]
+    for trabajo in trabajos:
+        trabajo.start()
+    for trabajo in trabajos:
+        trabajo.join()
+
+
+if __name__ == "__main__":
+    """
+    Mide los pedidos por segundo del camino secuencial y de PedidosConcurrentes con distintos números
+    de hilos. Uso: python benchmark_pedidos.py [num_pedidos]
+    """
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"{'caso':<24}{'segundos':>10}{'pedidos/s':>12}")
+    casos = [("secuencial", secuencial, ())] + [(f"{h} hilo(s)", concurrente, (h,)) for h in (1, 2, 4, 8)]
+    for nombre, funcion, args in casos:
+        inventario, catalogo, pedidos = generar(2000, 500, n)
+        with contextlib.redirect_stdout(io.StringIO()):
+            inicio = time.perf_counter()
+            funcion(inventario, catalogo, pedidos, *args)
+            segundos = time.perf_counter() - inicio
+        print(f"{nombre:<24}{segundos:>10.3f}{n / segundos:>12.0f}")
@@ -1,10 +1,46 @@
 #from linked_ordered_positional_list import LinkedOrderedPositionalList as ListaOrdenada
 from array_ordered_positional_list import ArrayOrderedPositionalList as ListaOrdenada
+from lista_saltos import ListaSaltos
 
 class Inventario:
+    """
+    Inventario de piezas. Las piezas se guardan en una lista de saltos ordenada por cantidad, que se
+    usa para mostrar el stock, y en un diccionario de cada nombre de pieza a su posición en la lista,
+    que permite encontrar una pieza en O(1) al procesar los pedidos. Cuando cambia la cantidad de una
+    pieza, solo esa pieza se recoloca en la lista, en O(log n), por lo que el stock está siempre
+    ordenado sin reconstruir la lista.
+
+    Las piezas con la misma cantidad quedan en orden de alta, como en una ordenación estable de la
+    lista por cantidad. Así el orden solo depende de las cantidades y del orden en que se dieron de
+    alta las piezas, y no del orden de los descuentos. Cada nombre de pieza está como mucho una vez.
+
+    Si se asigna un diario (por ejemplo, un AlmacenInventario), cada alta, descuento y baja de
+    pieza se anota en él. Además, a los observadores suscritos (por ejemplo, un Catalogo con
+    unidades construibles en caché) se les avisa del nombre de cada pieza cuya cantidad cambia.
+    """
     
     def __init__(self):
-        self.inventario = ListaOrdenada()
+        self.inventario = ListaSaltos(clave=self._clave)
+        self._indice = dict()
+        self._altas = dict()
+        self._num_altas = 0
+        self.diario = None
+        self._observadores = []
+
+    def suscribir(self, observador):
+        """
+        Suscribe un objeto con un método pieza_cambiada(nombre_pieza), al que se llama cada vez que
+        se añade, descuenta o elimina una pieza.
+        """
+        if observador not in self._observadores:
+            self._observadores.append(observador)
+
+    def _clave(self, pieza):
+        """
+        Clave de orden de una pieza en la lista: su cantidad y, para los empates, su número de alta.
+        """
+        return (pieza.cantidad, self._altas[pieza.nombre_pieza])
+
     def añadir_pieza(self, pieza):
         """
         Añade una pieza al inventario.
@@ -17,8 +53,68 @@ class Inventario:
         Returns:
         
         None.
+
+        Raises:
+
+        ValueError
+            Si ya hay en el inventario una pieza con el mismo nombre.
+        """
+        self._añadir(pieza, self._num_altas)
+        self._num_altas += 1
+        if self.diario is not None:
+            self.diario.pieza_añadida(pieza)
+        for observador in self._observadores:
+            observador.pieza_cambiada(pieza.nombre_pieza)
+
+    def _añadir(self, pieza, alta):
+        """
+        Añade una pieza a la lista y al índice con su número de alta, sin avisos.
+        """
+        if pieza.nombre_pieza in self._indice:
+            raise ValueError(f"pieza {pieza.nombre_pieza} is already in the inventory")
+        self._altas[pieza.nombre_pieza] = alta
+        self._indice[pieza.nombre_pieza] = self.inventario.add(pieza)
+
+    def buscar_pieza(self, nombre_pieza):
+        """
+        Busca una pieza del inventario por su nombre en O(1).
+        
+        Parameters:
+        
+        nombre_pieza : str
+            Nombre de la pieza.
+            
+        Returns:
+        
+        Pieza or None
+            La pieza del inventario, o None si no hay ninguna con ese nombre.
         """
-        self.inventario.add(pieza)
+        position = self._indice.get(nombre_pieza)
+        return None if position is None else self.inventario.get_element(position)
+
+    def descontar(self, pieza, cantidad):
+        """
+        Resta una cantidad a una pieza del inventario y la recoloca en la lista ordenada en O(log n).
+        
+        Parameters:
+        
+        pieza : Pieza
+            Pieza del inventario (la que devuelve buscar_pieza).
+        cantidad : int
+            Cantidad a restar.
+            
+        Returns:
+        
+        int
+            La cantidad que queda de la pieza.
+        """
+        pieza.cantidad -= cantidad
+        self.inventario.reposicionar(self._indice[pieza.nombre_pieza])
+        if self.diario is not None:
+            self.diario.descuento(pieza.nombre_pieza, cantidad)
+        for observador in self._observadores:
+            observador.pieza_cambiada(pieza.nombre_pieza)
+        return pieza.cantidad
    
     def print_inventario(self):
         """
@@ -32,7 +128,7 @@ class Inventario:
         piezas_str = " | ".join([f"{pieza.nombre_pieza}: {pieza.cantidad}" for pieza in self.inventario])
         print(piezas_str + " |")
 
-    def eliminar_pieza(self, pieza, position):
+    def eliminar_pieza(self, pieza, position=None):
         """
         Elimina una pieza del inventario.
         
@@ -40,24 +136,30 @@ class Inventario:
         
         pieza : Pieza
             Objeto Pieza a eliminar del inventario.
+        position : Position, opcional
+            Posición de la pieza en la lista ordenada. Si no se indica, se toma del índice por nombre.
             
         Returns:
         
         None.
         """
-        self.inventario.delete(position)
+        self._quitar(pieza.nombre_pieza, position)
         print(f"Eliminada: Pieza {pieza.nombre_pieza}")
 
-    def reordenar_piezas(self):
-        position = self.inventario.first()
-        lista = []
-        while position != None:
-            pieza = self.inventario.get_element(position)
-            lista.append(pieza)
-            position = self.inventario.after(position)
-        self.inventario = ListaOrdenada()
-        for pieza in lista:
-            self.inventario.add(pieza)
+    def _quitar(self, nombre_pieza, position=None):
+        """
+        Quita una pieza de la lista y del índice, sin mensajes.
+        """
+        if position is None:
+            position = self._indice[nombre_pieza]
+        self.inventario.delete(position)
+        del self._indice[nombre_pieza]
+        del self._altas[nombre_pieza]
+        if self.diario is not None:
+            self.diario.pieza_eliminada(nombre_pieza)
+        for observador in self._observadores:
+            observador.pieza_cambiada(nombre_pieza)
+
 
     
 
@@ -67,9 +169,26 @@ class Inventario:
 
 
 class Catalogo:
+    """
+    Catálogo de modelos con las piezas que necesita cada uno. Además del diccionario de modelos se
+    mantiene un índice inverso de cada nombre de pieza a los modelos que la usan, para que retirar
+    los modelos dependientes de una pieza agotada cueste en proporción a los modelos afectados.
+
+    Como en Inventario, si se asigna un diario se anotan en él las altas y bajas de modelos.
+
+    unidades_construibles() guarda en caché, para cada modelo, cuántas unidades se pueden construir
+    con el stock actual y qué pieza lo limita. El catálogo se suscribe al inventario y, cuando cambia
+    la cantidad de una pieza, el índice inverso da los únicos modelos cuya entrada hay que descartar.
+    """
 
     def __init__(self):
         self.catalogo = dict()
+        self._modelos_por_pieza = dict()
+        self._orden_modelo = dict()
+        self._siguiente_orden = 0
+        self.diario = None
+        self._construibles = dict()
+        self._inventario_construibles = None
 
     def añadir_modelo(self, modelo, pieza):
         """
@@ -88,7 +207,13 @@ class Catalogo:
         """
         if modelo not in self.catalogo:
             self.catalogo[modelo] = ListaOrdenada()
+            self._orden_modelo[modelo] = self._siguiente_orden
+            self._siguiente_orden += 1
         self.catalogo[modelo].add(pieza)
+        self._modelos_por_pieza.setdefault(pieza.nombre_pieza, set()).add(modelo)
+        self._construibles.pop(modelo, None)
+        if self.diario is not None:
+            self.diario.modelo_añadido(modelo, pieza)
     
     def print_catalogo(self):
         """
@@ -143,19 +268,83 @@ class Catalogo:
         bool
             True si todas las piezas están disponibles, False en caso contrario.
         """
-        for pieza in self.catalogo[modelo]:
-            position = inventario.inventario.first()
-            pieza_existente = inventario.inventario.get_element(position)
-            for _ in range(inventario.inventario.__len__()):
-                if pieza_existente.nombre_pieza == pieza.nombre_pieza:
-                    if pieza_existente.cantidad < pieza.cantidad:
-                        return False
-                else:
-                    position = inventario.inventario.after(position)
-                    pieza_existente = inventario.inventario.get_element(position)
+        for nombre, necesidad in self._necesidades(modelo).items():
+            pieza_existente = inventario.buscar_pieza(nombre)
+            if pieza_existente is None or pieza_existente.cantidad < necesidad:
+                return False
         return True
+
+    def _necesidades(self, modelo):
+        """
+        Devuelve la cantidad que necesita un modelo de cada pieza, en el orden en que aparecen sus
+        piezas; si una pieza aparece varias veces en el modelo, cuenta la suma de sus necesidades.
+        """
+        necesidades = dict()
+        for pieza in self.catalogo[modelo]:
+            necesidades[pieza.nombre_pieza] = necesidades.get(pieza.nombre_pieza, 0) + pieza.cantidad
+        return necesidades
     
 
+    def unidades_construibles(self, modelo, inventario):
+        """
+        Devuelve cuántas unidades de un modelo se pueden construir con el stock actual (el mínimo de
+        stock // necesidad entre sus piezas) y la pieza que lo limita. El resultado se guarda en
+        caché hasta que cambia alguna de sus piezas en el inventario.
+        
+        Parameters:
+        
+        modelo : str
+            Nombre del modelo.
+        inventario : Inventario
+            Inventario con el stock. Los cambios de cantidad deben hacerse con sus métodos
+            (descontar, eliminar_pieza...) para que la caché se entere.
+            
+        Returns:
+        
+        tuple or None
+            (unidades, nombre de la pieza limitante), o None si el modelo no está en el catálogo.
+            Si ninguna pieza limita (todas las necesidades son 0), (inf, None).
+        """
+        if inventario is not self._inventario_construibles:
+            self._construibles = dict()
+            self._inventario_construibles = inventario
+            inventario.suscribir(self)
+        resultado = self._construibles.get(modelo)
+        if resultado is None and modelo in self.catalogo:
+            resultado = self._construibles[modelo] = self._calcular_construibles(modelo, inventario)
+        return resultado
+
+    def _calcular_construibles(self, modelo, inventario):
+        """
+        Calcula las unidades construibles de un modelo con la suma de necesidades de cada pieza.
+        """
+        unidades, limitante = float("inf"), None
+        for nombre, necesidad in self._necesidades(modelo).items():
+            pieza = inventario.buscar_pieza(nombre)
+            if pieza is None:
+                return 0, nombre
+            if necesidad > 0 and pieza.cantidad // necesidad < unidades:
+                unidades, limitante = max(pieza.cantidad // necesidad, 0), nombre
+        return unidades, limitante
+
+    def disponibilidad(self, inventario):
+        """
+        Devuelve las unidades construibles de todos los modelos del catálogo, usando la caché.
+        
+        Returns:
+        
+        dict
+            Para cada modelo, en el orden del catálogo, la tupla de unidades_construibles.
+        """
+        return {modelo: self.unidades_construibles(modelo, inventario) for modelo in self.catalogo}
+
+    def pieza_cambiada(self, nombre_pieza):
+        """
+        Descarta de la caché de unidades construibles los modelos que usan la pieza indicada.
+        """
+        for modelo in self._modelos_por_pieza.get(nombre_pieza, ()):
+            self._construibles.pop(modelo, None)
+
     def eliminar_modelo(self, modelo):
         """
         Elimina un modelo del catálogo.
@@ -166,19 +355,33 @@ class Catalogo:
             Nombre del modelo a eliminar
         """
         if modelo in self.catalogo:
+            for pieza in self.catalogo[modelo]:
+                modelos = self._modelos_por_pieza.get(pieza.nombre_pieza)
+                if modelos is not None:
+                    modelos.discard(modelo)
+                    if not modelos:
+                        del self._modelos_por_pieza[pieza.nombre_pieza]
             del self.catalogo[modelo]
+            del self._orden_modelo[modelo]
+            self._construibles.pop(modelo, None)
+            if self.diario is not None:
+                self.diario.modelo_eliminado(modelo)
     
     def revision_modelos(self, pieza):
-        lista = []
-        for modelo, piezas in self.catalogo.items():
-            position = piezas.first()
-            pieza_existente = piezas.get_element(position)
-            for _ in range(piezas.__len__()):
-                if pieza_existente.nombre_pieza == pieza.nombre_pieza:
-                    lista.append(modelo)
-                else:
-                    position = piezas.after(position)
-                    pieza_existente = piezas.get_element(position)
+        """
+        Elimina del catálogo todos los modelos que usan una pieza, en el orden en que aparecen en el
+        catálogo. Los modelos se obtienen del índice inverso, sin recorrer el catálogo.
+        
+        Parameters:
+       
+        pieza : Pieza
+            Pieza agotada.
+            
+        Returns:
+        
+        bool
+        """
+        lista = sorted(self._modelos_por_pieza.get(pieza.nombre_pieza, ()), key=self._orden_modelo.__getitem__)
         for modelo in lista:
             self.eliminar_modelo(modelo)
             print(f"Eliminado: Modelo {modelo} dependiente.")
@@ -200,23 +403,19 @@ class Catalogo:
         None.
         """
         print(f"Pedido {modelo} NO atendido. Faltan:")
-        for pieza in self.catalogo[modelo]:
-            position = inventario.inventario.first()
-            pieza_existente = inventario.inventario.get_element(position)
-            for _ in range(inventario.inventario.__len__()):
-                if pieza_existente.nombre_pieza == pieza.nombre_pieza:
-                    if pieza_existente.cantidad < pieza.cantidad:
-                        print(f"{pieza.nombre_pieza} - {pieza.cantidad - pieza_existente.cantidad}")
-                else:
-                    position = inventario.inventario.after(position)
-                    pieza_existente = inventario.inventario.get_element(position)
+        for nombre, necesidad in self._necesidades(modelo).items():
+            pieza_existente = inventario.buscar_pieza(nombre)
+            cantidad_existente = pieza_existente.cantidad if pieza_existente is not None else 0
+            if cantidad_existente < necesidad:
+                print(f"{nombre} - {necesidad - cantidad_existente}")
         self.eliminar_modelo(modelo)
         print(f"Eliminado: {modelo}")
 
     
     def realizar_pedido(self, modelo, inventario):
         """
-        Realiza un pedido de un modelo en el catálogo.
+        Realiza un pedido de un modelo en el catálogo. Si una pieza aparece varias veces en el
+        modelo, se comprueba y se descuenta de una vez la suma de sus necesidades.
         
         Parameters:
         
@@ -231,20 +430,11 @@ class Catalogo:
         """
         if self.comprobar_piezas(modelo, inventario):
             print(f"Pedido atendido. Modelo {modelo} disponible.")
-            for pieza in self.catalogo[modelo]:
-                position = inventario.inventario.first()
-                pieza_existente = inventario.inventario.get_element(position)
-                for _ in range(inventario.inventario.__len__()):
-                    if pieza_existente.nombre_pieza == pieza.nombre_pieza:
-                        pieza_existente.cantidad -= pieza.cantidad
-                        if pieza_existente.cantidad == 0:
-                            inventario.eliminar_pieza(pieza,position)
-                            self.revision_modelos(pieza)
-                        break
-
-                    else:
-                        position = inventario.inventario.after(position)
-                        pieza_existente = inventario.inventario.get_element(position)
+            for nombre, necesidad in self._necesidades(modelo).items():
+                pieza_existente = inventario.buscar_pieza(nombre)
+                if inventario.descontar(pieza_existente, necesidad) == 0:
+                    inventario.eliminar_pieza(pieza_existente)
+                    self.revision_modelos(pieza_existente)
         else:
             self.gestion_excasez_piezas(modelo, inventario)
             
@@ -0,0 +1,108 @@
+import contextlib
+import sys
+
+from inventario import Pieza
+
+TAM_BLOQUE = 1 << 16
+
+@contextlib.contextmanager
+def _abrir(origen):
+    """
+    Abre el origen de datos: "-" es la entrada estándar, una cadena es la ruta de un archivo o de una
+    tubería con nombre, y cualquier otro objeto se toma como un archivo de texto ya abierto. Solo se
+    cierra lo que se abre aquí.
+    """
+    if origen == "-":
+        yield sys.stdin
+    elif isinstance(origen, str):
+        with open(origen, encoding="utf-8") as f:
+            yield f
+    else:
+        yield origen
+
+
+def leer_lotes(origen, num_campos, tam_bloque=TAM_BLOQUE):
+    """
+    Generador que lee un archivo de campos separados por comas en bloques de líneas de
+    aproximadamente tam_bloque bytes y devuelve cada bloque ya separado en campos. Solo hay un bloque
+    en memoria a la vez, y el primero se devuelve sin esperar a que termine la entrada, por lo que
+    sirve para la entrada estándar o una tubería con nombre.
+
+    Parámetros:
+    -----------
+    origen : str or file
+        Ruta, "-" para la entrada estándar, o archivo de texto abierto.
+    num_campos : int
+        Número de campos de cada línea.
+    tam_bloque : int
+        Tamaño aproximado en bytes de cada bloque leído.
+
+    Retorna:
+    --------
+    generator
+        Listas de líneas separadas en sus num_campos primeros campos; las líneas en blanco se saltan.
+
+    Excepciones:
+    ------------
+    ValueError
+        Si alguna línea tiene menos de num_campos campos.
+    """
+    if not isinstance(tam_bloque, int) or tam_bloque <= 0:
+        raise ValueError("tam_bloque must be a positive integer")
+    num_linea = 1
+    with _abrir(origen) as f:
+        while True:
+            lineas = f.readlines(tam_bloque)
+            if not lineas:
+                break
+            lote = []
+            for i, linea in enumerate(lineas, num_linea):
+                linea = linea.strip()
+                if not linea:
+                    continue
+                campos = linea.split(",")
+                if len(campos) < num_campos:
+                    raise ValueError(f"line {i} must have {num_campos} comma-separated fields")
+                lote.append(campos if len(campos) == num_campos else campos[:num_campos])
+            num_linea += len(lineas)
+            if lote:
+                yield lote
+
+
+def leer_pedidos(origen, tam_bloque=TAM_BLOQUE):
+    """
+    Lee un archivo de pedidos (cliente,modelo) por bloques.
+
+    Retorna:
+    --------
+    generator
+        Listas de tuplas (cliente, modelo).
+    """
+    for lote in leer_lotes(origen, 2, tam_bloque):
+        yield [(cliente, modelo) for cliente, modelo in lote]
+
+
+def leer_piezas(origen, tam_bloque=TAM_BLOQUE):
+    """
+    Lee un archivo de piezas (pieza,cantidad) por bloques.
+
+    Retorna:
+    --------
+    generator
+        Listas de Pieza.
+    """
+    for lote in leer_lotes(origen, 2, tam_bloque):
+        yield [Pieza(nombre, int(cantidad)) for nombre, cantidad in lote]
+
+
+def leer_modelos(origen, tam_bloque=TAM_BLOQUE):
+    """
+    Lee un archivo de modelos (modelo,pieza,cantidad) por bloques.
+
+    Retorna:
+    --------
+    generator
+        Listas de tuplas (modelo, Pieza).
+    """
+    for lote in leer_lotes(origen, 3, tam_bloque):
+        yield [(modelo, Pieza(nombre, int(cantidad))) for modelo, nombre, cantidad in lote]
@@ -0,0 +1,177 @@
+import random
+
+class _Nodo:
+    """
+    Nodo de la lista de saltos: un elemento, la clave por la que está ordenado y, por cada nivel en
+    el que aparece, el nodo siguiente y el anterior. Los nodos son las posiciones que devuelve
+    ListaSaltos.
+    """
+
+    __slots__ = ("elemento", "clave", "siguientes", "anteriores")
+
+    def __init__(self, elemento, niveles):
+        self.elemento = elemento
+        self.clave = None
+        self.siguientes = [None] * niveles
+        self.anteriores = [None] * niveles
+
+
+class ListaSaltos:
+    """
+    Lista posicional ordenada sobre una lista de saltos (skip list), con la misma interfaz que
+    ListaOrdenada (add, delete, first, after, get_element, len, iter). Los elementos se ordenan con
+    sus operadores de comparación, o por la clave que devuelve la función clave si se indica; como
+    en ListaOrdenada, un elemento nuevo se coloca delante de los iguales a él, de modo que solo hace
+    falta que las claves definan el operador >.
+
+    Insertar cuesta O(log n) esperado. Cada nodo está enlazado en ambos sentidos en todos sus niveles,
+    por lo que borrar una posición cuesta O(1) esperado sin buscarla, y reposicionar un elemento cuya
+    clave ha cambiado (borrarlo y volver a insertarlo) cuesta O(log n) esperado en lugar de rehacer
+    la lista.
+
+    Métodos
+    -------
+    add(e):
+        Inserta un elemento en su lugar y devuelve su posición.
+    delete(p):
+        Elimina la posición p y devuelve su elemento.
+    reposicionar(p):
+        Recoloca la posición p tras cambiar la clave de su elemento.
+    first(), after(p), get_element(p):
+        Recorrido posicional, como en ListaOrdenada.
+    """
+
+    MAX_NIVELES = 32
+
+    def __init__(self, semilla=None, clave=None):
+        """
+        Parámetros:
+        -----------
+        semilla : int or None
+            Semilla del generador aleatorio de niveles.
+        clave : callable or None
+            Función que da la clave de orden de un elemento; por defecto, el propio elemento. Se
+            evalúa al insertar y al reposicionar.
+        """
+        self._clave = clave if clave is not None else (lambda e: e)
+        self._cabecera = _Nodo(None, self.MAX_NIVELES)
+        self._niveles = 1
+        self._size = 0
+        self._rnd = random.Random(semilla)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        nodo = self._cabecera.siguientes[0]
+        while nodo is not None:
+            yield nodo.elemento
+            nodo = nodo.siguientes[0]
+
+    def is_empty(self):
+        return self._size == 0
+
+    def first(self):
+        return self._cabecera.siguientes[0]
+
+    def after(self, p):
+        return p.siguientes[0]
+
+    def get_element(self, p):
+        return p.elemento
+
+    def _nivel_aleatorio(self):
+        """
+        Número de niveles de un nodo nuevo: cada nivel adicional con probabilidad 1/2.
+        """
+        bits = self._rnd.getrandbits(self.MAX_NIVELES - 1)
+        niveles = 1
+        while bits & 1:
+            niveles += 1
+            bits >>= 1
+        return niveles
+
+    def _enlazar(self, nodo):
+        """
+        Enlaza un nodo en su lugar, delante del primer elemento que no es menor que el suyo.
+        """
+        c = nodo.clave = self._clave(nodo.elemento)
+        niveles = len(nodo.siguientes)
+        if niveles > self._niveles:
+            self._niveles = niveles
+        actual = self._cabecera
+        for nivel in range(self._niveles - 1, -1, -1):
+            siguiente = actual.siguientes[nivel]
+            while siguiente is not None and c > siguiente.clave:
+                actual = siguiente
+                siguiente = actual.siguientes[nivel]
+            if nivel < niveles:
+                nodo.siguientes[nivel] = siguiente
+                nodo.anteriores[nivel] = actual
+                actual.siguientes[nivel] = nodo
+                if siguiente is not None:
+                    siguiente.anteriores[nivel] = nodo
+
+    def _desenlazar(self, nodo):
+        """
+        Saca un nodo de todos sus niveles sin recorrer la lista.
+        """
+        for nivel in range(len(nodo.siguientes)):
+            anterior, siguiente = nodo.anteriores[nivel], nodo.siguientes[nivel]
+            anterior.siguientes[nivel] = siguiente
+            if siguiente is not None:
+                siguiente.anteriores[nivel] = anterior
+        while self._niveles > 1 and self._cabecera.siguientes[self._niveles - 1] is None:
+            self._niveles -= 1
+
+    def add(self, e):
+        """
+        Inserta un elemento en su lugar según el orden.
+
+        Parámetros:
+        -----------
+        e : object
+            Elemento comparable con los de la lista.
+
+        Retorna:
+        --------
+        Position
+            La posición del elemento insertado.
+        """
+        nodo = _Nodo(e, self._nivel_aleatorio())
+        self._enlazar(nodo)
+        self._size += 1
+        return nodo
+
+    def delete(self, p):
+        """
+        Elimina la posición p.
+
+        Parámetros:
+        -----------
+        p : Position
+            Posición devuelta por add, first o after.
+
+        Retorna:
+        --------
+        object
+            El elemento eliminado.
+        """
+        self._desenlazar(p)
+        self._size -= 1
+        elemento = p.elemento
+        p.elemento = p.clave = None
+        return elemento
+
+    def reposicionar(self, p):
+        """
+        Recoloca la posición p en su lugar después de que haya cambiado la clave de su elemento. La
+        posición sigue siendo válida.
+
+        Parámetros:
+        -----------
+        p : Position
+            Posición cuyo elemento ha cambiado.
+        """
+        self._desenlazar(p)
+        self._enlazar(p)
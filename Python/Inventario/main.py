@@ -1,7 +1,12 @@
+import sys
+
 #from linked_ordered_positional_list import LinkedOrderedPositionalList as ListaOrdenada
 from array_ordered_positional_list import ArrayOrderedPositionalList as ListaOrdenada
 from inventario import Pieza
 from catalogo import Inventario, Catalogo
+from procesador_lotes import ProcesadorLotes
+from lectura import leer_pedidos, leer_piezas, leer_modelos
+from almacen_inventario import AlmacenInventario
 
 def read_orders(catalogo, inventario, path="pedidos.txt"):
     """
@@ -14,18 +19,36 @@ def read_orders(catalogo, inventario, path="pedidos.txt"):
         Objeto que contiene los modelos disponibles.
     inventario : Inventario
         Objeto que gestiona las piezas disponibles.
-    path : str, opcional
-        Ruta al archivo de pedidos, por defecto "pedidos.txt".
+    path : str or file, opcional
+        Ruta al archivo de pedidos, por defecto "pedidos.txt". Puede ser una tubería con nombre,
+        "-" para la entrada estándar o un archivo abierto; se lee por bloques.
     """
-    with open(path, encoding="utf-8") as f:
-        for l in f.readlines():
-            ls = l.strip().split(",")
-            customer, model_name = ls[0], ls[1]
+    for lote in leer_pedidos(path):
+        for customer, model_name in lote:
             print(f"Nuevo pedido: {model_name} - {customer}")
             disponible = catalogo.buscar_modelo(model_name)
             if disponible:
                 catalogo.realizar_pedido(model_name, inventario)
-        inventario.reordenar_piezas()
+
+def read_orders_por_lotes(catalogo, inventario, path="pedidos.txt", tam_bloque=1024):
+    """
+    Lee un archivo de pedidos y lo procesa por bloques con ProcesadorLotes. El resultado es el
+    mismo que con read_orders.
+
+    Parámetros:
+    
+    catalogo : Catalogo
+        Objeto que contiene los modelos disponibles.
+    inventario : Inventario
+        Objeto que gestiona las piezas disponibles.
+    path : str or file, opcional
+        Como en read_orders. Cada bloque leído se procesa antes de leer el siguiente.
+    tam_bloque : int, opcional
+        Número máximo de pedidos que se comprueban juntos.
+    """
+    procesador = ProcesadorLotes(catalogo, inventario, tam_bloque)
+    for lote in leer_pedidos(path):
+        procesador.procesar(lote)
 
 def read_parts(path="piezas.txt"):
     """
@@ -33,8 +56,9 @@ def read_parts(path="piezas.txt"):
 
     Parámetros:
     
-    path : str, opcional
-        Si no se introduce ningún texto se leerá el archivo modelos.txt .
+    path : str or file, opcional
+        Si no se introduce ningún texto se leerá el archivo piezas.txt . Como en read_orders,
+        admite tuberías con nombre y "-" para la entrada estándar.
 
     Returns:
     
@@ -42,13 +66,10 @@ def read_parts(path="piezas.txt"):
         Objeto con las piezas leídas del archivo.
     """
     inventario = Inventario()
-    with open(path, encoding="utf-8") as f:
-        for l in f.readlines():
-            ls = l.strip().split(",")
-            part_name, qty = ls[0], int(ls[1])
-            pieza = Pieza(part_name, qty)
+    for lote in leer_piezas(path):
+        for pieza in lote:
             inventario.añadir_pieza(pieza)
-        return inventario 
+    return inventario
 
 def read_models(path="modelos.txt"):
     """
@@ -57,33 +78,69 @@ def read_models(path="modelos.txt"):
 
     Parámetros:
     
-    path : str, opcional
-        Si no se introduce ningún texto se leerá el archivo modelos.txt .
+    path : str or file, opcional
+        Si no se introduce ningún texto se leerá el archivo modelos.txt . Como en read_orders,
+        admite tuberías con nombre y "-" para la entrada estándar.
 
     Returns:
     
     Catalogo
         Contiene los modelos y sus piezas asociadas leídas del archivo.
     """
-    with open(path, encoding="utf-8") as f:
-        catalogo = Catalogo()
-        for l in f.readlines():
-            ls = l.strip().split(",")
-            model_name, part_name, qty = ls[0], ls[1], int(ls[2])
-            pieza = Pieza(part_name, qty)
+    catalogo = Catalogo()
+    for lote in leer_modelos(path):
+        for model_name, pieza in lote:
             # Añadir al catálogo el modelo y la pieza
             catalogo.añadir_modelo(model_name, pieza)
-        return catalogo
+    return catalogo
+
+def open_store(directorio, parts_path="piezas.txt", models_path="modelos.txt"):
+    """
+    Abre el almacén persistente del directorio indicado. Si está vacío, lo crea a partir de los
+    archivos de piezas y modelos; si no, el inventario y el catálogo se cargan de la instantánea y
+    del diario, con los cambios de ejecuciones anteriores.
+
+    Parámetros:
+    
+    directorio : str
+        Directorio del almacén.
+    parts_path, models_path : str, opcional
+        Archivos de piezas y modelos, como en read_parts y read_models.
+
+    Returns:
+    
+    tuple
+        (AlmacenInventario, Inventario, Catalogo), con el almacén como diario de ambos.
+    """
+    almacen = AlmacenInventario(directorio)
+    if not almacen.vacio():
+        inventario, catalogo = almacen.cargar()
+        return almacen, inventario, catalogo
+    inventario = read_parts(parts_path)
+    catalogo = read_models(models_path)
+    almacen.snapshot(inventario, catalogo)
+    inventario.diario = almacen
+    catalogo.diario = almacen
+    return almacen, inventario, catalogo
 
 			
 if __name__ == "__main__":
-    inventario = read_parts()
+    # Uso: python main.py [piezas] [modelos] [pedidos] [almacen]; "-" lee ese archivo de la entrada
+    # estándar. Con un directorio de almacén, el stock se conserva entre ejecuciones.
+    rutas = sys.argv[1:4] + ["piezas.txt", "modelos.txt", "pedidos.txt"][len(sys.argv[1:4]):]
+    almacen = None
+    if len(sys.argv) > 4:
+        almacen, inventario, catalogo = open_store(sys.argv[4], rutas[0], rutas[1])
+    else:
+        inventario = read_parts(rutas[0])
+        catalogo = read_models(rutas[1])
     inventario.print_inventario()
-    catalogo = read_models()
     catalogo.print_catalogo() 
-    read_orders(catalogo,inventario)
+    read_orders(catalogo,inventario,rutas[2])
     inventario.print_inventario()
     catalogo.print_catalogo()
+    if almacen is not None:
+        almacen.close()
     
 
             
\ No newline at end of file
@@ -0,0 +1,101 @@
+import threading
+
+class PedidosConcurrentes:
+    """
+    Atiende pedidos de varios hilos a la vez sobre un mismo Inventario y Catalogo.
+
+    El stock de cada pieza es el de su Pieza en el inventario; no hay otra copia. Cada pieza pertenece
+    a una de 'franjas' franjas según su nombre, y cada franja tiene su propio cerrojo, que protege la
+    cantidad de sus piezas. Un pedido toma los cerrojos de las franjas de sus piezas siempre en orden
+    creciente, de modo que dos pedidos no pueden bloquearse mutuamente, y los mantiene desde que
+    comprueba el stock hasta que lo descuenta: ningún otro pedido puede cambiar ni agotar esas piezas
+    entremedias, y los pedidos sin piezas en común comprueban su stock sin esperarse.
+
+    La lista ordenada del inventario, su índice por nombre y el catálogo (con su caché de unidades
+    construibles, que el inventario invalida al avisar a sus observadores) son comunes a todas las
+    piezas, así que los descuentos, las bajas de piezas y las de modelos se hacen bajo un único
+    cerrojo compartido. Con el GIL de CPython esto no da más pedidos por segundo que atenderlos en un
+    solo hilo; lo que garantiza es que el resultado es el de algún orden secuencial de los pedidos.
+    Mientras se usa esta clase, los cambios del inventario y del catálogo deben pasar todos por ella.
+
+    Métodos
+    -------
+    realizar_pedido(modelo):
+        Atiende un pedido de un modelo.
+    print_inventario():
+        Imprime el inventario.
+    """
+
+    def __init__(self, catalogo, inventario, franjas=64):
+        """
+        Parámetros:
+        -----------
+        catalogo : Catalogo
+            Catálogo de modelos.
+        inventario : Inventario
+            Inventario de piezas.
+        franjas : int
+            Número de cerrojos entre los que se reparten las piezas.
+        """
+        if not isinstance(franjas, int) or franjas <= 0:
+            raise ValueError("franjas must be a positive integer")
+        self.catalogo = catalogo
+        self.inventario = inventario
+        self._cerrojos = [threading.Lock() for _ in range(franjas)]
+        self._cerrojo_compartido = threading.Lock()
+
+    def _franjas(self, nombres):
+        """
+        Índices de las franjas de las piezas indicadas, sin repetir y en orden creciente.
+        """
+        n = len(self._cerrojos)
+        return sorted({hash(nombre) % n for nombre in nombres})
+
+    def realizar_pedido(self, modelo):
+        """
+        Atiende un pedido de un modelo como Catalogo.realizar_pedido: si hay stock de todas sus
+        piezas (sumando las necesidades de las piezas repetidas) las descuenta, retira las piezas
+        agotadas y los modelos que dependen de ellas; si no, retira el modelo del catálogo.
+
+        Parámetros:
+        -----------
+        modelo : str
+            Nombre del modelo.
+
+        Retorna:
+        --------
+        bool
+            True si el pedido se ha atendido.
+        """
+        with self._cerrojo_compartido:
+            if modelo not in self.catalogo.catalogo:
+                return False
+            necesidades = self.catalogo._necesidades(modelo)
+        franjas = self._franjas(necesidades)
+        for i in franjas:
+            self._cerrojos[i].acquire()
+        try:
+            # Las piezas de las franjas tomadas solo las cambia o las quita quien tiene su cerrojo.
+            piezas = [(self.inventario.buscar_pieza(nombre), cantidad) for nombre, cantidad in necesidades.items()]
+            hay_stock = all(pieza is not None and pieza.cantidad >= cantidad for pieza, cantidad in piezas)
+            with self._cerrojo_compartido:
+                if modelo not in self.catalogo.catalogo:
+                    return False
+                if not hay_stock:
+                    self.catalogo.eliminar_modelo(modelo)
+                    return False
+                for pieza, cantidad in piezas:
+                    if self.inventario.descontar(pieza, cantidad) == 0:
+                        self.inventario.eliminar_pieza(pieza)
+                        self.catalogo.revision_modelos(pieza)
+            return True
+        finally:
+            for i in reversed(franjas):
+                self._cerrojos[i].release()
+
+    def print_inventario(self):
+        """
+        Imprime el inventario sin que ningún pedido lo modifique a la vez.
+        """
+        with self._cerrojo_compartido:
+            self.inventario.print_inventario()
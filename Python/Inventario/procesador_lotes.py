@@ -0,0 +1,226 @@
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class ProcesadorLotes:
+    """
+    Procesa pedidos por bloques con el mismo resultado (salida, stock, orden del stock y catálogo) que
+    procesarlos uno a uno con buscar_modelo y realizar_pedido.
+
+    El catálogo se codifica como una matriz dispersa modelo x pieza (en formato CSR: inicio de la fila
+    de cada modelo, columnas y necesidades) y el inventario como un vector de stock. Para un bloque de
+    pedidos se calcula de una vez la demanda acumulada de cada pieza pedido a pedido y se busca el
+    primer pedido que deja alguna pieza a 0 o por debajo. Todos los anteriores son servibles y no
+    cambian el catálogo, así que se confirman juntos; ese pedido, que puede fallar o agotar piezas y
+    retirar modelos en cascada, se procesa por el camino secuencial, y el bloque sigue desde el
+    siguiente.
+
+    Con NumPy el cálculo del bloque es vectorial; sin NumPy se hace el mismo cálculo en Python.
+
+    Métodos
+    -------
+    procesar(pedidos):
+        Procesa una secuencia de pedidos (cliente, modelo) en orden.
+    """
+
+    def __init__(self, catalogo, inventario, tam_bloque=1024):
+        """
+        Parámetros:
+        -----------
+        catalogo : Catalogo
+            Catálogo de modelos.
+        inventario : Inventario
+            Inventario de piezas.
+        tam_bloque : int
+            Número máximo de pedidos que se comprueban juntos.
+        """
+        if not isinstance(tam_bloque, int) or tam_bloque <= 0:
+            raise ValueError("tam_bloque must be a positive integer")
+        self.catalogo = catalogo
+        self.inventario = inventario
+        self.tam_bloque = tam_bloque
+        self._codificar()
+
+    def _codificar(self):
+        """
+        Construye la matriz de necesidades, el vector de stock y los textos que imprime cada modelo.
+        """
+        self._indice_modelo = dict()
+        self._indice_pieza = dict()
+        self._nombres_pieza = []
+        self._textos = []
+        inicio, columnas, necesidades = [0], [], []
+        for modelo, piezas in self.catalogo.catalogo.items():
+            self._indice_modelo[modelo] = len(self._textos)
+            lineas = [f"<{modelo}>\n"]
+            for pieza in piezas:
+                j = self._indice_pieza.get(pieza.nombre_pieza)
+                if j is None:
+                    j = self._indice_pieza[pieza.nombre_pieza] = len(self._nombres_pieza)
+                    self._nombres_pieza.append(pieza.nombre_pieza)
+                columnas.append(j)
+                necesidades.append(pieza.cantidad)
+                lineas.append(f"{pieza.nombre_pieza} - {pieza.cantidad}\n")
+            lineas.append(f"\n\nPedido atendido. Modelo {modelo} disponible.\n")
+            self._textos.append("".join(lineas))
+            inicio.append(len(columnas))
+        self._piezas = [self.inventario.buscar_pieza(nombre) for nombre in self._nombres_pieza]
+        stock = [0 if pieza is None else pieza.cantidad for pieza in self._piezas]
+        if np is not None:
+            self._inicio = np.array(inicio, dtype=np.int64)
+            self._columnas = np.array(columnas, dtype=np.int64)
+            self._necesidades = np.array(necesidades, dtype=np.int64)
+            self._stock = np.array(stock, dtype=np.int64)
+        else:
+            self._inicio, self._columnas, self._necesidades = inicio, columnas, necesidades
+            self._stock = stock
+
+    def procesar(self, pedidos):
+        """
+        Procesa los pedidos en orden, imprimiendo lo mismo que read_orders.
+
+        Parámetros:
+        -----------
+        pedidos : sequence
+            Tuplas (cliente, modelo).
+        """
+        i = 0
+        while i < len(pedidos):
+            bloque = pedidos[i:i + self.tam_bloque]
+            modelos = self._modelos_bloque(bloque)
+            if np is not None:
+                servibles, entradas = self._servibles_numpy(modelos)
+                demanda = self._demanda_numpy(entradas, servibles)
+            else:
+                servibles = self._servibles_python(modelos)
+                demanda = self._demanda_python(modelos[:servibles])
+            self._confirmar(bloque[:servibles], modelos[:servibles], demanda)
+            i += servibles
+            if servibles < len(bloque):
+                self._secuencial(*pedidos[i])
+                i += 1
+
+    def _modelos_bloque(self, bloque):
+        """
+        Índice de modelo de cada pedido del bloque, o -1 si el modelo no está en el catálogo.
+        """
+        catalogo = self.catalogo.catalogo
+        modelos = []
+        for _, modelo in bloque:
+            if modelo not in catalogo:
+                modelos.append(-1)
+                continue
+            if modelo not in self._indice_modelo:
+                self._codificar()
+            modelos.append(self._indice_modelo[modelo])
+        return modelos
+
+    def _servibles_python(self, modelos):
+        """
+        Número de pedidos del principio del bloque que se pueden servir sin agotar ninguna pieza.
+        """
+        inicio, columnas, necesidades, stock = self._inicio, self._columnas, self._necesidades, self._stock
+        demanda = dict()
+        for t, m in enumerate(modelos):
+            if m < 0:
+                continue
+            for e in range(inicio[m], inicio[m + 1]):
+                j = columnas[e]
+                d = demanda.get(j, 0) + necesidades[e]
+                if stock[j] - d <= 0:
+                    return t
+                demanda[j] = d
+        return len(modelos)
+
+    def _servibles_numpy(self, modelos):
+        """
+        Como _servibles_python, con la demanda acumulada de todo el bloque calculada con NumPy.
+        Devuelve también las entradas (pedido, pieza, necesidad) del bloque.
+        """
+        limite = len(modelos)
+        m = np.array(modelos, dtype=np.int64)
+        validos = m >= 0
+        filas = np.where(validos, m, 0)
+        largos = np.where(validos, self._inicio[filas + 1] - self._inicio[filas], 0)
+        total = int(largos.sum())
+        if total == 0:
+            return limite, None
+        # Entradas (pedido, pieza, necesidad) del bloque en el orden en que se procesan.
+        pedido = np.repeat(np.arange(limite), largos)
+        desplazamiento = np.repeat(self._inicio[filas] - (np.cumsum(largos) - largos), largos)
+        entradas = desplazamiento + np.arange(total)
+        piezas = self._columnas[entradas]
+        necesidades = self._necesidades[entradas]
+        # Demanda acumulada de cada pieza: suma acumulada sobre las entradas agrupadas por pieza.
+        orden = np.argsort(piezas, kind="stable")
+        piezas_ord = piezas[orden]
+        necesidades_ord = necesidades[orden]
+        acumulado = np.cumsum(necesidades_ord)
+        grupos = np.flatnonzero(np.r_[True, piezas_ord[1:] != piezas_ord[:-1]])
+        base = np.repeat(acumulado[grupos] - necesidades_ord[grupos], np.diff(np.r_[grupos, total]))
+        agotan = pedido[orden][self._stock[piezas_ord] - (acumulado - base) <= 0]
+        return (int(agotan.min()) if agotan.size else limite), (pedido, piezas, necesidades)
+
+    def _demanda_python(self, modelos):
+        """
+        Demanda total de cada pieza en los pedidos indicados, como lista de pares (pieza, demanda)
+        en orden de último descuento.
+        """
+        inicio, columnas, necesidades = self._inicio, self._columnas, self._necesidades
+        demanda = dict()
+        for m in modelos:
+            if m >= 0:
+                for e in range(inicio[m], inicio[m + 1]):
+                    # Se saca y se vuelve a meter para que el diccionario quede en orden de último descuento.
+                    demanda[columnas[e]] = demanda.pop(columnas[e], 0) + necesidades[e]
+        return list(demanda.items())
+
+    def _demanda_numpy(self, entradas, servibles):
+        """
+        Como _demanda_python, a partir de las entradas del bloque que devuelve _servibles_numpy.
+        """
+        if entradas is None:
+            return []
+        pedido, piezas, necesidades = entradas
+        n = int(np.searchsorted(pedido, servibles))
+        piezas, inversa = np.unique(piezas[:n], return_inverse=True)
+        demanda = np.zeros(len(piezas), dtype=np.int64)
+        np.add.at(demanda, inversa, necesidades[:n])
+        ultimo = np.zeros(len(piezas), dtype=np.int64)
+        np.maximum.at(ultimo, inversa, np.arange(n))
+        orden = np.argsort(ultimo)
+        return list(zip(piezas[orden].tolist(), demanda[orden].tolist()))
+
+    def _confirmar(self, bloque, modelos, demanda):
+        """
+        Sirve los pedidos de un bloque que no agota ninguna pieza: imprime su salida y descuenta el
+        stock. Cada pieza se recoloca una sola vez; como el orden del inventario solo depende de las
+        cantidades, queda igual que con los descuentos uno a uno.
+        """
+        salida = []
+        for (cliente, modelo), m in zip(bloque, modelos):
+            salida.append(f"Nuevo pedido: {modelo} - {cliente}\n")
+            if m < 0:
+                salida.append(f"Pedido NO atendido. Modelo {modelo} fuera de catálogo.\n")
+            else:
+                salida.append(self._textos[m])
+        sys.stdout.write("".join(salida))
+        for j, d in demanda:
+            self.inventario.descontar(self._piezas[j], d)
+            self._stock[j] -= d
+
+    def _secuencial(self, cliente, modelo):
+        """
+        Procesa un pedido por el camino secuencial de read_orders y actualiza el stock de sus piezas.
+        """
+        print(f"Nuevo pedido: {modelo} - {cliente}")
+        if self.catalogo.buscar_modelo(modelo):
+            m = self._indice_modelo[modelo]
+            self.catalogo.realizar_pedido(modelo, self.inventario)
+            for e in range(self._inicio[m], self._inicio[m + 1]):
+                j = int(self._columnas[e])
+                pieza = self._piezas[j] = self.inventario.buscar_pieza(self._nombres_pieza[j])
+                self._stock[j] = 0 if pieza is None else pieza.cantidad
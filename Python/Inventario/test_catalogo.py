@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+pytest.importorskip("array_ordered_positional_list")
+
+from inventario import Pieza
+from catalogo import Inventario, Catalogo
+
+
+@pytest.mark.parametrize("semilla", range(20))
+def test_stock_en_orden_estable_por_cantidad(semilla):
+    rnd = random.Random(semilla)
+    inventario = Inventario()
+    referencia = []
+    for i in range(rnd.randint(1, 60)):
+        if referencia and rnd.random() < 0.5:
+            entrada = rnd.choice(referencia)
+            cantidad = rnd.randint(0, entrada[1])
+            inventario.descontar(inventario.buscar_pieza(entrada[0]), cantidad)
+            entrada[1] -= cantidad
+        else:
+            referencia.append([f"p{i}", rnd.randint(0, 8)])
+            inventario.añadir_pieza(Pieza(*referencia[-1]))
+        esperado = [tuple(entrada) for entrada in sorted(referencia, key=lambda entrada: entrada[1])]
+        assert [(pieza.nombre_pieza, pieza.cantidad) for pieza in inventario.inventario] == esperado
+
+
+def test_pieza_repetida():
+    inventario = Inventario()
+    inventario.añadir_pieza(Pieza("tornillo", 3))
+    with pytest.raises(ValueError):
+        inventario.añadir_pieza(Pieza("tornillo", 5))
+    assert [(pieza.nombre_pieza, pieza.cantidad) for pieza in inventario.inventario] == [("tornillo", 3)]
+    assert len(inventario._indice) == len(inventario.inventario) == 1
+
+
+def _pedido(piezas_modelo):
+    inventario = Inventario()
+    inventario.añadir_pieza(Pieza("tornillo", 2))
+    inventario.añadir_pieza(Pieza("rueda", 5))
+    catalogo = Catalogo()
+    for nombre, cantidad in piezas_modelo:
+        catalogo.añadir_modelo("bici", Pieza(nombre, cantidad))
+    catalogo.realizar_pedido("bici", inventario)
+    return inventario, catalogo
+
+
+def test_pedido_agota_pieza_repetida(capsys):
+    inventario, catalogo = _pedido([("tornillo", 2), ("rueda", 1), ("tornillo", 0)])
+    assert inventario.buscar_pieza("tornillo") is None
+    assert inventario.buscar_pieza("rueda").cantidad == 4
+    assert "bici" not in catalogo.catalogo
+    assert "Pedido atendido. Modelo bici disponible." in capsys.readouterr().out
+
+
+def test_pedido_sin_stock_para_la_suma(capsys):
+    inventario, catalogo = _pedido([("tornillo", 2), ("rueda", 1), ("tornillo", 2)])
+    assert inventario.buscar_pieza("tornillo").cantidad == 2
+    assert inventario.buscar_pieza("rueda").cantidad == 5
+    assert "bici" not in catalogo.catalogo
+    assert "Pedido bici NO atendido. Faltan:\ntornillo - 2\n" in capsys.readouterr().out
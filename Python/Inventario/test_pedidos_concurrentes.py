@@ -0,0 +1,50 @@
+import threading
+
+import pytest
+
+pytest.importorskip("array_ordered_positional_list")
+
+from benchmark_pedidos import generar
+from pedidos_concurrentes import PedidosConcurrentes
+
+
+def test_un_hilo_como_secuencial():
+    inventario, catalogo, pedidos = generar(50, 40, 3000, semilla=1)
+    referencia, catalogo_ref, _ = generar(50, 40, 3000, semilla=1)
+    for x in (inventario, referencia):
+        for pieza in list(x.inventario):
+            x.descontar(pieza, pieza.cantidad - pieza.cantidad // 10)
+    procesador = PedidosConcurrentes(catalogo, inventario)
+    for modelo in pedidos:
+        procesador.realizar_pedido(modelo)
+        if modelo in catalogo_ref.catalogo:
+            catalogo_ref.realizar_pedido(modelo, referencia)
+    assert [(p.nombre_pieza, p.cantidad) for p in inventario.inventario] == \
+        [(p.nombre_pieza, p.cantidad) for p in referencia.inventario]
+    assert list(catalogo.catalogo) == list(catalogo_ref.catalogo)
+
+
+def test_varios_hilos_descuentan_lo_servido():
+    inventario, catalogo, pedidos = generar(50, 40, 20000, semilla=2)
+    inicial = {pieza.nombre_pieza: pieza.cantidad for pieza in inventario.inventario}
+    necesidades = {modelo: catalogo._necesidades(modelo) for modelo in catalogo.catalogo}
+    procesador = PedidosConcurrentes(catalogo, inventario, franjas=8)
+    servidos = [[] for _ in range(8)]
+
+    def atender(i):
+        servidos[i].extend(modelo for modelo in pedidos[i::8] if procesador.realizar_pedido(modelo))
+
+    hilos = [threading.Thread(target=atender, args=(i,)) for i in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    usado = dict.fromkeys(inicial, 0)
+    for modelo in (modelo for lista in servidos for modelo in lista):
+        for nombre, cantidad in necesidades[modelo].items():
+            usado[nombre] += cantidad
+    for nombre, cantidad in inicial.items():
+        pieza = inventario.buscar_pieza(nombre)
+        assert (0 if pieza is None else pieza.cantidad) == cantidad - usado[nombre]
+    cantidades = [pieza.cantidad for pieza in inventario.inventario]
+    assert cantidades == sorted(cantidades)